@@ -0,0 +1,320 @@
+# app/day_index.py
+"""
+Per-day summary index behind /index, /verify and /ledger/latest.
+
+One SQLite row per day holds the summary those endpoints return (presence
+flags, counts, MIC sum, day_root, links) plus the stat stamps of the files
+it was computed from. A row is served as-is while its files and directories
+still carry the recorded mtimes and sizes; otherwise it is recomputed, and
+only what changed is read again. The append-only .echo.jsonl and .gic.jsonl
+logs are read from the offset where the previous pass stopped.
+
+Writers call touch(date) after changing a day's files, which forces the
+next read of that day to revalidate even where mtimes are coarse. Rows
+exist only for days with a directory under ledger_dir; other dates are
+summarized on the fly and never stored.
+"""
+from __future__ import annotations
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _stamp(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return {"path": str(path), "mtime": st.st_mtime_ns, "size": st.st_size}
+
+
+def _dir_mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _read_json_file(p: Path) -> Any:
+    with p.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _scan_jsonl(p: Path, offset: int, rows: int, total: int, amounts: bool) -> Tuple[int, int, int, int, int]:
+    """
+    Count valid JSON lines (and sum "amount") from byte offset on.
+
+    Returns (offset, rows, total) after the last complete line, plus the
+    rows/total of a valid trailing line without a newline, which is counted
+    in the summary but read again next time.
+    """
+    with p.open("rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    tail_rows = tail_total = 0
+    for i, raw in enumerate((data[:end].split(b"\n"), [data[end:]])):
+        for line in raw:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            amount = int(obj.get("amount", 0) or 0) if amounts and isinstance(obj, dict) else 0
+            if i == 0:
+                rows += 1
+                total += amount
+            else:
+                tail_rows += 1
+                tail_total += amount
+    return offset + end, rows, total, tail_rows, tail_total
+
+
+class DayIndex:
+    """
+    Day summaries for the date directories under ledger_dir.
+
+    Seed/echo/seal/ledger files are looked up in data_dir first and then in
+    the day's directory, as the API has always done.
+    """
+
+    def __init__(self, data_dir: Path, ledger_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.ledger_dir = Path(ledger_dir)
+        self.path = self.data_dir / "day_index.sqlite3"
+        self._local = threading.local()
+        self._listing_mtime: Optional[int] = None
+        self._listing_lock = threading.Lock()
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS days (
+                date TEXT PRIMARY KEY,
+                listed INTEGER NOT NULL DEFAULT 0,
+                dirty INTEGER NOT NULL DEFAULT 1,
+                summary TEXT,
+                state TEXT
+            );
+            CREATE INDEX IF NOT EXISTS days_listed ON days (listed, date);
+            """
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- listing ----------
+    def _sync_listing(self) -> None:
+        """Re-list date directories only when ledger_dir itself changed (one stat otherwise)."""
+        mtime = _dir_mtime(self.ledger_dir)
+        if mtime is not None and mtime == self._listing_mtime:
+            return
+        with self._listing_lock:
+            if mtime is not None and mtime == self._listing_mtime:
+                return
+            dates = []
+            if self.ledger_dir.exists():
+                dates = [p.name for p in self.ledger_dir.iterdir() if p.is_dir() and _DATE_RE.match(p.name)]
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("UPDATE days SET listed = 0 WHERE listed = 1")
+                conn.executemany(
+                    "INSERT INTO days (date, listed) VALUES (?, 1) "
+                    "ON CONFLICT(date) DO UPDATE SET listed = 1",
+                    ((d,) for d in dates),
+                )
+                # only days with a directory keep a row, so the table stays bounded
+                conn.execute("DELETE FROM days WHERE listed = 0")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._listing_mtime = mtime
+
+    # ---------- freshness ----------
+    def _fresh(self, date_str: str, state: Dict[str, Any]) -> bool:
+        dirs = state.get("dirs", {})
+        if dirs.get("root") != _dir_mtime(self.data_dir):
+            return False
+        if dirs.get("day") != _dir_mtime(self.ledger_dir / date_str):
+            return False
+        return all(_stamp(Path(rec["path"])) == rec for rec in state.get("files", {}).values())
+
+    # ---------- compute ----------
+    def _compute(self, date_str: str, prev: Optional[Dict[str, Any]]) -> Tuple[dict, dict]:
+        root = self.data_dir
+        day = self.ledger_dir / date_str
+        prev = prev or {}
+        prev_files = prev.get("files", {})
+        files: Dict[str, Dict[str, Any]] = {}
+        state: Dict[str, Any] = {
+            "dirs": {"root": _dir_mtime(root), "day": _dir_mtime(day)},
+            "files": files,
+        }
+
+        def resolve(name: str) -> Path:
+            return root / name if (root / name).exists() else day / name
+
+        def track(kind: str, path: Path) -> Tuple[Optional[dict], bool]:
+            """Stamp for path (None if missing) and whether it is unchanged since last time."""
+            rec = _stamp(path)
+            if rec is None:
+                return None, False
+            files[kind] = rec
+            return rec, prev_files.get(kind) == rec
+
+        # seed / seal / ledger: small JSON documents, re-read only when changed
+        paths = {
+            "seed": resolve(f"{date_str}.seed.json"),
+            "seal": resolve(f"{date_str}.seal.json"),
+            "ledger": resolve(f"{date_str}.ledger.json"),
+        }
+        for kind, path in paths.items():
+            rec, same = track(kind, path)
+            if rec is None:
+                state[kind] = {"loaded": False, "truthy": False, "day_root": None}
+            elif same and kind in prev:
+                state[kind] = prev[kind]
+            else:
+                obj = _read_json_file(path)
+                state[kind] = {
+                    "loaded": obj is not None,
+                    "truthy": bool(obj),
+                    "day_root": obj.get("day_root") if kind == "ledger" and isinstance(obj, dict) else None,
+                }
+
+        # sweeps: append-only JSONL log, or a legacy JSON array
+        echo_l = resolve(f"{date_str}.echo.jsonl")
+        echo_j = resolve(f"{date_str}.echo.json")
+        rec, same = track("echo", echo_l)
+        if rec is not None:
+            log = self._tail(prev.get("echo"), prev_files.get("echo"), rec, same, echo_l, amounts=False)
+            state["echo"] = log
+            sweeps = log["rows"] + log["tail_rows"]
+        else:
+            rec, same = track("echo_legacy", echo_j)
+            if rec is None:
+                sweeps = 0
+            elif same and "echo_legacy" in prev:
+                sweeps = prev["echo_legacy"]
+            else:
+                arr = _read_json_file(echo_j) or []
+                sweeps = len(arr) if isinstance(arr, list) else 0
+            state["echo_legacy"] = sweeps
+
+        # MIC transactions: append-only JSONL
+        gic_p = resolve(f"{date_str}.gic.jsonl")
+        rec, same = track("gic", gic_p)
+        if rec is not None:
+            log = self._tail(prev.get("gic"), prev_files.get("gic"), rec, same, gic_p, amounts=True)
+            state["gic"] = log
+            gic_txs = log["rows"] + log["tail_rows"]
+            gic_sum = log["total"] + log["tail_total"]
+        else:
+            gic_txs = gic_sum = 0
+
+        seed, seal, ledger = state["seed"], state["seal"], state["ledger"]
+        summary = {
+            "date": date_str,
+            "present": {
+                "seed": seed["loaded"],
+                "echo": echo_l.exists() or echo_j.exists(),
+                "seal": seal["loaded"],
+                "ledger": ledger["loaded"],
+                "gic": gic_p.exists(),
+            },
+            "counts": {
+                "seeds": 1 if seed["truthy"] else 0,
+                "sweeps": sweeps,
+                "seals": 1 if seal["truthy"] else 0,
+                "gic_txs": gic_txs,
+            },
+            "gic": {
+                "sum": gic_sum,
+                "file": str(gic_p) if gic_p.exists() else None,
+            },
+            "day_root": ledger["day_root"],
+            "links": {
+                "seed":   str(paths["seed"])   if seed["truthy"] else None,
+                "echo":   str(echo_l) if echo_l.exists() else (str(echo_j) if echo_j.exists() else None),
+                "seal":   str(paths["seal"])   if seal["truthy"] else None,
+                "ledger": str(paths["ledger"]) if ledger["truthy"] else None,
+            },
+        }
+        return summary, state
+
+    @staticmethod
+    def _tail(prev_log, prev_rec, rec, same, path: Path, amounts: bool) -> Dict[str, int]:
+        """Counts for an append-only log, continuing from the previous offset when possible."""
+        if same and prev_log:
+            return prev_log
+        if prev_log and prev_rec and prev_rec["path"] == rec["path"] and rec["size"] >= prev_log["offset"]:
+            start = (prev_log["offset"], prev_log["rows"], prev_log["total"])
+        else:
+            start = (0, 0, 0)
+        offset, rows, total, tail_rows, tail_total = _scan_jsonl(path, *start, amounts=amounts)
+        return {"offset": offset, "rows": rows, "total": total, "tail_rows": tail_rows, "tail_total": tail_total}
+
+    def _refresh(self, date_str: str, dirty: int, summary: Optional[str], state: Optional[str]) -> dict:
+        prev = json.loads(state) if state else None
+        if prev is not None and summary and not dirty and self._fresh(date_str, prev):
+            return json.loads(summary)
+        new_summary, new_state = self._compute(date_str, prev)
+        self._connect().execute(
+            "UPDATE days SET dirty = 0, summary = ?, state = ? WHERE date = ? AND listed = 1",
+            (json.dumps(new_summary), json.dumps(new_state), date_str),
+        )
+        return new_summary
+
+    # ---------- public ----------
+    def touch(self, date_str: str) -> None:
+        """Mark a day as changed (call after writing any of its files)."""
+        self._connect().execute("UPDATE days SET dirty = 1 WHERE date = ?", (date_str,))
+
+    def summary(self, date_str: str) -> dict:
+        """Summary for one day; days without a directory are computed but not stored."""
+        if not _DATE_RE.fullmatch(date_str):
+            raise ValueError(f"invalid date: {date_str!r}")
+        self._sync_listing()
+        row = self._connect().execute(
+            "SELECT dirty, summary, state FROM days WHERE date = ? AND listed = 1", (date_str,)
+        ).fetchone()
+        if row is None:
+            return self._compute(date_str, None)[0]
+        return self._refresh(date_str, *row)
+
+    def page(self, descending: bool = True, limit: int = 0) -> Tuple[int, List[dict]]:
+        """(total listed days, summaries of up to limit days in date order); limit <= 0 means all."""
+        self._sync_listing()
+        conn = self._connect()
+        total = conn.execute("SELECT COUNT(*) FROM days WHERE listed = 1").fetchone()[0]
+        rows = conn.execute(
+            "SELECT date, dirty, summary, state FROM days WHERE listed = 1 "
+            f"ORDER BY date {'DESC' if descending else 'ASC'} LIMIT ?",
+            (limit if limit and limit > 0 else -1,),
+        ).fetchall()
+        return total, [self._refresh(*row) for row in rows]
+
+    def latest_with_ledger(self) -> Optional[str]:
+        """Most recent listed day that has a ledger file."""
+        self._sync_listing()
+        rows = self._connect().execute(
+            "SELECT date, dirty, summary, state FROM days WHERE listed = 1 ORDER BY date DESC"
+        )
+        for row in rows:
+            if self._refresh(*row)["present"]["ledger"]:
+                return row[0]
+        return None
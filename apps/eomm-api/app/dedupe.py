@@ -0,0 +1,260 @@
+# app/dedupe.py
+"""
+Persistent duplicate-content guard for MIC rewards.
+
+Each (date, user, content_hash) that earned a reflection reward is recorded
+in a small SQLite index next to the ledger data, so the guard survives
+restarts and is shared by every uvicorn worker. A day's entries are loaded
+from its {date}.gic.jsonl on first use, and days older than the retention
+window are dropped once per calendar day (and reloaded from the file if a
+late sweep needs them).
+
+An in-memory Bloom filter sits in front of the index: content it has never
+seen is claimed with a single INSERT, and only probable duplicates pay for
+a lookup first. The filter is per process and only ever a hint; the INSERT
+is what decides.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+RETENTION_DAYS = int(os.getenv("GIC_DEDUPE_RETENTION_DAYS", "7"))
+BLOOM_CAPACITY = int(os.getenv("GIC_DEDUPE_BLOOM_ITEMS", "1000000"))
+REWARD_REASON_PREFIX = "reflection:"
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter (about 1% false positives at capacity)."""
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, hashes: int = 7):
+        self.bits = max(64, capacity * 10)
+        self.hashes = hashes
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def _key(date_str: str, user_id: str, content_hash: str) -> str:
+    return f"{date_str}\x1f{user_id}\x1f{content_hash}"
+
+
+def rewarded_hashes(gic_path: Path) -> Iterator[Tuple[str, str]]:
+    """(user, content_hash) of every reflection reward tx in a .gic.jsonl file."""
+    if not gic_path.exists():
+        return
+    with gic_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                tx = json.loads(line)
+            except Exception:
+                continue
+            if (
+                tx.get("type") == "gic_tx"
+                and tx.get("hash")
+                and str(tx.get("reason", "")).startswith(REWARD_REASON_PREFIX)
+            ):
+                yield str(tx.get("user", "anon")), str(tx["hash"])
+
+
+class DedupeIndex:
+    """
+    (date, user, content_hash) claims backed by SQLite under data_dir.
+
+    claim() is the only write path: it returns True exactly once per key,
+    across threads, processes and restarts. Days at or past the retention
+    cutoff may be expired by another worker at any time, so claims for them
+    re-check the days table (reloading the day from its .gic.jsonl if it is
+    gone) in the same transaction as the INSERT.
+    """
+
+    def __init__(self, data_dir: Path, retention_days: int = RETENTION_DAYS,
+                 bloom_capacity: int = BLOOM_CAPACITY):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / "gic_dedupe.sqlite3"
+        self.retention_days = retention_days
+        self.bloom_capacity = bloom_capacity
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._loaded: set[str] = set()
+        self._bloom = BloomFilter(bloom_capacity)
+        self._last_expiry: Optional[date] = None
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS seen (
+                    date TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (date, user, hash)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS days (
+                    date TEXT PRIMARY KEY
+                );
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _gic_path(self, date_str: str) -> Path:
+        return self.data_dir / date_str / f"{date_str}.gic.jsonl"
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection) -> Iterator[None]:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _load_day(self, conn: sqlite3.Connection, date_str: str) -> None:
+        """Copy a day's rewarded hashes into seen unless it is indexed (inside a write transaction)."""
+        if conn.execute("SELECT 1 FROM days WHERE date = ?", (date_str,)).fetchone() is not None:
+            return
+        conn.executemany(
+            "INSERT OR IGNORE INTO seen (date, user, hash) VALUES (?, ?, ?)",
+            ((date_str, user, h) for user, h in rewarded_hashes(self._gic_path(date_str))),
+        )
+        conn.execute("INSERT OR IGNORE INTO days (date) VALUES (?)", (date_str,))
+
+    def _ensure_day(self, date_str: str) -> None:
+        """Load a day's rewarded hashes from its .gic.jsonl the first time it is used."""
+        if date_str in self._loaded:
+            return
+        conn = self._connect()
+        with self._lock:
+            if date_str in self._loaded:
+                return
+            if conn.execute("SELECT 1 FROM days WHERE date = ?", (date_str,)).fetchone() is None:
+                with self._transaction(conn):
+                    self._load_day(conn, date_str)
+            for user, h in conn.execute("SELECT user, hash FROM seen WHERE date = ?", (date_str,)):
+                self._bloom.add(_key(date_str, user, h))
+            self._loaded.add(date_str)
+        self._maybe_expire(date_str)
+
+    def _expirable(self, date_str: str) -> bool:
+        # <= rather than <: a worker already past midnight expires one more day
+        return date_str <= self.cutoff()
+
+    def cutoff(self, today: Optional[date] = None) -> str:
+        """Oldest date kept in the index."""
+        return ((today or date.today()) - timedelta(days=self.retention_days)).isoformat()
+
+    def _maybe_expire(self, date_str: str) -> None:
+        """Drop old days the first time a current day is used on each calendar day.
+
+        Dates outside [cutoff, today] come from late or bogus sweeps and never
+        trigger expiry.
+        """
+        today = date.today()
+        if self._last_expiry == today or not self.cutoff(today) <= date_str <= today.isoformat():
+            return
+        self._last_expiry = today
+        self.expire(today)
+
+    def expire(self, today: Optional[date] = None) -> int:
+        """Remove days before today - retention_days; returns the number of days dropped."""
+        cutoff = self.cutoff(today)
+        conn = self._connect()
+        with self._lock:
+            old = [d for (d,) in conn.execute("SELECT date FROM days WHERE date < ?", (cutoff,))]
+            if not old:
+                return 0
+            with self._transaction(conn):
+                conn.execute("DELETE FROM seen WHERE date < ?", (cutoff,))
+                conn.execute("DELETE FROM days WHERE date < ?", (cutoff,))
+            # Bloom filters cannot forget, so rebuild it from what is left
+            self._loaded.difference_update(old)
+            self._bloom = BloomFilter(self.bloom_capacity)
+            for d, user, h in conn.execute("SELECT date, user, hash FROM seen"):
+                if d in self._loaded:
+                    self._bloom.add(_key(d, user, h))
+            return len(old)
+
+    def recent_days(self) -> list[str]:
+        """Day directories under data_dir inside the retention window."""
+        cutoff = self.cutoff()
+        return sorted(
+            p.name for p in self.data_dir.iterdir()
+            if p.is_dir() and _DATE_RE.match(p.name) and p.name >= cutoff
+        )
+
+    def rebuild(self, dates: Optional[Iterable[str]] = None) -> None:
+        """Load days from their .gic.jsonl files (default: the retention window, on startup)."""
+        for date_str in (self.recent_days() if dates is None else dates):
+            self._ensure_day(date_str)
+
+    def seen(self, user_id: str, date_str: str, content_hash: str) -> bool:
+        self._ensure_day(date_str)
+        conn = self._connect()
+        if self._expirable(date_str):
+            with self._transaction(conn):
+                self._load_day(conn, date_str)
+        elif _key(date_str, user_id, content_hash) not in self._bloom:
+            return False
+        row = conn.execute(
+            "SELECT 1 FROM seen WHERE date = ? AND user = ? AND hash = ?",
+            (date_str, user_id, content_hash),
+        ).fetchone()
+        return row is not None
+
+    def claim(self, user_id: str, date_str: str, content_hash: str) -> bool:
+        """Record the content for this user/day; False if it was already claimed."""
+        self._ensure_day(date_str)
+        key = _key(date_str, user_id, content_hash)
+        conn = self._connect()
+        if self._expirable(date_str):
+            # Another worker may have expired the day since it was loaded here
+            with self._transaction(conn):
+                self._load_day(conn, date_str)
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO seen (date, user, hash) VALUES (?, ?, ?)",
+                    (date_str, user_id, content_hash),
+                )
+            self._bloom.add(key)
+            return cur.rowcount == 1
+        if key in self._bloom and conn.execute(
+            "SELECT 1 FROM seen WHERE date = ? AND user = ? AND hash = ?",
+            (date_str, user_id, content_hash),
+        ).fetchone() is not None:
+            return False
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO seen (date, user, hash) VALUES (?, ?, ?)",
+            (date_str, user_id, content_hash),
+        )
+        self._bloom.add(key)
+        return cur.rowcount == 1
@@ -76,7 +76,7 @@ def build_day_root(date_str: str, data_dir: Path) -> Dict[str, Any]:
     """
     Reads:
       data/{DATE}.seed.json
-      data/{DATE}.echo.json
+      data/{DATE}.echo.jsonl  (or a legacy data/{DATE}.echo.json array)
       data/{DATE}.seal.json
     Computes:
       Hseed, [Hecho...], Hseal, Hroot
@@ -84,6 +84,7 @@ def build_day_root(date_str: str, data_dir: Path) -> Dict[str, Any]:
       data/{DATE}.root.json
     """
     seed_p = data_dir / f"{date_str}.seed.json"
+    echo_log_p = data_dir / f"{date_str}.echo.jsonl"
     echo_p = data_dir / f"{date_str}.echo.json"
     seal_p = data_dir / f"{date_str}.seal.json"
     root_p = data_dir / f"{date_str}.root.json"
@@ -102,8 +103,10 @@ def build_day_root(date_str: str, data_dir: Path) -> Dict[str, Any]:
 
     Hseed = sha256_json(seed_obj)
     
-    # Handle echo file (JSON array format)
-    if echo_p.exists():
+    # Sweep log (JSONL), streamed; fall back to a legacy JSON array file
+    if echo_log_p.exists():
+        Hechos = hash_echo_file(echo_log_p)
+    elif echo_p.exists():
         echo_data = read_json(echo_p)
         if isinstance(echo_data, list):
             Hechos = [sha256_json(item) for item in echo_data]
@@ -5,10 +5,11 @@ from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple, Optional
+from typing import Any, Dict, List, Optional
 import os
 import json
 import re
+import threading
 import time
 import logging
 from dotenv import load_dotenv
@@ -34,8 +35,13 @@ except Exception as e:
 
 # Import your modules
 from app.hashing import sha256_json, merkle_root
-from app.storage import today_files, read_json, write_json, load_day, build_ledger_obj, DATA_DIR, get_node_metadata
+from app.storage import (
+    today_files, read_json, write_json, load_day, build_ledger_obj, DATA_DIR, get_node_metadata,
+    append_sweep, iter_sweeps, has_sweeps, sweep_log_file, migrate_legacy_sweeps, sync_sweep_logs,
+)
 from app.hash_helpers import build_day_root
+from app.dedupe import DedupeIndex
+from app.day_index import DayIndex
 from app.models import BonusRun
 
 # Create FastAPI app
@@ -148,21 +154,24 @@ else:
 FEATURE_INTENT = "publish_feature"
 FEATURE_QUEUE_FILENAME = "{}.featured_queue.jsonl"
 
-# in-memory dedupe: (user_id, date) -> {content_hash, ...}
-_gic_seen: Dict[Tuple[str, str], Set[str]] = {}
+# persistent dedupe: (date, user_id, content_hash) claims, shared by all workers
+_gic_dedupe: Optional[DedupeIndex] = None
+_gic_dedupe_lock = threading.Lock()
 
 def _gic_file(date_str: str) -> str:
     """daily MIC transactions file"""
     return f"{date_str}/{date_str}.gic.jsonl"
 
-def _mark_seen(user_id: str, date_str: str, h: str) -> None:
-    key = (user_id, date_str)
-    s = _gic_seen.setdefault(key, set())
-    s.add(h)
+def _dedupe() -> DedupeIndex:
+    global _gic_dedupe
+    with _gic_dedupe_lock:
+        if _gic_dedupe is None or _gic_dedupe.data_dir != Path(DATA_DIR):
+            _gic_dedupe = DedupeIndex(DATA_DIR)
+        return _gic_dedupe
 
-def _already_seen(user_id: str, date_str: str, h: str) -> bool:
-    key = (user_id, date_str)
-    return h in _gic_seen.get(key, set())
+def _claim_content(user_id: str, date_str: str, h: str) -> bool:
+    """True the first time this user rewards this content on this day"""
+    return _dedupe().claim(user_id, date_str, h)
 
 def append_jsonl(file_path: str, record: dict) -> str:
     """Append a record to a JSONL file and return the hash"""
@@ -193,31 +202,32 @@ def _humanize_seconds(s: int) -> str:
     if m:  return f"{m}m {sec}s"
     return f"{sec}s"
 
-# VERIFY HELPERS
+# VERIFY / INDEX HELPERS
+# per-day summaries (presence, counts, MIC sum, day_root), revalidated by file mtime
+_day_index: Optional[DayIndex] = None
+_day_index_lock = threading.Lock()
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
 def _day_dir(date_str: str) -> Path:
     base = os.environ.get("LEDGER_PATH", "data")
     return Path(base) / date_str
 
-def _read_json_file(p: Path) -> dict | None:
-    if not p.exists():
-        return None
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+def _days() -> DayIndex:
+    global _day_index
+    ledger_dir = Path(os.environ.get("LEDGER_PATH", "data"))
+    with _day_index_lock:
+        if (_day_index is None or _day_index.data_dir != Path(DATA_DIR)
+                or _day_index.ledger_dir != ledger_dir):
+            _day_index = DayIndex(DATA_DIR, ledger_dir)
+        return _day_index
 
-def _read_jsonl_file(p: Path) -> list[dict]:
-    if not p.exists():
-        return []
-    rows = []
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rows.append(json.loads(line))
-            except Exception:
-                pass
-    return rows
+def _touch_day(date_str: str) -> None:
+    """Flag a day's summary for revalidation after writing one of its files"""
+    _days().touch(date_str)
+
+def _safe_counts_for(date_str: str) -> dict:
+    return _days().summary(date_str)
 
 # BONUS HELPERS
 _BONUS_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
@@ -280,74 +290,6 @@ def _already_paid_keys(payout_day: str) -> set[tuple[str, str, str]]:
             seen.add((str(tx.get("user")), str(tx.get("hash")), _BONUS_REASON))
     return seen
 
-# INDEX HELPERS
-_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-
-def _list_date_dirs() -> list[str]:
-    base = Path(os.environ.get("LEDGER_PATH", "data"))
-    if not base.exists():
-        return []
-    dates = []
-    for p in base.iterdir():
-        if p.is_dir() and _DATE_RE.match(p.name):
-            dates.append(p.name)
-    dates.sort()
-    return dates
-
-def _safe_counts_for(date_str: str) -> dict:
-    day = _day_dir(date_str)
-    root = DATA_DIR
-    
-    seed_p   = root / f"{date_str}.seed.json" if (root / f"{date_str}.seed.json").exists() else day / f"{date_str}.seed.json"
-    echo_p_l = root / f"{date_str}.echo.jsonl" if (root / f"{date_str}.echo.jsonl").exists() else day / f"{date_str}.echo.jsonl"
-    echo_p_j = root / f"{date_str}.echo.json" if (root / f"{date_str}.echo.json").exists() else day / f"{date_str}.echo.json"
-    seal_p   = root / f"{date_str}.seal.json" if (root / f"{date_str}.seal.json").exists() else day / f"{date_str}.seal.json"
-    ledger_p = root / f"{date_str}.ledger.json" if (root / f"{date_str}.ledger.json").exists() else day / f"{date_str}.ledger.json"
-    gic_p    = root / f"{date_str}.gic.jsonl" if (root / f"{date_str}.gic.jsonl").exists() else day / f"{date_str}.gic.jsonl"
-
-    seed   = _read_json_file(seed_p)
-    seal   = _read_json_file(seal_p)
-    ledger = _read_json_file(ledger_p)
-
-    if echo_p_l.exists():
-        sweeps = _read_jsonl_file(echo_p_l)
-    elif echo_p_j.exists():
-        arr = _read_json_file(echo_p_j) or []
-        sweeps = arr if isinstance(arr, list) else []
-    else:
-        sweeps = []
-
-    gic_txs = _read_jsonl_file(gic_p)
-    gic_sum = sum(int(tx.get("amount", 0) or 0) for tx in gic_txs)
-
-    return {
-        "date": date_str,
-        "present": {
-            "seed": seed is not None,
-            "echo": echo_p_l.exists() or echo_p_j.exists(),
-            "seal": seal is not None,
-            "ledger": ledger is not None,
-            "gic": miic_p.exists(),
-        },
-        "counts": {
-            "seeds": 1 if seed else 0,
-            "sweeps": len(sweeps),
-            "seals": 1 if seal else 0,
-            "gic_txs": len(gic_txs),
-        },
-        "gic": {
-            "sum": miic_sum,
-            "file": str(gic_p) if gic_p.exists() else None,
-        },
-        "day_root": (ledger or {}).get("day_root"),
-        "links": {
-            "seed":   str(seed_p)   if seed   else None,
-            "echo":   str(echo_p_l) if echo_p_l.exists() else (str(echo_p_j) if echo_p_j.exists() else None),
-            "seal":   str(seal_p)   if seal   else None,
-            "ledger": str(ledger_p) if ledger else None,
-        },
-    }
-
 # MODELS
 from pydantic import BaseModel, Field
 
@@ -383,6 +325,16 @@ async def startup_event():
     log.info("🚀 Hive API starting up...")
     log.info(f"Demo mode: {DEMO_MODE}")
     log.info(f"CORS origins: {ALLOWED_ORIGINS}")
+    migrated = migrate_legacy_sweeps()
+    if migrated:
+        log.info(f"Migrated {len(migrated)} legacy sweep file(s) to JSONL logs")
+    dedupe = _dedupe()
+    dedupe.expire()
+    dedupe.rebuild()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    sync_sweep_logs()
 
 # BASIC ENDPOINTS
 @app.get("/")
@@ -497,19 +449,14 @@ def post_seed(payload: Seed):
         "ts": datetime.utcnow().isoformat() + "Z",
     }
     write_json(files["seed"], record)
+    _touch_day(payload.date)
     return {"seed_hash": sha256_json(record), "file": files["seed"]}
 
 @app.post("/sweep")
 def post_sweep(payload: Sweep):
     date_str = payload.date
-    files = today_files(date_str)
     node_meta = get_node_metadata()
-    
-    # Load existing sweeps or start with empty list
-    sweeps = read_json(files["echo"]) if (DATA_DIR / files["echo"]).exists() else []
-    if isinstance(sweeps, dict):
-        sweeps = [sweeps]
-    
+
     record = {
         "type": "sweep",
         "date": date_str,
@@ -518,8 +465,7 @@ def post_sweep(payload: Sweep):
         "meta": {**payload.meta, **node_meta},
         "ts": datetime.utcnow().isoformat() + "Z",
     }
-    sweeps.append(record)
-    write_json(files["echo"], sweeps)
+    append_sweep(date_str, record)
     attestation = sha256_json(record)
 
     # MIC REWARD LOGIC
@@ -543,18 +489,15 @@ def post_sweep(payload: Sweep):
         gic = GIC_PER_PRIVATE
 
     # Duplicate guard per user/day by content hash
-    if content_hash:
-        if _already_seen(user_id, date_str, content_hash):
-            gic = 0
-        else:
-            _mark_seen(user_id, date_str, content_hash)
+    if content_hash and not _claim_content(user_id, date_str, content_hash):
+        gic = 0
 
     # Append MIC transaction
     gic_tx = {
         "type": "gic_tx",
         "date": date_str,
         "user": user_id,
-        "amount": miic,
+        "amount": gic,
         "reason": f"reflection:{tier}",
         "hash": content_hash,
         "ts": datetime.utcnow().isoformat() + "Z",
@@ -574,12 +517,13 @@ def post_sweep(payload: Sweep):
         }
         append_jsonl(f"{date_str}/{FEATURE_QUEUE_FILENAME.format(date_str)}", feature_item)
 
+    _touch_day(date_str)
     return {
         "attestation": attestation,
-        "sweep_file": files["echo"],
-        "gic": miic,
-        "gic_file": miic_file,
-        "gic_attestation": miic_att,
+        "sweep_file": sweep_log_file(date_str),
+        "gic": gic,
+        "gic_file": gic_file,
+        "gic_attestation": gic_att,
     }
 
 @app.post("/seal")
@@ -603,12 +547,14 @@ def seal(payload: Dict[str, Any]):
             "ts": datetime.utcnow().isoformat() + "Z",
         }
         write_json(files["seal"], seal_obj)
+        _touch_day(date)
 
     if not seed or not seal_obj:
         raise HTTPException(status_code=400, detail="Seed and Seal are required to build ledger")
 
     ledger = build_ledger_obj(date, seed, sweeps, seal_obj)
     write_json(files["ledger"], ledger)
+    _touch_day(date)
 
     # Build and write day root
     try:
@@ -633,6 +579,14 @@ def seal(payload: Dict[str, Any]):
         }
 
 # READ / VERIFY / INDEX / EXPORT ENDPOINTS
+# declared before /ledger/{date} so "latest" is not taken for a date
+@app.get("/ledger/latest")
+def ledger_latest():
+    latest = _days().latest_with_ledger()
+    if latest is None:
+        raise HTTPException(status_code=404, detail="No data directory or no days yet")
+    return {"date": latest, "ledger": get_ledger(latest)}
+
 @app.get("/ledger/{date}")
 def get_ledger(date: str):
     files = today_files(date)
@@ -640,17 +594,11 @@ def get_ledger(date: str):
         raise HTTPException(status_code=404, detail="No ledger for this date")
     return read_json(files["ledger"])
 
-@app.get("/ledger/latest")
-def ledger_latest():
-    dates = [p.name for p in DATA_DIR.iterdir() if p.is_dir()]
-    if not dates:
-        raise HTTPException(status_code=404, detail="No data directory or no days yet")
-    latest = sorted(dates)[-1]
-    return {"date": latest, "ledger": get_ledger(latest)}
-
 @app.get("/verify/{date}")
 def verify_day(date: str):
     """Verifies the day's presence of seed/echo/seal files, returns counts, and includes MIC totals."""
+    if not _DATE_RE.fullmatch(date):
+        raise HTTPException(status_code=404, detail="Unknown date")
     return _safe_counts_for(date)
 
 @app.get("/export/{date}")
@@ -658,6 +606,11 @@ def export_day(date: str):
     files = today_files(date)
     out = {"date": date, "files": {}}
     for key, rel in files.items():
+        if key == "echo":
+            # Sweeps are exported as one array under the historical file name
+            if has_sweeps(date):
+                out["files"][rel] = list(iter_sweeps(date))
+            continue
         if not (DATA_DIR / rel).exists():
             continue
         out["files"][rel] = read_json(rel)
@@ -666,15 +619,9 @@ def export_day(date: str):
 @app.get("/index")
 def index_all(order: str = "desc", limit: int = 100):
     """Lists days in the ledger with counts, gic.sum, and day_root."""
-    dates = _list_date_dirs()
-    if order.lower() == "desc":
-        dates = list(reversed(dates))
-    if limit and limit > 0:
-        dates = dates[:limit]
-
-    rows = [_safe_counts_for(d) for d in dates]
+    total, rows = _days().page(descending=order.lower() == "desc", limit=limit)
     return {
-        "total_days": len(_list_date_dirs()),
+        "total_days": total,
         "returned": len(rows),
         "order": order.lower(),
         "items": rows,
@@ -778,6 +725,8 @@ def bonus_run(req: BonusRun, x_admin_key: str = Header(default="")):
         else:
             _append_jsonl(payout_file, tx)
             wrote += 1
+    if wrote:
+        _touch_day(payout_str)
 
     return {
         "ok": True,
@@ -2,10 +2,17 @@ from __future__ import annotations
 from pathlib import Path
 import json
 import os
-from typing import Dict, List, Tuple, Any, Optional
+import threading
+from typing import Dict, Iterable, Iterator, List, Tuple, Any, Optional
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
+# Sweep log durability: each record is handed to the OS immediately and
+# fsync'd once SWEEP_FSYNC_EVERY records are pending, or SWEEP_FSYNC_MS after
+# the first unsynced one (0 = fsync every record)
+SWEEP_FSYNC_EVERY = int(os.getenv("SWEEP_FSYNC_EVERY", "32"))
+SWEEP_FSYNC_MS = float(os.getenv("SWEEP_FSYNC_MS", "200"))
+
 def get_node_metadata() -> Dict[str, str]:
     """Get node identity metadata from environment variables."""
     return {
@@ -25,6 +32,10 @@ def today_files(date_str: str) -> Dict[str, str]:
         "ledger": f"{base}.ledger.json",
     }
 
+def sweep_log_file(date_str: str) -> str:
+    """Append-only JSONL sweep log for a date (one sweep record per line)."""
+    return f"{date_str}.echo.jsonl"
+
 def p(path_rel: str) -> Path:
     """Absolute path under DATA_DIR."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -39,32 +50,156 @@ def write_json(path_rel: str, obj: Any) -> None:
     with open(p(path_rel), "w", encoding="utf-8") as f:
         json.dump(obj, f, ensure_ascii=False, indent=2)
 
-def load_day(date_str: str) -> Tuple[Optional[dict], List[dict], Optional[dict]]:
-    """Load seed (dict or None), sweeps (list), seal (dict or None). Missing files => None/[]"""
+class _SweepLog:
+    """One day's sweep log; appends from every request thread go through its lock."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.unsynced = 0
+        self.timer: Optional[threading.Timer] = None
+
+    def append(self, record: dict) -> None:
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            # One O_APPEND write per record keeps lines whole, also across worker processes
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                self.unsynced += 1
+                if self.unsynced >= SWEEP_FSYNC_EVERY or SWEEP_FSYNC_MS <= 0:
+                    os.fsync(fd)
+                    self.unsynced = 0
+            finally:
+                os.close(fd)
+            if self.unsynced and self.timer is None:
+                self.timer = threading.Timer(SWEEP_FSYNC_MS / 1000.0, self.sync)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def sync(self) -> None:
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.unsynced:
+                return
+            self.unsynced = 0
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            except FileNotFoundError:
+                return  # removed since (e.g. day archived)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+_sweep_logs: Dict[Path, _SweepLog] = {}
+_sweep_logs_lock = threading.Lock()
+
+def _migrate_legacy_sweeps(date_str: str) -> bool:
+    """Move a legacy {date}.echo.json array into the JSONL log once; True if it did."""
+    legacy_rel = today_files(date_str)["echo"]
+    if not p(legacy_rel).exists():
+        return False
+    log = p(sweep_log_file(date_str))
+    if not log.exists():
+        records = read_json(legacy_rel)
+        if isinstance(records, dict):
+            # tolerate old format accidentally saved as dict
+            records = [records]
+        tmp = log.with_name(log.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, log)
+    # Keep the original under a name nothing reads anymore
+    os.replace(p(legacy_rel), p(f"{date_str}.echo.legacy.json"))
+    return True
+
+def migrate_legacy_sweeps() -> List[str]:
+    """Migrate every legacy sweep file under DATA_DIR; returns the migrated dates."""
+    if not DATA_DIR.exists():
+        return []
+    migrated = []
+    with _sweep_logs_lock:
+        for path in sorted(DATA_DIR.glob("*.echo.json")):
+            date_str = path.name[:-len(".echo.json")]
+            if _migrate_legacy_sweeps(date_str):
+                migrated.append(date_str)
+    return migrated
+
+def _sweep_log(date_str: str) -> _SweepLog:
+    path = p(sweep_log_file(date_str))
+    with _sweep_logs_lock:
+        log = _sweep_logs.get(path)
+        if log is None:
+            _migrate_legacy_sweeps(date_str)
+            log = _sweep_logs[path] = _SweepLog(path)
+        return log
+
+def append_sweep(date_str: str, record: dict) -> None:
+    """Append one sweep record to the day's log."""
+    _sweep_log(date_str).append(record)
+
+def sync_sweep_logs() -> None:
+    """fsync every sweep log with pending records (call on shutdown)."""
+    with _sweep_logs_lock:
+        logs = list(_sweep_logs.values())
+    for log in logs:
+        log.sync()
+
+def has_sweeps(date_str: str) -> bool:
+    """True if the day has a sweep log (or a not yet migrated legacy sweep file)."""
+    return p(sweep_log_file(date_str)).exists() or p(today_files(date_str)["echo"]).exists()
+
+def iter_sweeps(date_str: str) -> Iterator[dict]:
+    """Stream a day's sweep records in append order. Missing log => nothing"""
+    log = p(sweep_log_file(date_str))
+    if log.exists():
+        with open(log, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # torn final line from a crash mid-append
+                    continue
+        return
+    legacy_rel = today_files(date_str)["echo"]
+    if p(legacy_rel).exists():
+        sweeps = read_json(legacy_rel)
+        yield from ([sweeps] if isinstance(sweeps, dict) else sweeps)
+
+def load_day(date_str: str) -> Tuple[Optional[dict], Iterator[dict], Optional[dict]]:
+    """Load seed (dict or None), sweeps (lazy iterator), seal (dict or None). Missing files => None/empty"""
     files = today_files(date_str)
     seed = read_json(files["seed"]) if p(files["seed"]).exists() else None
-    sweeps = read_json(files["echo"]) if p(files["echo"]).exists() else []
-    if isinstance(sweeps, dict):
-        # tolerate old format accidentally saved as dict
-        sweeps = [sweeps]
+    sweeps = iter_sweeps(date_str)
     seal = read_json(files["seal"]) if p(files["seal"]).exists() else None
     return seed, sweeps, seal
 
-def build_ledger_obj(date_str: str, seed: dict, sweeps: List[dict], seal: dict) -> dict:
+def build_ledger_obj(date_str: str, seed: dict, sweeps: Iterable[dict], seal: dict) -> dict:
     from .hashing import sha256_json, merkle_root
-    leaves = [sha256_json(seed)] + [sha256_json(s) for s in sweeps] + [sha256_json(seal)]
+    sweep_hashes = [sha256_json(s) for s in sweeps]
+    leaves = [sha256_json(seed)] + sweep_hashes + [sha256_json(seal)]
     root = merkle_root(leaves)
     files = today_files(date_str)
     return {
         "date": date_str,
         "day_root": root,
-        "counts": {"seeds": 1 if seed else 0, "sweeps": len(sweeps), "seals": 1 if seal else 0},
+        "counts": {"seeds": 1 if seed else 0, "sweeps": len(sweep_hashes), "seals": 1 if seal else 0},
         "links": {
             "seed": files["seed"],
-            "echo": files["echo"],
+            "echo": sweep_log_file(date_str),
             "seal": files["seal"],
             "ledger": files["ledger"],
         },
         "ts": __import__("datetime").datetime.now(__import__("datetime").timezone.utc).isoformat().replace("+00:00", "Z"),
     }
-
@@ -0,0 +1,112 @@
+import json
+import os
+
+import pytest
+
+from app.day_index import DayIndex
+
+
+def write_day(data_dir, date_str, sweeps=0, txs=(), seal=False):
+    day = data_dir / date_str
+    day.mkdir(parents=True, exist_ok=True)
+    (data_dir / f"{date_str}.seed.json").write_text(json.dumps({"type": "seed", "date": date_str}))
+    with open(data_dir / f"{date_str}.echo.jsonl", "a") as f:
+        for i in range(sweeps):
+            f.write(json.dumps({"type": "sweep", "note": f"n{i}"}) + "\n")
+    with open(day / f"{date_str}.gic.jsonl", "a") as f:
+        for amount in txs:
+            f.write(json.dumps({"type": "gic_tx", "amount": amount}) + "\n")
+    if seal:
+        (data_dir / f"{date_str}.seal.json").write_text(json.dumps({"type": "seal"}))
+        (data_dir / f"{date_str}.ledger.json").write_text(json.dumps({"day_root": f"root-{date_str}"}))
+
+
+def bump(path):
+    # make the change visible even on filesystems with coarse mtimes
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_summary_matches_files(tmp_path):
+    write_day(tmp_path, "2025-10-01", sweeps=3, txs=(10, 25), seal=True)
+    s = DayIndex(tmp_path, tmp_path).summary("2025-10-01")
+    assert s["present"] == {"seed": True, "echo": True, "seal": True, "ledger": True, "gic": True}
+    assert s["counts"] == {"seeds": 1, "sweeps": 3, "seals": 1, "gic_txs": 2}
+    assert s["gic"]["sum"] == 35
+    assert s["day_root"] == "root-2025-10-01"
+    assert s["links"]["echo"] == str(tmp_path / "2025-10-01.echo.jsonl")
+
+
+def test_missing_day(tmp_path):
+    s = DayIndex(tmp_path, tmp_path).summary("2025-01-01")
+    assert not any(s["present"].values())
+    assert s["counts"] == {"seeds": 0, "sweeps": 0, "seals": 0, "gic_txs": 0}
+    assert s["gic"] == {"sum": 0, "file": None}
+
+
+def test_unlisted_and_invalid_dates_are_not_stored(tmp_path):
+    index = DayIndex(tmp_path, tmp_path)
+    (tmp_path / "2025-10-05.seed.json").write_text(json.dumps({"type": "seed"}))
+    # a seed without a day directory is still reported, just not indexed
+    assert index.summary("2025-10-05")["present"]["seed"] is True
+    index.touch("2025-10-05")
+    for bad in ("../x", "2025-10-01\n", "latest"):
+        with pytest.raises(ValueError):
+            index.summary(bad)
+    assert index._connect().execute("SELECT COUNT(*) FROM days").fetchone()[0] == 0
+
+
+def test_appends_are_picked_up_from_the_last_offset(tmp_path):
+    write_day(tmp_path, "2025-10-01", sweeps=2, txs=(10,))
+    index = DayIndex(tmp_path, tmp_path)
+    assert index.summary("2025-10-01")["counts"]["sweeps"] == 2
+
+    write_day(tmp_path, "2025-10-01", sweeps=3, txs=(5,))
+    bump(tmp_path / "2025-10-01.echo.jsonl")
+    s = index.summary("2025-10-01")
+    # the log now has 2 + 3 lines (note names repeat, counts do not care)
+    assert s["counts"]["sweeps"] == 5
+    assert s["counts"]["gic_txs"] == 2
+    assert s["gic"]["sum"] == 15
+    state = json.loads(index._connect().execute("SELECT state FROM days").fetchone()[0])
+    assert state["echo"]["offset"] == (tmp_path / "2025-10-01.echo.jsonl").stat().st_size
+
+
+def test_trailing_line_without_newline_is_not_double_counted(tmp_path):
+    write_day(tmp_path, "2025-10-01", sweeps=1)
+    log = tmp_path / "2025-10-01.echo.jsonl"
+    with open(log, "a") as f:
+        f.write('{"type": "sweep"}')
+    index = DayIndex(tmp_path, tmp_path)
+    assert index.summary("2025-10-01")["counts"]["sweeps"] == 2
+    with open(log, "a") as f:
+        f.write('\n{"type": "sweep"}\n')
+    index.touch("2025-10-01")
+    assert index.summary("2025-10-01")["counts"]["sweeps"] == 3
+
+
+def test_touch_and_new_files_revalidate(tmp_path):
+    write_day(tmp_path, "2025-10-01", sweeps=1)
+    index = DayIndex(tmp_path, tmp_path)
+    assert index.summary("2025-10-01")["present"]["seal"] is False
+    write_day(tmp_path, "2025-10-01", seal=True)
+    index.touch("2025-10-01")
+    s = index.summary("2025-10-01")
+    assert s["present"]["seal"] and s["day_root"] == "root-2025-10-01"
+
+
+def test_page_orders_limits_and_counts(tmp_path):
+    for d in ("2025-10-01", "2025-10-02", "2025-10-03"):
+        write_day(tmp_path, d, sweeps=1, seal=d != "2025-10-03")
+    (tmp_path / "not-a-date").mkdir()
+    index = DayIndex(tmp_path, tmp_path)
+
+    total, items = index.page(descending=True, limit=2)
+    assert total == 3
+    assert [i["date"] for i in items] == ["2025-10-03", "2025-10-02"]
+    total, items = index.page(descending=False, limit=0)
+    assert [i["date"] for i in items] == ["2025-10-01", "2025-10-02", "2025-10-03"]
+    assert index.latest_with_ledger() == "2025-10-02"
+
+    write_day(tmp_path, "2025-10-04")
+    assert index.page(limit=1)[0] == 4
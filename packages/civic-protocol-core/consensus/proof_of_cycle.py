@@ -16,6 +16,8 @@ from datetime import datetime, date
 from enum import Enum
 import secrets
 import hmac
+import copy
+from concurrent.futures import Executor
 
 class CycleStatus(Enum):
     """Status of a civic cycle"""
@@ -176,72 +178,368 @@ class Microblock:
     hash: str
 
 class MerkleTree:
-    """Simple Merkle tree implementation"""
+    """Append-only binary Merkle tree over 32-byte digests
     
-    def __init__(self, data: List[str]):
-        self.data = data
-        self.tree = self._build_tree()
+    Each level is one contiguous bytearray of 32-byte nodes. Odd nodes are
+    promoted unhashed to the next level (the RFC 6962 shape), so the tree is
+    never padded and the root of n leaves is the same whether it was bulk
+    built or grown by append(). Stored upper levels only hold parents of
+    complete pairs, i.e. roots of perfect subtrees; the root is folded from
+    the unpaired node of each level in O(log n).
     
-    def _build_tree(self) -> List[List[str]]:
-        """Build the Merkle tree"""
-        if not self.data:
-            return []
-        
-        # Pad to power of 2
-        padded_data = self.data[:]
-        while len(padded_data) & (len(padded_data) - 1):
-            padded_data.append("")
-        
-        tree = [padded_data]
-        current_level = padded_data
-        
-        while len(current_level) > 1:
-            next_level = []
-            for i in range(0, len(current_level), 2):
-                left = current_level[i]
-                right = current_level[i + 1] if i + 1 < len(current_level) else ""
-                combined = left + right
-                hash_value = hashlib.sha256(combined.encode()).hexdigest()
-                next_level.append(hash_value)
-            tree.append(next_level)
-            current_level = next_level
-        
-        return tree
+    Leaves are 32-byte digests or their hex encoding; roots and proofs are
+    returned as hex strings.
+    """
+    
+    DIGEST_SIZE = 32
+    NODE_PREFIX = b"\x01"  # domain separation for interior nodes
+    
+    def __init__(self, data: Optional[List[Any]] = None):
+        self.levels: List[bytearray] = [bytearray()]
+        if data:
+            self._build(b"".join(self._to_digest(leaf) for leaf in data))
+    
+    @property
+    def data(self) -> List[str]:
+        """Leaf digests as hex strings"""
+        return [self._node(0, i).hex() for i in range(len(self))]
+    
+    def __len__(self) -> int:
+        return len(self.levels[0]) // self.DIGEST_SIZE
+    
+    @classmethod
+    def _to_digest(cls, leaf: Any) -> bytes:
+        digest = bytes.fromhex(leaf) if isinstance(leaf, str) else bytes(leaf)
+        if len(digest) != cls.DIGEST_SIZE:
+            raise ValueError(f"Merkle leaves must be {cls.DIGEST_SIZE}-byte digests")
+        return digest
+    
+    @classmethod
+    def _hash_pair(cls, pair: bytes) -> bytes:
+        return hashlib.sha256(cls.NODE_PREFIX + pair).digest()
+    
+    @classmethod
+    def _hash_level(cls, level: bytes) -> bytearray:
+        """Hash every complete pair of a level into the next one"""
+        size = cls.DIGEST_SIZE
+        view = memoryview(level)
+        pairs = len(level) // (2 * size)
+        return bytearray(b"".join(
+            cls._hash_pair(view[i * 2 * size:(i + 1) * 2 * size]) for i in range(pairs)
+        ))
+    
+    def _build(self, leaves: bytes):
+        """Bulk build: hash one level at a time"""
+        self.levels = [bytearray(leaves)]
+        while len(self.levels[-1]) >= 2 * self.DIGEST_SIZE:
+            self.levels.append(self._hash_level(self.levels[-1]))
+    
+    def _node(self, height: int, index: int) -> bytes:
+        size = self.DIGEST_SIZE
+        return bytes(self.levels[height][index * size:(index + 1) * size])
+    
+    def append(self, leaf: Any) -> int:
+        """Append a leaf in O(log n) and return its index"""
+        size = self.DIGEST_SIZE
+        self.levels[0] += self._to_digest(leaf)
+        height = 0
+        # Completing a pair creates one parent; cascade while that completes another
+        while len(self.levels[height]) % (2 * size) == 0:
+            if height + 1 == len(self.levels):
+                self.levels.append(bytearray())
+            self.levels[height + 1] += self._hash_pair(bytes(self.levels[height][-2 * size:]))
+            height += 1
+        return len(self) - 1
+    
+    def _fold_below(self, height: int) -> Optional[bytes]:
+        """Hash of the trailing partial subtree formed by unpaired nodes below height"""
+        acc = None
+        for h in range(min(height, len(self.levels))):
+            count = len(self.levels[h]) // self.DIGEST_SIZE
+            if count % 2:
+                peak = self._node(h, count - 1)
+                acc = peak if acc is None else self._hash_pair(peak + acc)
+        return acc
+    
+    def root(self) -> bytes:
+        """Merkle root as raw bytes (empty for an empty tree)"""
+        return self._fold_below(len(self.levels)) or b""
     
     def get_root(self) -> str:
         """Get the Merkle root"""
-        if not self.tree:
-            return ""
-        return self.tree[-1][0]
+        return self.root().hex()
+    
+    def _virtual_node(self, height: int, index: int) -> bytes:
+        """Node of the promoted tree at (height, index), which may be a partial subtree"""
+        n = len(self)
+        if (index + 1) << height <= n:
+            return self._node(height, index)
+        return self._fold_below(height)
     
     def get_proof(self, index: int) -> List[str]:
         """Get Merkle proof for an element"""
-        if index >= len(self.data):
+        if index >= len(self):
             return []
         
         proof = []
-        current_index = index
+        count, height = len(self), 0
+        while count > 1:
+            sibling = (index >> height) ^ 1
+            if sibling < count:
+                proof.append(self._virtual_node(height, sibling).hex())
+            count = (count + 1) // 2
+            height += 1
+        return proof
+    
+    def get_multi_proof(self, indices: List[int]) -> List[str]:
+        """Get one proof covering several leaves
         
-        for level in self.tree[:-1]:
-            if current_index % 2 == 0:
-                # Left node, need right sibling
-                sibling_index = current_index + 1
-            else:
-                # Right node, need left sibling
-                sibling_index = current_index - 1
+        Siblings that can be derived from the requested leaves themselves are
+        omitted, so a batch proof is smaller than the sum of single proofs.
+        """
+        known = sorted(set(indices))
+        if not known or known[-1] >= len(self):
+            return []
+        
+        proof = []
+        count, height = len(self), 0
+        while count > 1:
+            known_set = set(known)
+            for index in known:
+                sibling = index ^ 1
+                if sibling < count and sibling not in known_set:
+                    proof.append(self._virtual_node(height, sibling).hex())
+            known = sorted({index >> 1 for index in known})
+            count = (count + 1) // 2
+            height += 1
+        return proof
+    
+    @classmethod
+    def verify_proof(cls, leaf: Any, index: int, size: int, proof: List[str], root: Any) -> bool:
+        """Verify a proof from get_proof against a root for a tree of size leaves"""
+        return cls.verify_multi_proof({index: leaf}, size, proof, root)
+    
+    @classmethod
+    def verify_multi_proof(cls, leaves: Dict[int, Any], size: int, proof: List[str], root: Any) -> bool:
+        """Verify a proof from get_multi_proof for {index: leaf} against a root"""
+        try:
+            if not leaves or max(leaves) >= size or min(leaves) < 0:
+                return False
+            nodes = {index: cls._to_digest(leaf) for index, leaf in leaves.items()}
+            siblings = iter(cls._to_digest(item) for item in proof)
             
-            if sibling_index < len(level):
-                proof.append(level[sibling_index])
+            count = size
+            while count > 1:
+                parents = {}
+                for index in sorted(nodes):
+                    if index >> 1 in parents:
+                        continue  # already combined with its left sibling
+                    sibling = index ^ 1
+                    if sibling >= count:
+                        parents[index >> 1] = nodes[index]  # promoted
+                        continue
+                    sibling_node = nodes[sibling] if sibling in nodes else next(siblings)
+                    pair = nodes[index] + sibling_node if index % 2 == 0 else sibling_node + nodes[index]
+                    parents[index >> 1] = cls._hash_pair(pair)
+                nodes = parents
+                count = (count + 1) // 2
             
-            current_index //= 2
+            if next(siblings, None) is not None:
+                return False
+            return nodes[0] == cls._to_digest(root)
+        except (StopIteration, ValueError):
+            return False
+
+class _SMTLeaf:
+    __slots__ = ("path", "value", "hash")
+    
+    def __init__(self, path: bytes, value: bytes):
+        self.path = path
+        self.value = value
+        self.hash = hashlib.sha256(SparseMerkleTree.LEAF_PREFIX + path + value).digest()
+
+class _SMTInternal:
+    __slots__ = ("left", "right", "hash")
+    
+    def __init__(self):
+        self.left = None
+        self.right = None
+        self.hash: Optional[bytes] = None  # None = stale, recomputed on demand
+
+class SparseMerkleTree:
+    """Authenticated key/value map for account state
+    
+    Keys are placed at sha256(key) in a binary trie. A subtree holding a
+    single leaf hashes to that leaf, so the trie is only as deep as needed to
+    separate keys (about log2(n) for n accounts) and the root depends only on
+    the key/value set, never on insertion order. update() marks the touched
+    path stale; get_root() rehashes just the stale nodes, so a block that
+    touches k accounts costs O(k log n) hashes.
+    """
+    
+    EMPTY = b"\x00" * 32
+    LEAF_PREFIX = b"\x00"
+    NODE_PREFIX = b"\x01"
+    
+    def __init__(self):
+        self._root = None
+    
+    @staticmethod
+    def _path(key: str) -> bytes:
+        return hashlib.sha256(key.encode()).digest()
+    
+    @staticmethod
+    def _bit(path: bytes, depth: int) -> int:
+        return (path[depth >> 3] >> (7 - (depth & 7))) & 1
+    
+    def update(self, key: str, value: bytes):
+        """Insert or replace the value stored under key"""
+        self._root = self._insert(self._root, _SMTLeaf(self._path(key), value), 0)
+    
+    def _insert(self, node, leaf: _SMTLeaf, depth: int):
+        if node is None:
+            return leaf
+        if isinstance(node, _SMTLeaf):
+            return leaf if node.path == leaf.path else self._split(node, leaf, depth)
         
-        return proof
+        node.hash = None
+        if self._bit(leaf.path, depth):
+            node.right = self._insert(node.right, leaf, depth + 1)
+        else:
+            node.left = self._insert(node.left, leaf, depth + 1)
+        return node
+    
+    def _split(self, existing: _SMTLeaf, leaf: _SMTLeaf, depth: int) -> _SMTInternal:
+        """Push two leaves down until their paths diverge"""
+        internal = _SMTInternal()
+        existing_bit, leaf_bit = self._bit(existing.path, depth), self._bit(leaf.path, depth)
+        if existing_bit == leaf_bit:
+            child = self._split(existing, leaf, depth + 1)
+            if leaf_bit:
+                internal.right = child
+            else:
+                internal.left = child
+        elif leaf_bit:
+            internal.left, internal.right = existing, leaf
+        else:
+            internal.left, internal.right = leaf, existing
+        return internal
+    
+    def _hash(self, node) -> bytes:
+        if node is None:
+            return self.EMPTY
+        if node.hash is None:
+            node.hash = hashlib.sha256(
+                self.NODE_PREFIX + self._hash(node.left) + self._hash(node.right)
+            ).digest()
+        return node.hash
+    
+    def get_root(self) -> str:
+        """Get the state root"""
+        return self._hash(self._root).hex()
+    
+    def get_proof(self, key: str) -> Optional[Dict[str, Any]]:
+        """Inclusion proof for key, or None if the key is absent
+        
+        siblings are ordered from the root down to the leaf.
+        """
+        path = self._path(key)
+        node, depth, siblings = self._root, 0, []
+        while isinstance(node, _SMTInternal):
+            if self._bit(path, depth):
+                siblings.append(self._hash(node.left).hex())
+                node = node.right
+            else:
+                siblings.append(self._hash(node.right).hex())
+                node = node.left
+            depth += 1
+        
+        if node is None or node.path != path:
+            return None
+        return {"key": key, "value": node.value.hex(), "siblings": siblings}
+    
+    @classmethod
+    def verify_proof(cls, key: str, value: Any, siblings: List[str], root: str) -> bool:
+        """Verify an inclusion proof from get_proof against a state root"""
+        path = cls._path(key)
+        value = bytes.fromhex(value) if isinstance(value, str) else value
+        node = _SMTLeaf(path, value).hash
+        for depth in range(len(siblings) - 1, -1, -1):
+            sibling = bytes.fromhex(siblings[depth])
+            pair = sibling + node if cls._bit(path, depth) else node + sibling
+            node = hashlib.sha256(cls.NODE_PREFIX + pair).digest()
+        return node.hex() == root
+
+# Stateless block checks - module level so they can run in a process pool
+
+VALID_EARN_REASONS = ("reflection", "attestation", "vote", "cycle_participation")
+
+def _check_transaction_format(tx: GICTransaction) -> bool:
+    return bool(tx.tx_id) and isinstance(tx.amount, int) and tx.amount >= 0 and isinstance(tx.nonce, int)
+
+def _check_earn_transaction_format(tx: EarnTransaction) -> bool:
+    return (bool(tx.tx_id) and isinstance(tx.amount, int) and tx.amount >= 0
+            and tx.reason in VALID_EARN_REASONS)
+
+def _check_cycle_format(cycle: Cycle) -> bool:
+    try:
+        datetime.strptime(cycle.date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return False
+    return True
+
+_STATELESS_CHECKS = {
+    "transaction": _check_transaction_format,
+    "earn_transaction": _check_earn_transaction_format,
+    "cycle": _check_cycle_format,
+}
+
+def _check_chunk(kind: str, items: List[Any]) -> bool:
+    """Run the stateless check for kind over a chunk of block items"""
+    check = _STATELESS_CHECKS[kind]
+    return all(check(item) for item in items)
+
+class _CopyOnWriteDict:
+    """Mapping over a base dict that copies values on first access
+    
+    Reads and writes land in self.changes, so the base dict is untouched
+    until the changes are committed.
+    """
+    
+    def __init__(self, base: Dict[str, Any]):
+        self.base = base
+        self.changes: Dict[str, Any] = {}
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.changes or key in self.base
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.changes:
+            self.changes[key] = copy.copy(self.base[key])
+        return self.changes[key]
+    
+    def __setitem__(self, key: str, value: Any):
+        self.changes[key] = value
+
+class _StateOverlay:
+    """Pending state for one block, committed atomically or discarded"""
+    
+    def __init__(self, poc: "ProofOfCycle"):
+        self.balances = _CopyOnWriteDict(poc.balances)
+        self.citizens = _CopyOnWriteDict(poc.citizens)
+        self.cycles = _CopyOnWriteDict(poc.cycles)
 
 class ProofOfCycle:
     """Proof-of-Cycle consensus implementation"""
     
-    def __init__(self, genesis_policy: Policy):
+    # Block items per task when stateless checks run on validation_executor
+    VALIDATION_CHUNK_SIZE = 1024
+    
+    def __init__(self, genesis_policy: Policy, validation_executor: Optional[Executor] = None):
         self.policy = genesis_policy
+        # Optional pool for stateless block checks (e.g. a ProcessPoolExecutor);
+        # the caller owns its lifecycle
+        self.validation_executor = validation_executor
         self.citizens: Dict[str, CitizenID] = {}
         self.companions: Dict[str, CompanionID] = {}
         self.cycles: Dict[str, Cycle] = {}
@@ -252,6 +550,10 @@ class ProofOfCycle:
         self.votes: Dict[str, Vote] = {}
         self.committee_size = 7  # Default committee size
         self.epoch_duration = 300  # 5 minutes in seconds
+        # Authenticated account state; accounts touched since the last state
+        # root are folded in lazily by _compute_state_root
+        self.state_tree = SparseMerkleTree()
+        self._dirty_accounts: set = set()
         
     def register_citizen(self, pubkey: str) -> str:
         """Register a new citizen"""
@@ -265,6 +567,7 @@ class ProofOfCycle:
             staked=0,
             last_updated=int(time.time())
         )
+        self._dirty_accounts.add(citizen_id)
         return citizen_id
     
     def register_companion(self, pubkey: str, citizen_owner: str, 
@@ -425,51 +728,82 @@ class ProofOfCycle:
     
     def validate_block(self, block: L1Block) -> bool:
         """Validate a proposed block"""
+        return self._validate_into_overlay(block) is not None
+    
+    def add_block(self, block: L1Block) -> bool:
+        """Add a validated block to the chain
+        
+        The block's state transitions are applied to an overlay during
+        validation and committed in one step, so a block is either fully
+        applied or not at all.
+        """
+        overlay = self._validate_into_overlay(block)
+        if overlay is None:
+            return False
+        
+        self.blocks.append(block)
+        self._commit_overlay(overlay)
+        return True
+    
+    def _validate_into_overlay(self, block: L1Block) -> Optional[_StateOverlay]:
+        """Validate a block and return its pending state, or None if invalid"""
         # Check block hash
         if block.hash != self._hash_block(block):
-            return False
+            return None
         
         # Check parent hash
         if block.header.height > 0:
             if block.header.parent_hash != self.blocks[-1].hash:
-                return False
+                return None
         
-        # Validate transactions
-        for tx in block.transactions:
-            if not self._validate_transaction(tx):
-                return False
+        # Stateless checks (formats, reasons, dates), possibly in parallel
+        if not self._run_stateless_checks(block):
+            return None
         
-        # Validate earn transactions
-        for tx in block.earn_transactions:
-            if not self._validate_earn_transaction(tx):
-                return False
-        
-        # Validate cycles
-        for cycle in block.cycles:
-            if not self._validate_cycle(cycle):
-                return False
-        
-        return True
-    
-    def add_block(self, block: L1Block) -> bool:
-        """Add a validated block to the chain"""
-        if not self.validate_block(block):
-            return False
-        
-        self.blocks.append(block)
+        # Sequential state transitions against the overlay
+        overlay = _StateOverlay(self)
         
-        # Apply transactions
         for tx in block.transactions:
-            self._apply_transaction(tx)
+            if not self._validate_transaction(tx, overlay.balances):
+                return None
+            self._apply_transaction(tx, overlay)
         
         for tx in block.earn_transactions:
-            self._apply_earn_transaction(tx)
+            if not self._validate_earn_transaction(tx, overlay.cycles):
+                return None
+            self._apply_earn_transaction(tx, overlay)
         
-        # Update cycles
         for cycle in block.cycles:
-            self.cycles[cycle.cycle_id] = cycle
+            if not self._validate_cycle(cycle, overlay.citizens):
+                return None
+            overlay.cycles[cycle.cycle_id] = cycle
         
-        return True
+        return overlay
+    
+    def _run_stateless_checks(self, block: L1Block) -> bool:
+        """Run checks that need no chain state, fanned out over validation_executor if set"""
+        batches = [
+            ("transaction", block.transactions),
+            ("earn_transaction", block.earn_transactions),
+            ("cycle", block.cycles),
+        ]
+        if self.validation_executor is None:
+            return all(_check_chunk(kind, items) for kind, items in batches)
+        
+        size = self.VALIDATION_CHUNK_SIZE
+        futures = [
+            self.validation_executor.submit(_check_chunk, kind, items[i:i + size])
+            for kind, items in batches
+            for i in range(0, len(items), size)
+        ]
+        return all(future.result() for future in futures)
+    
+    def _commit_overlay(self, overlay: _StateOverlay):
+        """Apply a validated block's pending state"""
+        self.balances.update(overlay.balances.changes)
+        self.citizens.update(overlay.citizens.changes)
+        self.cycles.update(overlay.cycles.changes)
+        self._dirty_accounts.update(overlay.balances.changes)
     
     def create_earn_transaction(self, to_addr: str, amount: int, reason: str,
                                cycle_id: str, attestation_hash: str) -> EarnTransaction:
@@ -542,17 +876,48 @@ class ProofOfCycle:
     
     def _compute_state_root(self) -> str:
         """Compute the current state root"""
-        # Simplified state root computation
-        state_data = ""
-        for addr, account in self.balances.items():
-            state_data += f"{addr}{account.balance}{account.nonce}"
-        return hashlib.sha256(state_data.encode()).hexdigest()
-    
-    def _validate_transaction(self, tx: GICTransaction) -> bool:
-        """Validate a MIC transaction"""
+        for addr in self._dirty_accounts:
+            account = self.balances.get(addr)
+            if account:
+                self.state_tree.update(addr, self._account_state_hash(account))
+        self._dirty_accounts.clear()
+        return self.state_tree.get_root()
+    
+    @staticmethod
+    def _account_state_hash(account: GICAccount) -> bytes:
+        """Hash of the account fields committed to by the state root"""
+        account_data = f"{account.address}:{account.balance}:{account.nonce}:{account.vesting}:{account.staked}"
+        return hashlib.sha256(account_data.encode()).digest()
+    
+    def get_account_proof(self, address: str) -> Optional[Dict[str, Any]]:
+        """Get an inclusion proof for an account against the current state root
+        
+        Check it with SparseMerkleTree.verify_proof(address, value, siblings, state_root).
+        """
+        state_root = self._compute_state_root()
+        proof = self.state_tree.get_proof(address)
+        if proof is None:
+            return None
+        
+        account = self.balances[address]
+        return {
+            "address": address,
+            "balance": account.balance,
+            "nonce": account.nonce,
+            "vesting": account.vesting,
+            "staked": account.staked,
+            "value": proof["value"],
+            "siblings": proof["siblings"],
+            "state_root": state_root
+        }
+    
+    def _validate_transaction(self, tx: GICTransaction,
+                              balances: Optional[Any] = None) -> bool:
+        """Validate a MIC transaction against state (formats are checked separately)"""
+        balances = self.balances if balances is None else balances
         # Check if sender has sufficient balance
-        if tx.from_addr in self.balances:
-            account = self.balances[tx.from_addr]
+        if tx.from_addr in balances:
+            account = balances[tx.from_addr]
             if account.balance < tx.amount:
                 return False
             if account.nonce != tx.nonce:
@@ -560,41 +925,34 @@ class ProofOfCycle:
         
         return True
     
-    def _validate_earn_transaction(self, tx: EarnTransaction) -> bool:
-        """Validate an earn transaction"""
-        # Check if the reason is valid
-        valid_reasons = ["reflection", "attestation", "vote", "cycle_participation"]
-        if tx.reason not in valid_reasons:
-            return False
-        
+    def _validate_earn_transaction(self, tx: EarnTransaction,
+                                   cycles: Optional[Any] = None) -> bool:
+        """Validate an earn transaction against state (reasons are checked separately)"""
+        cycles = self.cycles if cycles is None else cycles
         # Check if cycle exists
-        if tx.cycle_id not in self.cycles:
+        if tx.cycle_id not in cycles:
             return False
         
         return True
     
-    def _validate_cycle(self, cycle: Cycle) -> bool:
-        """Validate a cycle"""
-        # Check if cycle date is valid
-        try:
-            datetime.strptime(cycle.date, "%Y-%m-%d")
-        except ValueError:
-            return False
-        
+    def _validate_cycle(self, cycle: Cycle, citizens: Optional[Any] = None) -> bool:
+        """Validate a cycle against state (dates are checked separately)"""
+        citizens = self.citizens if citizens is None else citizens
         # Check if proposer is valid
-        if cycle.proposer not in self.citizens:
+        if cycle.proposer not in citizens:
             return False
         
         return True
     
-    def _apply_transaction(self, tx: GICTransaction):
-        """Apply a MIC transaction to state"""
-        if tx.from_addr in self.balances:
-            self.balances[tx.from_addr].balance -= tx.amount
-            self.balances[tx.from_addr].nonce += 1
+    def _apply_transaction(self, tx: GICTransaction, overlay: _StateOverlay):
+        """Apply a MIC transaction to a block's pending state"""
+        balances = overlay.balances
+        if tx.from_addr in balances:
+            balances[tx.from_addr].balance -= tx.amount
+            balances[tx.from_addr].nonce += 1
         
-        if tx.to_addr not in self.balances:
-            self.balances[tx.to_addr] = GICAccount(
+        if tx.to_addr not in balances:
+            balances[tx.to_addr] = GICAccount(
                 address=tx.to_addr,
                 nonce=0,
                 balance=0,
@@ -603,13 +961,14 @@ class ProofOfCycle:
                 last_updated=int(time.time())
             )
         
-        self.balances[tx.to_addr].balance += tx.amount
-        self.balances[tx.to_addr].last_updated = int(time.time())
+        balances[tx.to_addr].balance += tx.amount
+        balances[tx.to_addr].last_updated = int(time.time())
     
-    def _apply_earn_transaction(self, tx: EarnTransaction):
-        """Apply an earn transaction to state"""
-        if tx.to_addr not in self.balances:
-            self.balances[tx.to_addr] = GICAccount(
+    def _apply_earn_transaction(self, tx: EarnTransaction, overlay: _StateOverlay):
+        """Apply an earn transaction to a block's pending state"""
+        balances = overlay.balances
+        if tx.to_addr not in balances:
+            balances[tx.to_addr] = GICAccount(
                 address=tx.to_addr,
                 nonce=0,
                 balance=0,
@@ -618,12 +977,12 @@ class ProofOfCycle:
                 last_updated=int(time.time())
             )
         
-        self.balances[tx.to_addr].balance += tx.amount
-        self.balances[tx.to_addr].last_updated = int(time.time())
+        balances[tx.to_addr].balance += tx.amount
+        balances[tx.to_addr].last_updated = int(time.time())
         
         # Update activity score
-        if tx.to_addr in self.citizens:
-            self.citizens[tx.to_addr].activity_score += 1.0
+        if tx.to_addr in overlay.citizens:
+            overlay.citizens[tx.to_addr].activity_score += 1.0
 
 def create_genesis_policy() -> Policy:
     """Create the genesis policy configuration"""
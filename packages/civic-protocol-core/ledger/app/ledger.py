@@ -7,13 +7,57 @@ and blockchain-like operations. Think of it as the "Bitcoin Core" equivalent
 for the Civic Protocol ecosystem.
 """
 
-import sqlite3
+import base64
 import hashlib
+import hmac
 import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
-import os
+
+try:
+    from .storage import (
+        LedgerStorage, INSERT_EVENT_SQL, UPSERT_IDENTITY_SQL, SELECT_LATEST_HASH_SQL,
+        SELECT_IDENTITY_SQL, SELECT_RECENT_IDENTITY_EVENTS_SQL, SELECT_CHAIN_ROWS_SQL,
+        SELECT_EVENT_HASH_BY_ROWID_SQL, SELECT_MAX_ROWID_SQL, INSERT_CHECKPOINT_SQL,
+        SELECT_LATEST_CHECKPOINT_SQL, DELETE_CHECKPOINTS_FROM_SQL, SELECT_IDENTITY_EXISTS_SQL,
+        SELECT_STATS_SQL, SELECT_STAT_COUNTS_SQL, UPDATE_STATS_SQL, INCREMENT_STAT_COUNT_SQL,
+    )
+except ImportError:  # executed as a script from ledger/app
+    from storage import (
+        LedgerStorage, INSERT_EVENT_SQL, UPSERT_IDENTITY_SQL, SELECT_LATEST_HASH_SQL,
+        SELECT_IDENTITY_SQL, SELECT_RECENT_IDENTITY_EVENTS_SQL, SELECT_CHAIN_ROWS_SQL,
+        SELECT_EVENT_HASH_BY_ROWID_SQL, SELECT_MAX_ROWID_SQL, INSERT_CHECKPOINT_SQL,
+        SELECT_LATEST_CHECKPOINT_SQL, DELETE_CHECKPOINTS_FROM_SQL, SELECT_IDENTITY_EXISTS_SQL,
+        SELECT_STATS_SQL, SELECT_STAT_COUNTS_SQL, UPDATE_STATS_SQL, INCREMENT_STAT_COUNT_SQL,
+    )
+
+GENESIS_HASH = "0" * 64
+
+# Columns that can be requested from get_events / get_events_page
+EVENT_FIELDS = (
+    "event_id", "event_type", "civic_id", "lab_source", "payload", "timestamp",
+    "previous_hash", "event_hash", "signature", "block_height",
+)
+
+def encode_cursor(rowid: int) -> str:
+    """Encode a keyset pagination position as an opaque token"""
+    return base64.urlsafe_b64encode(f"r{rowid}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a token produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if not raw.startswith("r"):
+            raise ValueError
+        return int(raw[1:])
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
 
 @dataclass
 class LedgerEvent:
@@ -40,83 +84,111 @@ class LedgerBlock:
     timestamp: str
     merkle_root: str
 
+@dataclass
+class VerificationResult:
+    """Outcome of a chain verification run"""
+    ok: bool
+    height: int           # chain length verified, including resumed prefix
+    tip_hash: str
+    verified: int         # events re-hashed during this run
+    resumed_from: int     # checkpoint height the run started from
+    elapsed_seconds: float
+    failure: Optional[Dict[str, Any]] = None
+
+def compute_event_hash(event_id: str, event_type: str, civic_id: str, lab_source: str,
+                       payload: Dict[str, Any], timestamp: str, previous_hash: str) -> str:
+    """Calculate SHA-256 hash of an event's fields"""
+    event_data = f"{event_id}{event_type}{civic_id}{lab_source}{json.dumps(payload, sort_keys=True)}{timestamp}{previous_hash}"
+    return hashlib.sha256(event_data.encode()).hexdigest()
+
+def _hash_chain_rows(rows: List[Tuple]) -> List[str]:
+    """Recompute hashes for raw SELECT_CHAIN_ROWS_SQL rows (process pool worker)"""
+    return [
+        compute_event_hash(row[1], row[2], row[3], row[4], json.loads(row[5]), row[6], row[7])
+        for row in rows
+    ]
+
 class LedgerCore:
-    """Core ledger functionality - the blockchain kernel"""
+    """Core ledger functionality - the blockchain kernel
+    
+    The chain tip is cached in memory and every append goes through one lock,
+    so a LedgerCore must be the only writer to its database.
+    """
     
-    def __init__(self, db_path: str = "./data/ledger.db"):
+    def __init__(self, db_path: str = "./data/ledger.db", checkpoint_key: Optional[bytes] = None):
         self.db_path = db_path
-        self._init_database()
+        self.storage = LedgerStorage(db_path)
+        self._append_lock = threading.Lock()
+        self._chain_tip: Optional[str] = None
+        self.verifier = ChainVerifier(self.storage, checkpoint_key)
+        self._init_stats()
     
-    def _init_database(self):
-        """Initialize the ledger database"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+    def _init_stats(self):
+        """Seed the materialized stats tables, backfilling from events once for existing ledgers"""
+        conn = self.storage.connection()
+        if conn.execute(SELECT_STATS_SQL).fetchone():
+            return
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Events table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS events (
-                    event_id TEXT PRIMARY KEY,
-                    event_type TEXT NOT NULL,
-                    civic_id TEXT NOT NULL,
-                    lab_source TEXT NOT NULL,
-                    payload TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    previous_hash TEXT NOT NULL,
-                    event_hash TEXT NOT NULL,
-                    signature TEXT,
-                    block_height INTEGER,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Blocks table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS blocks (
-                    block_id TEXT PRIMARY KEY,
-                    block_height INTEGER UNIQUE NOT NULL,
-                    previous_block_hash TEXT NOT NULL,
-                    block_hash TEXT NOT NULL,
-                    merkle_root TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    event_count INTEGER NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Identities table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS identities (
-                    civic_id TEXT PRIMARY KEY,
-                    lab_source TEXT NOT NULL,
-                    first_seen TEXT NOT NULL,
-                    last_seen TEXT NOT NULL,
-                    event_count INTEGER DEFAULT 0,
-                    balance_gic INTEGER DEFAULT 0
-                )
-            """)
+        with self.storage.transaction() as conn:
+            total_events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            total_identities = conn.execute("SELECT COUNT(*) FROM identities").fetchone()[0]
+            genesis = conn.execute("SELECT event_hash FROM events ORDER BY rowid ASC LIMIT 1").fetchone()
+            latest = conn.execute("""
+                SELECT event_hash, event_id, timestamp, event_type FROM events
+                ORDER BY rowid DESC LIMIT 1
+            """).fetchone()
             
-            # MIC transactions table
             conn.execute("""
-                CREATE TABLE IF NOT EXISTS gic_transactions (
-                    tx_id TEXT PRIMARY KEY,
-                    from_civic_id TEXT,
-                    to_civic_id TEXT,
-                    amount INTEGER NOT NULL,
-                    tx_type TEXT NOT NULL,
-                    event_id TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    FOREIGN KEY (event_id) REFERENCES events (event_id)
-                )
-            """)
+                INSERT INTO ledger_stats (id, total_events, total_identities, genesis_hash,
+                                          tip_hash, latest_event_id, latest_timestamp, latest_event_type)
+                VALUES (1, ?, ?, ?, ?, ?, ?, ?)
+            """, (total_events, total_identities, genesis[0] if genesis else None,
+                  *(latest if latest else (None, None, None, None))))
             
-            conn.commit()
+            for dimension in ("event_type", "lab_source"):
+                conn.execute(f"""
+                    INSERT INTO ledger_stat_counts (dimension, key, count)
+                    SELECT ?, {dimension}, COUNT(*) FROM events GROUP BY {dimension}
+                """, (dimension,))
+    
+    def _update_stats(self, conn, events: List[LedgerEvent]):
+        """Fold newly appended events into the materialized stats (caller holds the transaction)"""
+        if not events:
+            return
+        
+        # Must run before the identity upserts so new identities can be counted
+        new_identities = sum(
+            1 for civic_id in {event.civic_id for event in events}
+            if conn.execute(SELECT_IDENTITY_EXISTS_SQL, (civic_id,)).fetchone() is None
+        )
+        latest = events[-1]
+        conn.execute(UPDATE_STATS_SQL, (
+            len(events), new_identities, events[0].event_hash, latest.event_hash,
+            latest.event_id, latest.timestamp, latest.event_type
+        ))
+        
+        by_type = Counter(event.event_type for event in events)
+        by_lab = Counter(event.lab_source for event in events)
+        conn.executemany(INCREMENT_STAT_COUNT_SQL, [
+            *(("event_type", key, count) for key, count in by_type.items()),
+            *(("lab_source", key, count) for key, count in by_lab.items()),
+        ])
     
     def create_event(self, event_type: str, civic_id: str, lab_source: str,
                     payload: Dict[str, Any], signature: Optional[str] = None) -> LedgerEvent:
         """Create a new ledger event"""
-        event_id = f"evt_{int(datetime.now().timestamp() * 1000)}_{hashlib.sha256(f'{civic_id}{event_type}'.encode()).hexdigest()[:8]}"
+        return self._build_event(event_type, civic_id, lab_source, payload, signature,
+                                 self._get_latest_event_hash())
+    
+    def _build_event(self, event_type: str, civic_id: str, lab_source: str,
+                     payload: Dict[str, Any], signature: Optional[str],
+                     previous_hash: str) -> LedgerEvent:
+        """Build and hash an event chained onto previous_hash"""
+        # previous_hash is unique per chain position, so ids cannot collide
+        # for the same identity and type within one millisecond
+        id_seed = f'{civic_id}{event_type}{previous_hash}'
+        event_id = f"evt_{int(datetime.now().timestamp() * 1000)}_{hashlib.sha256(id_seed.encode()).hexdigest()[:8]}"
         timestamp = datetime.now(timezone.utc).isoformat()
-        previous_hash = self._get_latest_event_hash()
         
         event = LedgerEvent(
             event_id=event_id,
@@ -137,43 +209,94 @@ class LedgerCore:
     
     def add_event(self, event: LedgerEvent) -> bool:
         """Add an event to the ledger"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO events (event_id, event_type, civic_id, lab_source,
-                                      payload, timestamp, previous_hash, event_hash, signature, block_height)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    event.event_id, event.event_type, event.civic_id, event.lab_source,
-                    json.dumps(event.payload), event.timestamp, event.previous_hash,
-                    event.event_hash, event.signature, event.block_height
-                ))
-                
-                # Update identity stats
-                conn.execute("""
-                    INSERT OR REPLACE INTO identities (civic_id, lab_source, first_seen, last_seen, event_count)
-                    VALUES (?, ?, 
-                            COALESCE((SELECT first_seen FROM identities WHERE civic_id = ?), ?),
-                            ?, 
-                            COALESCE((SELECT event_count FROM identities WHERE civic_id = ?), 0) + 1)
-                """, (event.civic_id, event.lab_source, event.civic_id, event.timestamp,
-                      event.timestamp, event.civic_id))
-                
-                conn.commit()
+        with self._append_lock:
+            if event.previous_hash != self._get_latest_event_hash():
+                print(f"Error adding event: {event.event_id} does not extend the chain tip")
+                return False
+            
+            try:
+                with self.storage.transaction() as conn:
+                    self._update_stats(conn, [event])
+                    conn.execute(INSERT_EVENT_SQL, self._event_row(event))
+                    
+                    # Update identity stats
+                    conn.execute(UPSERT_IDENTITY_SQL, self._identity_row(event))
+            except Exception as e:
+                print(f"Error adding event: {e}")
+                return False
+            
+            self._chain_tip = event.event_hash
             return True
-        except Exception as e:
-            print(f"Error adding event: {e}")
-            return False
+    
+    def append_batch(self, pending: List[Any]) -> List[LedgerEvent]:
+        """Chain a batch of attestations onto the tip and commit them together
+        
+        Each item needs event_type, civic_id, lab_source, payload and signature
+        attributes. Either every event is committed or none is, and the
+        in-memory tip only advances after the commit succeeds.
+        """
+        with self._append_lock:
+            previous_hash = self._get_latest_event_hash()
+            events = []
+            for item in pending:
+                event = self._build_event(item.event_type, item.civic_id, item.lab_source,
+                                          item.payload, item.signature, previous_hash)
+                events.append(event)
+                previous_hash = event.event_hash
+            
+            with self.storage.transaction() as conn:
+                self._update_stats(conn, events)
+                conn.executemany(INSERT_EVENT_SQL, [self._event_row(e) for e in events])
+                conn.executemany(UPSERT_IDENTITY_SQL, [self._identity_row(e) for e in events])
+            
+            self._chain_tip = previous_hash
+            return events
+    
+    @staticmethod
+    def _event_row(event: LedgerEvent) -> Tuple:
+        return (
+            event.event_id, event.event_type, event.civic_id, event.lab_source,
+            json.dumps(event.payload), event.timestamp, event.previous_hash,
+            event.event_hash, event.signature, event.block_height
+        )
+    
+    @staticmethod
+    def _identity_row(event: LedgerEvent) -> Tuple:
+        return (
+            event.civic_id, event.lab_source, event.civic_id, event.timestamp,
+            event.timestamp, event.civic_id
+        )
     
     def get_events(self, civic_id: Optional[str] = None, 
                   event_type: Optional[str] = None,
                   lab_source: Optional[str] = None,
                   limit: int = 100,
-                  offset: int = 0) -> List[Dict[str, Any]]:
+                  offset: int = 0,
+                  fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get events from the ledger with optional filtering"""
+        return self.get_events_page(civic_id, event_type, lab_source, limit=limit,
+                                    offset=offset, fields=fields)["events"]
+    
+    def get_events_page(self, civic_id: Optional[str] = None,
+                        event_type: Optional[str] = None,
+                        lab_source: Optional[str] = None,
+                        limit: int = 100,
+                        offset: int = 0,
+                        cursor: Optional[str] = None,
+                        fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a page of events, newest first, with an opaque next_cursor
         
-        query = "SELECT * FROM events WHERE 1=1"
-        params = []
+        Passing a cursor from a previous page switches to keyset pagination
+        (offset is ignored), which costs the same at any depth. fields limits
+        the returned columns; payload is only decoded when requested.
+        """
+        columns = list(fields) if fields else list(EVENT_FIELDS)
+        unknown = [column for column in columns if column not in EVENT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown event fields: {', '.join(unknown)}")
+        
+        query = f"SELECT rowid, {', '.join(columns)} FROM events WHERE 1=1"
+        params: List[Any] = []
         
         if civic_id:
             query += " AND civic_id = ?"
@@ -187,57 +310,49 @@ class LedgerCore:
             query += " AND lab_source = ?"
             params.append(lab_source)
         
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        if cursor:
+            query += " AND rowid < ?"
+            params.append(decode_cursor(cursor))
+            offset = 0
+        
+        query += " ORDER BY rowid DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
-            
-            events = []
-            for row in rows:
-                events.append({
-                    "event_id": row[0],
-                    "event_type": row[1],
-                    "civic_id": row[2],
-                    "lab_source": row[3],
-                    "payload": json.loads(row[4]),
-                    "timestamp": row[5],
-                    "previous_hash": row[6],
-                    "event_hash": row[7],
-                    "signature": row[8],
-                    "block_height": row[9]
-                })
+        rows = self.storage.connection().execute(query, params).fetchall()
+        
+        decode_payload = "payload" in columns
+        events = []
+        for row in rows:
+            event = dict(zip(columns, row[1:]))
+            if decode_payload:
+                event["payload"] = json.loads(event["payload"])
+            events.append(event)
         
-        return events
+        return {
+            "events": events,
+            "next_cursor": encode_cursor(rows[-1][0]) if rows and len(rows) == limit else None
+        }
     
     def get_identity(self, civic_id: str) -> Optional[Dict[str, Any]]:
         """Get identity information and stats"""
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT civic_id, lab_source, first_seen, last_seen, event_count, balance_gic
-                FROM identities WHERE civic_id = ?
-            """, (civic_id,))
-            
-            identity_row = cursor.fetchone()
-            if not identity_row:
-                return None
-            
-            # Get recent events
-            cursor = conn.execute("""
-                SELECT event_type, timestamp, event_hash
-                FROM events WHERE civic_id = ?
-                ORDER BY created_at DESC LIMIT 10
-            """, (civic_id,))
-            
-            recent_events = []
-            for row in cursor.fetchall():
-                recent_events.append({
-                    "event_type": row[0],
-                    "timestamp": row[1],
-                    "event_hash": row[2]
-                })
+        conn = self.storage.connection()
+        cursor = conn.execute(SELECT_IDENTITY_SQL, (civic_id,))
+        
+        identity_row = cursor.fetchone()
+        if not identity_row:
+            return None
+        
+        # Get recent events
+        cursor = conn.execute(SELECT_RECENT_IDENTITY_EVENTS_SQL, (civic_id,))
+        
+        recent_events = []
+        for row in cursor.fetchall():
+            recent_events.append({
+                "event_type": row[0],
+                "timestamp": row[1],
+                "event_hash": row[2]
+            })
         
         return {
             "civic_id": identity_row[0],
@@ -250,37 +365,13 @@ class LedgerCore:
         }
     
     def get_ledger_stats(self) -> Dict[str, Any]:
-        """Get ledger statistics"""
+        """Get ledger statistics from the materialized stats tables"""
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Total events
-            cursor = conn.execute("SELECT COUNT(*) FROM events")
-            total_events = cursor.fetchone()[0]
-            
-            # Total identities
-            cursor = conn.execute("SELECT COUNT(*) FROM identities")
-            total_identities = cursor.fetchone()[0]
-            
-            # Events by type
-            cursor = conn.execute("""
-                SELECT event_type, COUNT(*) FROM events 
-                GROUP BY event_type ORDER BY COUNT(*) DESC
-            """)
-            events_by_type = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Events by lab
-            cursor = conn.execute("""
-                SELECT lab_source, COUNT(*) FROM events 
-                GROUP BY lab_source ORDER BY COUNT(*) DESC
-            """)
-            events_by_lab = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Latest event
-            cursor = conn.execute("""
-                SELECT event_id, timestamp, event_type FROM events 
-                ORDER BY created_at DESC LIMIT 1
-            """)
-            latest_event = cursor.fetchone()
+        conn = self.storage.connection()
+        (total_events, total_identities, _, _,
+         latest_event_id, latest_timestamp, latest_event_type) = conn.execute(SELECT_STATS_SQL).fetchone()
+        events_by_type = dict(conn.execute(SELECT_STAT_COUNTS_SQL, ("event_type",)).fetchall())
+        events_by_lab = dict(conn.execute(SELECT_STAT_COUNTS_SQL, ("lab_source",)).fetchall())
         
         return {
             "total_events": total_events,
@@ -288,89 +379,209 @@ class LedgerCore:
             "events_by_type": events_by_type,
             "events_by_lab": events_by_lab,
             "latest_event": {
-                "event_id": latest_event[0],
-                "timestamp": latest_event[1],
-                "event_type": latest_event[2]
-            } if latest_event else None
+                "event_id": latest_event_id,
+                "timestamp": latest_timestamp,
+                "event_type": latest_event_type
+            } if latest_event_id else None
         }
     
     def get_chain_info(self) -> Dict[str, Any]:
-        """Get blockchain-like chain information"""
+        """Get blockchain-like chain information from the materialized stats"""
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Get chain length
-            cursor = conn.execute("SELECT COUNT(*) FROM events")
-            chain_length = cursor.fetchone()[0]
-            
-            # Get latest block hash
-            cursor = conn.execute("""
-                SELECT event_hash FROM events 
-                ORDER BY created_at DESC LIMIT 1
-            """)
-            latest_hash = cursor.fetchone()
-            latest_hash = latest_hash[0] if latest_hash else "0" * 64
-            
-            # Get genesis hash
-            cursor = conn.execute("""
-                SELECT event_hash FROM events 
-                ORDER BY created_at ASC LIMIT 1
-            """)
-            genesis_hash = cursor.fetchone()
-            genesis_hash = genesis_hash[0] if genesis_hash else "0" * 64
+        chain_length, _, genesis_hash, latest_hash, _, _, _ = \
+            self.storage.connection().execute(SELECT_STATS_SQL).fetchone()
         
         return {
             "chain_length": chain_length,
-            "latest_hash": latest_hash,
-            "genesis_hash": genesis_hash,
+            "latest_hash": latest_hash or GENESIS_HASH,
+            "genesis_hash": genesis_hash or GENESIS_HASH,
             "is_genesis": chain_length == 0
         }
     
     def _get_latest_event_hash(self) -> str:
         """Get the hash of the latest event in the chain"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT event_hash FROM events 
-                ORDER BY created_at DESC LIMIT 1
-            """)
+        if self._chain_tip is None:
+            cursor = self.storage.connection().execute(SELECT_LATEST_HASH_SQL)
             result = cursor.fetchone()
-            return result[0] if result else "0" * 64  # Genesis hash
+            self._chain_tip = result[0] if result else GENESIS_HASH
+        return self._chain_tip
     
     def _calculate_event_hash(self, event: LedgerEvent) -> str:
         """Calculate SHA-256 hash of the event"""
-        event_data = f"{event.event_id}{event.event_type}{event.civic_id}{event.lab_source}{json.dumps(event.payload, sort_keys=True)}{event.timestamp}{event.previous_hash}"
-        return hashlib.sha256(event_data.encode()).hexdigest()
+        return compute_event_hash(event.event_id, event.event_type, event.civic_id, event.lab_source,
+                                  event.payload, event.timestamp, event.previous_hash)
     
-    def verify_chain_integrity(self) -> bool:
-        """Verify the integrity of the event chain"""
-        events = self.get_events(limit=1000)  # Get all events
+    def verify_chain_integrity(self, full: bool = False, workers: int = 1) -> bool:
+        """Verify the integrity of the event chain
         
-        for i, event in enumerate(events):
-            # Check if this is the first event
-            if i == 0:
-                if event['previous_hash'] != "0" * 64:
-                    return False
-            else:
-                # Check if previous hash matches
-                if event['previous_hash'] != events[i-1]['event_hash']:
-                    return False
-            
-            # Verify event hash
-            expected_hash = self._calculate_event_hash(LedgerEvent(
-                event_id=event['event_id'],
-                event_type=event['event_type'],
-                civic_id=event['civic_id'],
-                lab_source=event['lab_source'],
-                payload=event['payload'],
-                timestamp=event['timestamp'],
-                previous_hash=event['previous_hash'],
-                event_hash="",
-                signature=event['signature']
+        Resumes from the latest signed checkpoint unless full is set; see
+        ChainVerifier for details.
+        """
+        return self.verifier.verify(full=full, workers=workers).ok
+
+class ChainVerifier:
+    """Streaming, resumable verifier for the event hash chain
+    
+    Events are walked in insertion (rowid) order through a single cursor, so
+    memory use does not grow with the chain. Every checkpoint_interval
+    events, and at the end of a clean run, an HMAC-signed checkpoint of
+    (height, rowid, hash) is stored; later runs re-check the checkpoint and
+    only verify the suffix after it. With workers > 1 hash recomputation is
+    fanned out over a process pool while linkage is checked in order here.
+    """
+    
+    def __init__(self, storage: LedgerStorage, checkpoint_key: Optional[bytes] = None,
+                 checkpoint_interval: int = 10000, chunk_size: int = 2000):
+        self.storage = storage
+        # Without a configured key, checkpoints are only trusted by this process
+        self.checkpoint_key = checkpoint_key or os.urandom(32)
+        self.checkpoint_interval = checkpoint_interval
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.progress: Dict[str, Any] = {"running": False, "last_result": None}
+    
+    def _sign(self, height: int, rowid: int, event_hash: str) -> str:
+        message = f"{height}:{rowid}:{event_hash}".encode()
+        return hmac.new(self.checkpoint_key, message, hashlib.sha256).hexdigest()
+    
+    def latest_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Return the latest checkpoint if its signature and anchor event still check out"""
+        conn = self.storage.connection()
+        row = conn.execute(SELECT_LATEST_CHECKPOINT_SQL).fetchone()
+        if not row:
+            return None
+        
+        height, rowid, event_hash, verified_at, signature = row
+        if not hmac.compare_digest(signature, self._sign(height, rowid, event_hash)):
+            return None
+        anchor = conn.execute(SELECT_EVENT_HASH_BY_ROWID_SQL, (rowid,)).fetchone()
+        if not anchor or anchor[0] != event_hash:
+            return None
+        
+        return {"height": height, "rowid": rowid, "event_hash": event_hash, "verified_at": verified_at}
+    
+    def _save_checkpoint(self, height: int, rowid: int, event_hash: str):
+        with self.storage.transaction() as conn:
+            conn.execute(INSERT_CHECKPOINT_SQL, (
+                height, rowid, event_hash, datetime.now(timezone.utc).isoformat(),
+                self._sign(height, rowid, event_hash)
             ))
-            
-            if event['event_hash'] != expected_hash:
-                return False
+    
+    def _iter_chunks(self, after_rowid: int):
+        cursor = self.storage.connection().execute(SELECT_CHAIN_ROWS_SQL, (after_rowid,))
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                return
+            yield rows
+    
+    def _iter_hashed_chunks(self, after_rowid: int, workers: int):
+        """Yield (rows, recomputed_hashes) in chain order"""
+        if workers <= 1:
+            for rows in self._iter_chunks(after_rowid):
+                yield rows, _hash_chain_rows(rows)
+            return
         
+        # Never fork more processes than there are CPUs to hash on
+        workers = min(workers, os.cpu_count() or 1)
+        # Keep a bounded window of chunks in flight to hold memory constant
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for rows in self._iter_chunks(after_rowid):
+                in_flight.append((rows, pool.submit(_hash_chain_rows, rows)))
+                if len(in_flight) >= workers * 2:
+                    rows, future = in_flight.popleft()
+                    yield rows, future.result()
+            while in_flight:
+                rows, future = in_flight.popleft()
+                yield rows, future.result()
+    
+    def verify(self, full: bool = False, workers: int = 1) -> VerificationResult:
+        """Verify the chain, resuming from the latest checkpoint unless full is set"""
+        with self._lock:
+            started = time.monotonic()
+            checkpoint = None if full else self.latest_checkpoint()
+            height = checkpoint["height"] if checkpoint else 0
+            last_rowid = checkpoint["rowid"] if checkpoint else 0
+            previous_hash = checkpoint["event_hash"] if checkpoint else GENESIS_HASH
+            resumed_from = height
+            verified = 0
+            failure = None
+            
+            self.progress.update({
+                "running": True,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "resumed_from": resumed_from,
+                "height": height,
+                "verified": 0,
+                "target_rowid": self.storage.connection().execute(SELECT_MAX_ROWID_SQL).fetchone()[0],
+                "rate": 0.0,
+            })
+            
+            try:
+                for rows, hashes in self._iter_hashed_chunks(last_rowid, workers):
+                    for row, expected_hash in zip(rows, hashes):
+                        rowid, event_id, previous, event_hash = row[0], row[1], row[7], row[8]
+                        if previous != previous_hash:
+                            failure = {"height": height + 1, "event_id": event_id,
+                                       "reason": "previous_hash does not match preceding event"}
+                        elif event_hash != expected_hash:
+                            failure = {"height": height + 1, "event_id": event_id,
+                                       "reason": "event_hash does not match event contents"}
+                        if failure:
+                            break
+                        
+                        height += 1
+                        verified += 1
+                        last_rowid = rowid
+                        previous_hash = event_hash
+                        if height % self.checkpoint_interval == 0:
+                            self._save_checkpoint(height, last_rowid, previous_hash)
+                    
+                    elapsed = time.monotonic() - started
+                    self.progress.update({
+                        "height": height,
+                        "verified": verified,
+                        "last_rowid": last_rowid,
+                        "rate": verified / elapsed if elapsed > 0 else 0.0,
+                    })
+                    if failure:
+                        break
+                
+                if failure:
+                    # Later checkpoints vouch for a prefix that no longer verifies
+                    with self.storage.transaction() as conn:
+                        conn.execute(DELETE_CHECKPOINTS_FROM_SQL, (failure["height"],))
+                elif verified:
+                    self._save_checkpoint(height, last_rowid, previous_hash)
+            finally:
+                self.progress["running"] = False
+            
+            result = VerificationResult(
+                ok=failure is None,
+                height=height,
+                tip_hash=previous_hash,
+                verified=verified,
+                resumed_from=resumed_from,
+                elapsed_seconds=time.monotonic() - started,
+                failure=failure,
+            )
+            self.progress["last_result"] = asdict(result)
+            return result
+    
+    def start(self, full: bool = False, workers: int = 1) -> bool:
+        """Run verify() on a background thread; returns False if one is already running"""
+        if self._thread and self._thread.is_alive():
+            return False
+        self._thread = threading.Thread(target=self.verify, kwargs={"full": full, "workers": workers},
+                                        name="ledger-verifier", daemon=True)
+        self._thread.start()
         return True
+    
+    def get_progress(self) -> Dict[str, Any]:
+        """Get progress and rate of the current or last verification run"""
+        return dict(self.progress)
 
 # Example usage
 if __name__ == "__main__":
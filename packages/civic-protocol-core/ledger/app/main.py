@@ -13,13 +13,16 @@ from fastapi import FastAPI, HTTPException, Depends, Header
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
-import sqlite3
-import hashlib
-import json
 import os
 import tempfile
 import httpx
-from dataclasses import dataclass, asdict
+
+try:
+    from .ledger import LedgerCore
+    from .writer import LedgerWriter
+except ImportError:  # executed as a script: python app/main.py
+    from ledger import LedgerCore
+    from writer import LedgerWriter
 
 app = FastAPI(
     title="Civic Ledger API",
@@ -65,18 +68,22 @@ LAB6_API_BASE = os.getenv("LAB6_API_BASE", "")
 print(f"Using data directory: {DATA_DIR}")
 print(f"Database path: {LEDGER_DB_PATH}")
 
-@dataclass
-class LedgerEvent:
-    """Immutable ledger event"""
-    event_id: str
-    event_type: str
-    civic_id: str
-    lab_source: str  # "lab4" or "lab6"
-    payload: Dict[str, Any]
-    timestamp: str
-    previous_hash: str
-    event_hash: str
-    signature: Optional[str] = None
+# Group commit tuning for /ledger/attest
+BATCH_MAX_EVENTS = int(os.getenv("LEDGER_BATCH_MAX_EVENTS", "256"))
+BATCH_MAX_DELAY_MS = float(os.getenv("LEDGER_BATCH_MAX_DELAY_MS", "5"))
+ATTEST_TIMEOUT_SECONDS = 30.0
+
+# Key for signing chain verification checkpoints. Without one, checkpoints
+# are only trusted for the lifetime of this process.
+CHECKPOINT_KEY = os.getenv("LEDGER_CHECKPOINT_KEY")
+if not CHECKPOINT_KEY:
+    print("LEDGER_CHECKPOINT_KEY not set - verification checkpoints will not survive restarts")
+
+# Ledger kernel and its pooled storage engine - schema is created once here,
+# not per request. All attestations go through the single group-commit writer.
+ledger = LedgerCore(LEDGER_DB_PATH, checkpoint_key=CHECKPOINT_KEY.encode() if CHECKPOINT_KEY else None)
+storage = ledger.storage
+writer = LedgerWriter(ledger, max_batch=BATCH_MAX_EVENTS, max_delay_ms=BATCH_MAX_DELAY_MS)
 
 class AttestationRequest(BaseModel):
     """Request to attest an event to the ledger"""
@@ -97,34 +104,9 @@ class EventResponse(BaseModel):
     confirmed: bool
 
 def get_db_connection():
-    """Get database connection"""
+    """Get the calling thread's pooled database connection"""
     try:
-        conn = sqlite3.connect(LEDGER_DB_PATH)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                event_id TEXT PRIMARY KEY,
-                event_type TEXT NOT NULL,
-                civic_id TEXT NOT NULL,
-                lab_source TEXT NOT NULL,
-                payload TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                previous_hash TEXT NOT NULL,
-                event_hash TEXT NOT NULL,
-                signature TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS identities (
-                civic_id TEXT PRIMARY KEY,
-                lab_source TEXT NOT NULL,
-                first_seen TEXT NOT NULL,
-                last_seen TEXT NOT NULL,
-                event_count INTEGER DEFAULT 0
-            )
-        """)
-        conn.commit()
-        return conn
+        return storage.connection()
     except Exception as e:
         print(f"Database connection error: {e}")
         raise HTTPException(500, f"Database connection failed: {str(e)}")
@@ -154,48 +136,33 @@ def verify_token(token: str, lab_source: str) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(500, f"Token verification error: {str(e)}")
 
-def get_latest_event_hash() -> str:
-    """Get the hash of the latest event in the chain"""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT event_hash FROM events 
-                ORDER BY created_at DESC LIMIT 1
-            """)
-            result = cursor.fetchone()
-            return result[0] if result else "0" * 64  # Genesis hash
-    except Exception as e:
-        print(f"Error getting latest hash: {e}")
-        return "0" * 64
-
-def calculate_event_hash(event: LedgerEvent) -> str:
-    """Calculate SHA-256 hash of the event"""
-    event_data = f"{event.event_id}{event.event_type}{event.civic_id}{event.lab_source}{json.dumps(event.payload, sort_keys=True)}{event.timestamp}{event.previous_hash}"
-    return hashlib.sha256(event_data.encode()).hexdigest()
-
-def create_ledger_event(event_type: str, civic_id: str, lab_source: str, 
-                       payload: Dict[str, Any], signature: Optional[str] = None) -> LedgerEvent:
-    """Create a new ledger event"""
-    event_id = f"evt_{int(datetime.now().timestamp() * 1000)}_{hashlib.sha256(f'{civic_id}{event_type}'.encode()).hexdigest()[:8]}"
-    timestamp = datetime.now(timezone.utc).isoformat()
-    previous_hash = get_latest_event_hash()
-    
-    event = LedgerEvent(
-        event_id=event_id,
-        event_type=event_type,
-        civic_id=civic_id,
-        lab_source=lab_source,
-        payload=payload,
-        timestamp=timestamp,
-        previous_hash=previous_hash,
-        event_hash="",  # Will be calculated
-        signature=signature
-    )
+def require_lab_token(lab_source: str, authorization: Optional[str]) -> Dict[str, Any]:
+    """Check the Bearer token in an Authorization header against a lab"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(401, "Missing or invalid authorization header")
     
-    # Calculate event hash
-    event.event_hash = calculate_event_hash(event)
+    token = authorization[7:]  # Remove "Bearer " prefix
     
-    return event
+    # Verify token with the appropriate lab
+    try:
+        return verify_token(token, lab_source)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(401, f"Token verification failed: {str(e)}")
+
+def lab_token(lab_source: str = "lab4", authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
+    """Dependency form of require_lab_token for endpoints without a request body"""
+    return require_lab_token(lab_source, authorization)
+
+@app.on_event("startup")
+def start_writer():
+    writer.start()
+
+@app.on_event("shutdown")
+def stop_writer():
+    writer.stop()
+    storage.close()
 
 @app.get("/") 
 def root(): 
@@ -211,9 +178,7 @@ def health():
     """Health check endpoint"""
     try:
         # Test database connection
-        with get_db_connection() as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM events")
-            event_count = cursor.fetchone()[0]
+        event_count = ledger.get_chain_info()["chain_length"]
         
         return {
             "ok": True, 
@@ -221,7 +186,8 @@ def health():
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "data_dir": DATA_DIR,
             "event_count": event_count,
-            "db_accessible": True
+            "db_accessible": True,
+            "writer": writer.get_stats()
         }
     except Exception as e:
         return {
@@ -238,52 +204,18 @@ def attest_event(request: AttestationRequest,
                 authorization: Optional[str] = Header(None)):
     """Attest an event to the immutable ledger"""
     
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(401, "Missing or invalid authorization header")
+    token_data = require_lab_token(request.lab_source, authorization)
     
-    token = authorization[7:]  # Remove "Bearer " prefix
-    
-    # Verify token with the appropriate lab
+    # Chain and commit through the group-commit writer
     try:
-        token_data = verify_token(token, request.lab_source)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(401, f"Token verification failed: {str(e)}")
-    
-    # Create ledger event
-    event = create_ledger_event(
-        event_type=request.event_type,
-        civic_id=request.civic_id,
-        lab_source=request.lab_source,
-        payload=request.payload,
-        signature=request.signature
-    )
-    
-    # Store in database
-    try:
-        with get_db_connection() as conn:
-            conn.execute("""
-                INSERT INTO events (event_id, event_type, civic_id, lab_source, 
-                                  payload, timestamp, previous_hash, event_hash, signature)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event.event_id, event.event_type, event.civic_id, event.lab_source,
-                json.dumps(event.payload), event.timestamp, event.previous_hash,
-                event.event_hash, event.signature
-            ))
-            
-            # Update identity stats
-            conn.execute("""
-                INSERT OR REPLACE INTO identities (civic_id, lab_source, first_seen, last_seen, event_count)
-                VALUES (?, ?, 
-                        COALESCE((SELECT first_seen FROM identities WHERE civic_id = ?), ?),
-                        ?, 
-                        COALESCE((SELECT event_count FROM identities WHERE civic_id = ?), 0) + 1)
-            """, (event.civic_id, event.lab_source, event.civic_id, event.timestamp,
-                  event.timestamp, event.civic_id))
-            
-            conn.commit()
+        event = writer.attest(
+            event_type=request.event_type,
+            civic_id=request.civic_id,
+            lab_source=request.lab_source,
+            payload=request.payload,
+            signature=request.signature,
+            timeout=ATTEST_TIMEOUT_SECONDS
+        )
     except Exception as e:
         raise HTTPException(500, f"Database error: {str(e)}")
     
@@ -302,49 +234,32 @@ def get_events(civic_id: Optional[str] = None,
                event_type: Optional[str] = None,
                lab_source: Optional[str] = None,
                limit: int = 100,
-               offset: int = 0):
-    """Get events from the ledger with optional filtering"""
-    
-    query = "SELECT * FROM events WHERE 1=1"
-    params = []
-    
-    if civic_id:
-        query += " AND civic_id = ?"
-        params.append(civic_id)
-    
-    if event_type:
-        query += " AND event_type = ?"
-        params.append(event_type)
-    
-    if lab_source:
-        query += " AND lab_source = ?"
-        params.append(lab_source)
+               offset: int = 0,
+               cursor: Optional[str] = None,
+               fields: Optional[str] = None):
+    """Get events from the ledger with optional filtering
     
-    query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+    Pass the returned next_cursor as cursor to fetch the following page
+    without OFFSET, and fields=event_id,event_type,... to skip columns
+    (payload is only decoded when requested).
+    """
     
     try:
-        with get_db_connection() as conn:
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
-            
-            events = []
-            for row in rows:
-                events.append({
-                    "event_id": row[0],
-                    "event_type": row[1],
-                    "civic_id": row[2],
-                    "lab_source": row[3],
-                    "payload": json.loads(row[4]),
-                    "timestamp": row[5],
-                    "previous_hash": row[6],
-                    "event_hash": row[7],
-                    "signature": row[8]
-                })
+        page = ledger.get_events_page(
+            civic_id=civic_id,
+            event_type=event_type,
+            lab_source=lab_source,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         raise HTTPException(500, f"Database error: {str(e)}")
     
-    return {"events": events, "count": len(events)}
+    return {"events": page["events"], "count": len(page["events"]), "next_cursor": page["next_cursor"]}
 
 @app.get("/ledger/identity/{civic_id}")
 def get_identity(civic_id: str):
@@ -366,7 +281,7 @@ def get_identity(civic_id: str):
             cursor = conn.execute("""
                 SELECT event_type, timestamp, event_hash
                 FROM events WHERE civic_id = ?
-                ORDER BY created_at DESC LIMIT 10
+                ORDER BY rowid DESC LIMIT 10
             """, (civic_id,))
             
             recent_events = []
@@ -393,83 +308,42 @@ def get_ledger_stats():
     """Get ledger statistics"""
     
     try:
-        with get_db_connection() as conn:
-            # Total events
-            cursor = conn.execute("SELECT COUNT(*) FROM events")
-            total_events = cursor.fetchone()[0]
-            
-            # Total identities
-            cursor = conn.execute("SELECT COUNT(*) FROM identities")
-            total_identities = cursor.fetchone()[0]
-            
-            # Events by type
-            cursor = conn.execute("""
-                SELECT event_type, COUNT(*) FROM events 
-                GROUP BY event_type ORDER BY COUNT(*) DESC
-            """)
-            events_by_type = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Events by lab
-            cursor = conn.execute("""
-                SELECT lab_source, COUNT(*) FROM events 
-                GROUP BY lab_source ORDER BY COUNT(*) DESC
-            """)
-            events_by_lab = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Latest event
-            cursor = conn.execute("""
-                SELECT event_id, timestamp, event_type FROM events 
-                ORDER BY created_at DESC LIMIT 1
-            """)
-            latest_event = cursor.fetchone()
+        return ledger.get_ledger_stats()
     except Exception as e:
         raise HTTPException(500, f"Database error: {str(e)}")
-    
-    return {
-        "total_events": total_events,
-        "total_identities": total_identities,
-        "events_by_type": events_by_type,
-        "events_by_lab": events_by_lab,
-        "latest_event": {
-            "event_id": latest_event[0],
-            "timestamp": latest_event[1],
-            "event_type": latest_event[2]
-        } if latest_event else None
-    }
 
 @app.get("/ledger/chain")
 def get_chain_info():
     """Get blockchain-like chain information"""
     
     try:
-        with get_db_connection() as conn:
-            # Get chain length
-            cursor = conn.execute("SELECT COUNT(*) FROM events")
-            chain_length = cursor.fetchone()[0]
-            
-            # Get latest block hash
-            cursor = conn.execute("""
-                SELECT event_hash FROM events 
-                ORDER BY created_at DESC LIMIT 1
-            """)
-            latest_hash = cursor.fetchone()
-            latest_hash = latest_hash[0] if latest_hash else "0" * 64
-            
-            # Get genesis hash
-            cursor = conn.execute("""
-                SELECT event_hash FROM events 
-                ORDER BY created_at ASC LIMIT 1
-            """)
-            genesis_hash = cursor.fetchone()
-            genesis_hash = genesis_hash[0] if genesis_hash else "0" * 64
+        return ledger.get_chain_info()
     except Exception as e:
         raise HTTPException(500, f"Database error: {str(e)}")
+
+@app.post("/ledger/verify")
+def start_verification(full: bool = False, workers: int = 1,
+                       token_data: Dict[str, Any] = Depends(lab_token)):
+    """Start a background chain verification run
     
+    Resumes from the latest signed checkpoint unless full=true. Use workers > 1
+    to spread hash recomputation across processes for cold full audits; it is
+    capped at the number of CPUs. Requires the same lab Bearer token as
+    /ledger/attest (lab_source query parameter, default lab4).
+    """
+    if workers < 1:
+        raise HTTPException(400, "workers must be at least 1")
+    workers = min(workers, os.cpu_count() or 1)
+    
+    started = ledger.verifier.start(full=full, workers=workers)
+    return {"started": started, "progress": ledger.verifier.get_progress()}
+
+@app.get("/ledger/verify")
+def get_verification_progress():
+    """Get progress, rate and outcome of chain verification"""
     return {
-        "chain_length": chain_length,
-        "latest_hash": latest_hash,
-        "genesis_hash": genesis_hash,
-        "is_genesis": chain_length == 0
+        "progress": ledger.verifier.get_progress(),
+        "checkpoint": ledger.verifier.latest_checkpoint()
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Ledger Storage - Pooled SQLite engine for the Civic Ledger
+
+This module owns every SQLite connection used by the ledger. Connections are
+opened once per thread, tuned for WAL journaling, and reused for the lifetime
+of the process so that hot paths never pay for connect() or schema DDL.
+Statements are kept as module-level SQL constants so that sqlite3's
+per-connection statement cache always hits.
+"""
+
+import sqlite3
+import threading
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+
+# Schema - executed exactly once per LedgerStorage instance
+SCHEMA: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        event_id TEXT PRIMARY KEY,
+        event_type TEXT NOT NULL,
+        civic_id TEXT NOT NULL,
+        lab_source TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        previous_hash TEXT NOT NULL,
+        event_hash TEXT NOT NULL,
+        signature TEXT,
+        block_height INTEGER,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS blocks (
+        block_id TEXT PRIMARY KEY,
+        block_height INTEGER UNIQUE NOT NULL,
+        previous_block_hash TEXT NOT NULL,
+        block_hash TEXT NOT NULL,
+        merkle_root TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        event_count INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS identities (
+        civic_id TEXT PRIMARY KEY,
+        lab_source TEXT NOT NULL,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL,
+        event_count INTEGER DEFAULT 0,
+        balance_gic INTEGER DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gic_transactions (
+        tx_id TEXT PRIMARY KEY,
+        from_civic_id TEXT,
+        to_civic_id TEXT,
+        amount INTEGER NOT NULL,
+        tx_type TEXT NOT NULL,
+        event_id TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        FOREIGN KEY (event_id) REFERENCES events (event_id)
+    )
+    """,
+    # Materialized statistics, maintained by LedgerCore in the append transaction
+    """
+    CREATE TABLE IF NOT EXISTS ledger_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total_events INTEGER NOT NULL DEFAULT 0,
+        total_identities INTEGER NOT NULL DEFAULT 0,
+        genesis_hash TEXT,
+        tip_hash TEXT,
+        latest_event_id TEXT,
+        latest_timestamp TEXT,
+        latest_event_type TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ledger_stat_counts (
+        dimension TEXT NOT NULL,
+        key TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, key)
+    )
+    """,
+    # Secondary indexes for the /ledger/events filter shapes. SQLite appends
+    # rowid to every index, so each one also serves ORDER BY rowid DESC and
+    # keyset (rowid < ?) pagination without a sort.
+    "CREATE INDEX IF NOT EXISTS idx_events_civic ON events (civic_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_civic_type ON events (civic_id, event_type)",
+    "CREATE INDEX IF NOT EXISTS idx_events_type ON events (event_type)",
+    "CREATE INDEX IF NOT EXISTS idx_events_type_lab ON events (event_type, lab_source)",
+    "CREATE INDEX IF NOT EXISTS idx_events_lab ON events (lab_source)",
+    """
+    CREATE TABLE IF NOT EXISTS verification_checkpoints (
+        height INTEGER PRIMARY KEY,
+        event_rowid INTEGER NOT NULL,
+        event_hash TEXT NOT NULL,
+        verified_at TEXT NOT NULL,
+        signature TEXT NOT NULL
+    )
+    """,
+]
+
+# Columns added after the first deployments; older databases are upgraded
+# in place on startup.
+COLUMN_MIGRATIONS: Dict[str, Dict[str, str]] = {
+    "events": {"block_height": "INTEGER"},
+    "identities": {"balance_gic": "INTEGER DEFAULT 0"},
+}
+
+# Connection tuning. WAL lets readers proceed while a writer commits, and
+# synchronous=NORMAL is durable across application crashes in WAL mode.
+DEFAULT_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # negative = KiB, i.e. 64 MiB per connection
+    "busy_timeout": 5000,
+}
+
+# Size of sqlite3's per-connection compiled statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Prepared statements
+INSERT_EVENT_SQL = """
+    INSERT INTO events (event_id, event_type, civic_id, lab_source,
+                        payload, timestamp, previous_hash, event_hash, signature, block_height)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_IDENTITY_SQL = """
+    INSERT OR REPLACE INTO identities (civic_id, lab_source, first_seen, last_seen, event_count)
+    VALUES (?, ?,
+            COALESCE((SELECT first_seen FROM identities WHERE civic_id = ?), ?),
+            ?,
+            COALESCE((SELECT event_count FROM identities WHERE civic_id = ?), 0) + 1)
+"""
+
+# rowid follows insertion order, unlike the second-resolution created_at
+SELECT_LATEST_HASH_SQL = """
+    SELECT event_hash FROM events
+    ORDER BY rowid DESC LIMIT 1
+"""
+
+# Full chain walk in insertion order, resumable from a rowid
+SELECT_CHAIN_ROWS_SQL = """
+    SELECT rowid, event_id, event_type, civic_id, lab_source, payload,
+           timestamp, previous_hash, event_hash
+    FROM events WHERE rowid > ?
+    ORDER BY rowid
+"""
+
+SELECT_EVENT_HASH_BY_ROWID_SQL = """
+    SELECT event_hash FROM events WHERE rowid = ?
+"""
+
+SELECT_MAX_ROWID_SQL = """
+    SELECT COALESCE(MAX(rowid), 0) FROM events
+"""
+
+INSERT_CHECKPOINT_SQL = """
+    INSERT OR REPLACE INTO verification_checkpoints (height, event_rowid, event_hash, verified_at, signature)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+DELETE_CHECKPOINTS_FROM_SQL = """
+    DELETE FROM verification_checkpoints WHERE height >= ?
+"""
+
+SELECT_LATEST_CHECKPOINT_SQL = """
+    SELECT height, event_rowid, event_hash, verified_at, signature
+    FROM verification_checkpoints
+    ORDER BY height DESC LIMIT 1
+"""
+
+SELECT_IDENTITY_EXISTS_SQL = """
+    SELECT 1 FROM identities WHERE civic_id = ?
+"""
+
+SELECT_STATS_SQL = """
+    SELECT total_events, total_identities, genesis_hash, tip_hash,
+           latest_event_id, latest_timestamp, latest_event_type
+    FROM ledger_stats WHERE id = 1
+"""
+
+SELECT_STAT_COUNTS_SQL = """
+    SELECT key, count FROM ledger_stat_counts
+    WHERE dimension = ?
+    ORDER BY count DESC
+"""
+
+UPDATE_STATS_SQL = """
+    UPDATE ledger_stats SET
+        total_events = total_events + ?,
+        total_identities = total_identities + ?,
+        genesis_hash = COALESCE(genesis_hash, ?),
+        tip_hash = ?,
+        latest_event_id = ?,
+        latest_timestamp = ?,
+        latest_event_type = ?
+    WHERE id = 1
+"""
+
+INCREMENT_STAT_COUNT_SQL = """
+    INSERT INTO ledger_stat_counts (dimension, key, count) VALUES (?, ?, ?)
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count
+"""
+
+SELECT_IDENTITY_SQL = """
+    SELECT civic_id, lab_source, first_seen, last_seen, event_count, balance_gic
+    FROM identities WHERE civic_id = ?
+"""
+
+SELECT_RECENT_IDENTITY_EVENTS_SQL = """
+    SELECT event_type, timestamp, event_hash
+    FROM events WHERE civic_id = ?
+    ORDER BY rowid DESC LIMIT 10
+"""
+
+class LedgerStorage:
+    """Per-thread pool of tuned SQLite connections for a single ledger database"""
+
+    def __init__(self, db_path: str,
+                 pragmas: Optional[Dict[str, Union[str, int]]] = None,
+                 cached_statements: int = STATEMENT_CACHE_SIZE):
+        self.db_path = db_path
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create the data directory and schema once at startup"""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self.connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            for table, columns in COLUMN_MIGRATIONS.items():
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for column, decl in columns.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a new connection"""
+        # check_same_thread is relaxed only so close() can run from any
+        # thread; each connection is otherwise used by its owning thread.
+        conn = sqlite3.connect(
+            self.db_path,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in a transaction that commits on success, rolls back on error"""
+        conn = self.connection()
+        with conn:
+            yield conn
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
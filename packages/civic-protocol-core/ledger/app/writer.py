@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Ledger Writer - Group-commit append pipeline for the Civic Ledger
+
+All attestations are funnelled through a single writer thread. The writer
+drains its queue into batches of up to ``max_batch`` events (or whatever
+arrived within ``max_delay_ms`` of the first one), chains them onto the
+in-memory tip and commits each batch in one transaction, so a burst of
+attests costs one fsync instead of one per event and can never fork the
+hash chain.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    from .ledger import LedgerCore, LedgerEvent
+except ImportError:  # executed as a script from ledger/app
+    from ledger import LedgerCore, LedgerEvent
+
+@dataclass
+class PendingEvent:
+    """An attestation waiting for its group commit"""
+    event_type: str
+    civic_id: str
+    lab_source: str
+    payload: Dict[str, Any]
+    signature: Optional[str] = None
+
+class LedgerWriter:
+    """Single-writer group-commit pipeline in front of LedgerCore.append_batch"""
+
+    def __init__(self, ledger: LedgerCore, max_batch: int = 256, max_delay_ms: float = 5.0):
+        self.ledger = ledger
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.batches_committed = 0
+        self.events_committed = 0
+
+    def start(self):
+        """Start the writer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flush queued attestations and stop the writer thread"""
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, event_type: str, civic_id: str, lab_source: str,
+               payload: Dict[str, Any], signature: Optional[str] = None) -> "Future[LedgerEvent]":
+        """Queue an attestation; the future resolves once its batch is committed"""
+        if not self._thread:
+            raise RuntimeError("LedgerWriter is not running")
+        future: "Future[LedgerEvent]" = Future()
+        self._queue.put((PendingEvent(event_type, civic_id, lab_source, payload, signature), future))
+        return future
+
+    def attest(self, event_type: str, civic_id: str, lab_source: str,
+               payload: Dict[str, Any], signature: Optional[str] = None,
+               timeout: Optional[float] = None) -> LedgerEvent:
+        """Queue an attestation and block until it is committed"""
+        return self.submit(event_type, civic_id, lab_source, payload, signature).result(timeout)
+
+    def _next_batch(self) -> Optional[List[tuple]]:
+        """Block for the first item, then gather more until the batch is full or the window closes"""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Commit what we have, then let the loop see the stop marker
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            pending = [item[0] for item in batch]
+            futures = [item[1] for item in batch]
+            try:
+                events = self.ledger.append_batch(pending)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            self.batches_committed += 1
+            self.events_committed += len(events)
+            for future, event in zip(futures, events):
+                future.set_result(event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer throughput counters"""
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "queued": self._queue.qsize(),
+            "batches_committed": self.batches_committed,
+            "events_committed": self.events_committed,
+            "max_batch": self.max_batch,
+            "max_delay_ms": self.max_delay * 1000.0,
+        }
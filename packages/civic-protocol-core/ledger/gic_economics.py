@@ -7,6 +7,8 @@ MIC issuance, staking, burning, and reward distribution mechanisms.
 """
 
 import hashlib
+import json
+import os
 import time
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -14,6 +16,20 @@ from datetime import datetime, timedelta
 from enum import Enum
 import math
 
+import numpy as np
+
+try:
+    from .gic_journal import GICJournal, JournalEntry
+except ImportError:  # executed as a script from ledger/
+    from gic_journal import GICJournal, JournalEntry
+
+# Journal record kinds
+JOURNAL_ACCOUNT = 0
+JOURNAL_TRANSACTION = 1
+JOURNAL_REWARD = 2
+JOURNAL_STAKING_REWARD = 3  # re-derived by JOURNAL_EPOCH on replay
+JOURNAL_EPOCH = 4
+
 class TransactionType(Enum):
     """Types of MIC transactions"""
     TRANSFER = "transfer"
@@ -24,19 +40,135 @@ class TransactionType(Enum):
     VEST = "vest"
     AIRDROP = "airdrop"
 
-@dataclass
+class _Column:
+    """Attribute backed by one column of an AccountStore"""
+    
+    def __init__(self, decode=None, encode=None):
+        self.decode = decode
+        self.encode = encode
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, account, owner=None):
+        if account is None:
+            return self
+        value = getattr(account._store, self.name)[account._slot]
+        return self.decode(value) if self.decode else value
+    
+    def __set__(self, account, value):
+        if self.encode:
+            value = self.encode(value)
+        getattr(account._store, self.name)[account._slot] = value
+
+class AccountStore:
+    """Columnar storage for the per-account fields touched every epoch
+    
+    Each account owns a slot; balance, staked and unstaking are object
+    columns holding exact Python ints (amounts in smallest units overflow
+    int64), while unstake_epoch, last_updated and activity_score are native
+    columns so epoch processing runs as whole-array operations.
+    """
+    
+    NO_EPOCH = -1
+    
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.capacity = 0
+        self.addresses: List[str] = []
+        self.slots: Dict[str, int] = {}
+        self.balance = np.zeros(0, dtype=object)
+        self.staked = np.zeros(0, dtype=object)
+        self.unstaking = np.zeros(0, dtype=object)
+        self.unstake_epoch = np.zeros(0, dtype=np.int64)
+        self.last_updated = np.zeros(0, dtype=np.int64)
+        self.activity_score = np.zeros(0, dtype=np.float64)
+        self._grow(capacity)
+    
+    def _grow(self, capacity: int):
+        """Resize every column to capacity slots"""
+        def resized(column, fill):
+            grown = np.full(capacity, fill, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            return grown
+        
+        self.balance = resized(self.balance, 0)
+        self.staked = resized(self.staked, 0)
+        self.unstaking = resized(self.unstaking, 0)
+        self.unstake_epoch = resized(self.unstake_epoch, self.NO_EPOCH)
+        self.last_updated = resized(self.last_updated, 0)
+        self.activity_score = resized(self.activity_score, 0.0)
+        self.capacity = capacity
+    
+    def allocate(self, address: str) -> int:
+        """Return the slot for address, allocating one if needed"""
+        slot = self.slots.get(address)
+        if slot is not None:
+            return slot
+        if self.size == self.capacity:
+            self._grow(max(1, self.capacity * 2))
+        slot = self.size
+        self.size += 1
+        self.addresses.append(address)
+        self.slots[address] = slot
+        return slot
+    
+    def view(self, name: str) -> np.ndarray:
+        """Live slice of a column covering the allocated slots"""
+        return getattr(self, name)[:self.size]
+
 class GICAccount:
-    """MIC account with balance and staking information"""
-    address: str
-    nonce: int
-    balance: int  # In smallest units (wei-like, 18 decimals)
-    vesting: int  # Vesting balance
-    staked: int  # Staked balance
-    unstaking: int  # Balance being unstaked
-    unstake_epoch: Optional[int]  # Epoch when unstaking completes
-    last_updated: int
-    activity_score: float  # For reward calculations
-    governance_power: float  # Voting power
+    """MIC account with balance and staking information
+    
+    Balances, staking and activity live in an AccountStore slot; accounts
+    created outside GICEconomics get a private single-slot store.
+    """
+    
+    balance = _Column(int)  # In smallest units (wei-like, 18 decimals)
+    staked = _Column(int)  # Staked balance
+    unstaking = _Column(int)  # Balance being unstaked
+    unstake_epoch = _Column(  # Epoch when unstaking completes
+        decode=lambda v: None if v == AccountStore.NO_EPOCH else int(v),
+        encode=lambda v: AccountStore.NO_EPOCH if v is None else v,
+    )
+    last_updated = _Column(int)
+    activity_score = _Column(float)  # For reward calculations
+    
+    def __init__(self, address: str, nonce: int, balance: int, vesting: int,
+                 staked: int, unstaking: int, unstake_epoch: Optional[int],
+                 last_updated: int, activity_score: float, governance_power: float,
+                 store: Optional[AccountStore] = None):
+        self._store = store if store is not None else AccountStore(capacity=1)
+        self._slot = self._store.allocate(address)
+        self.address = address
+        self.nonce = nonce
+        self.balance = balance
+        self.vesting = vesting  # Vesting balance
+        self.staked = staked
+        self.unstaking = unstaking
+        self.unstake_epoch = unstake_epoch
+        self.last_updated = last_updated
+        self.activity_score = activity_score
+        self.governance_power = governance_power  # Voting power
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-field snapshot of the account"""
+        return {
+            "address": self.address,
+            "nonce": self.nonce,
+            "balance": self.balance,
+            "vesting": self.vesting,
+            "staked": self.staked,
+            "unstaking": self.unstaking,
+            "unstake_epoch": self.unstake_epoch,
+            "last_updated": self.last_updated,
+            "activity_score": self.activity_score,
+            "governance_power": self.governance_power,
+        }
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"GICAccount({fields})"
 
 @dataclass
 class GICTransaction:
@@ -65,6 +197,44 @@ class RewardEvent:
     timestamp: int
     block_height: int
 
+@dataclass
+class RewardBatch:
+    """Rewards of one reason paid to many recipients at once
+    
+    Stored as parallel arrays instead of one RewardEvent per recipient;
+    events() materializes them on demand.
+    """
+    event_prefix: str
+    reason: str
+    cycle_id: str
+    timestamp: int
+    block_height: int
+    recipients: List[str]
+    amounts: np.ndarray  # object column of exact ints
+    
+    def __len__(self) -> int:
+        return len(self.recipients)
+    
+    @property
+    def total(self) -> int:
+        return int(self.amounts.sum()) if len(self.amounts) else 0
+    
+    def events(self) -> List[RewardEvent]:
+        """Expand into individual reward events"""
+        return [
+            RewardEvent(
+                event_id=f"{self.event_prefix}_{recipient}",
+                recipient=recipient,
+                amount=int(amount),
+                reason=self.reason,
+                cycle_id=self.cycle_id,
+                multiplier=1.0,
+                timestamp=self.timestamp,
+                block_height=self.block_height
+            )
+            for recipient, amount in zip(self.recipients, self.amounts)
+        ]
+
 @dataclass
 class StakingInfo:
     """Staking information for an account"""
@@ -89,19 +259,24 @@ class VestingSchedule:
 class GICEconomics:
     """MIC economic system implementation"""
     
-    def __init__(self, genesis_supply: int = 1000000 * 10**18):
+    def __init__(self, genesis_supply: int = 1000000 * 10**18,
+                 journal_dir: Optional[str] = None, journal_ring_size: int = 4096):
         """
         Initialize MIC economics
         
         Args:
             genesis_supply: Initial MIC supply in smallest units
+            journal_dir: Directory for the on-disk transaction journal; without
+                one only the most recent journal_ring_size entries are kept
+            journal_ring_size: Number of recent journal entries held in memory
         """
         self.genesis_supply = genesis_supply
         self.total_supply = genesis_supply
         self.circulating_supply = genesis_supply
+        self.account_store = AccountStore()
         self.accounts: Dict[str, GICAccount] = {}
-        self.transactions: List[GICTransaction] = []
-        self.reward_events: List[RewardEvent] = []
+        self.journal = GICJournal(journal_dir, ring_size=journal_ring_size)
+        self._replaying = False
         self.staking_info: Dict[str, StakingInfo] = {}
         self.vesting_schedules: Dict[str, VestingSchedule] = {}
         
@@ -141,7 +316,8 @@ class GICEconomics:
             unstake_epoch=None,
             last_updated=int(time.time()),
             activity_score=0.0,
-            governance_power=0.0
+            governance_power=0.0,
+            store=self.account_store
         )
         
         # Create community pool
@@ -155,7 +331,8 @@ class GICEconomics:
             unstake_epoch=None,
             last_updated=int(time.time()),
             activity_score=0.0,
-            governance_power=0.0
+            governance_power=0.0,
+            store=self.account_store
         )
         
         # Initialize reward pools
@@ -180,10 +357,14 @@ class GICEconomics:
             unstake_epoch=None,
             last_updated=int(time.time()),
             activity_score=0.0,
-            governance_power=0.0
+            governance_power=0.0,
+            store=self.account_store
         )
         
         self.accounts[address] = account
+        if not self._replaying:
+            self.journal.append(JOURNAL_ACCOUNT, to_addr=address, amount=initial_balance,
+                                timestamp=account.last_updated)
         return account
     
     def transfer(self, from_addr: str, to_addr: str, amount: int, 
@@ -394,46 +575,67 @@ class GICEconomics:
         account.governance_power = governance_power
         return governance_power
     
-    def distribute_staking_rewards(self, epoch: int) -> List[RewardEvent]:
-        """Distribute staking rewards for the epoch"""
+    def distribute_staking_rewards(self, epoch: int) -> RewardBatch:
+        """Distribute staking rewards for the epoch as one batch"""
+        store = self.account_store
+        batch = RewardBatch(
+            event_prefix=f"staking_reward_{epoch}",
+            reason="staking_reward",
+            cycle_id=f"epoch_{epoch}",
+            timestamp=int(time.time()),
+            block_height=0,
+            recipients=[],
+            amounts=np.zeros(0, dtype=object)
+        )
+        
         if self.staking_reward_pool <= 0:
-            return []
+            return batch
+        
+        # Stakers' staked balances, in the account store's slot order
+        staker_slots = np.fromiter(
+            (store.slots[address] for address in self.staking_info),
+            dtype=np.int64, count=len(self.staking_info)
+        )
+        staked = store.staked[staker_slots]
         
         # Calculate total staked amount
-        total_staked = sum(info.staked_amount for info in self.staking_info.values())
+        total_staked = int(staked.sum()) if len(staked) else 0
         
-        if total_staked == 0:
-            return []
+        if total_staked <= 0:
+            return batch
         
         # Calculate rewards per staked MIC
         rewards_per_gic = self.staking_reward_pool / total_staked
         
-        reward_events = []
-        
-        for address, staking in self.staking_info.items():
-            if staking.staked_amount > 0:
-                reward_amount = int(staking.staked_amount * rewards_per_gic)
-                
-                if reward_amount > 0:
-                    event = RewardEvent(
-                        event_id=f"staking_reward_{epoch}_{address}",
-                        recipient=address,
-                        amount=reward_amount,
-                        reason="staking_reward",
-                        cycle_id=f"epoch_{epoch}",
-                        multiplier=1.0,
-                        timestamp=int(time.time()),
-                        block_height=0
-                    )
-                    
-                    self._apply_reward(event)
-                    reward_events.append(event)
-        
-        return reward_events
+        # Same float arithmetic as int(staked * rate), truncated per staker
+        rewards = np.trunc(staked.astype(np.float64) * rewards_per_gic)
+        paid = rewards > 0
+        if not paid.any():
+            return batch
+        
+        slots = staker_slots[paid]
+        amounts = _to_exact_int(rewards[paid])
+        
+        store.balance[slots] += amounts
+        store.activity_score[slots] += 1.0
+        store.last_updated[slots] = batch.timestamp
+        
+        batch.recipients = [store.addresses[slot] for slot in slots]
+        batch.amounts = amounts
+        if not self._replaying:
+            self.journal.append_many(
+                JOURNAL_STAKING_REWARD, batch.recipients, amounts,
+                timestamp=batch.timestamp, block_height=batch.block_height,
+                extra={"event_prefix": batch.event_prefix, "reason": batch.reason,
+                       "cycle_id": batch.cycle_id}
+            )
+        return batch
     
     def process_epoch(self, epoch: int) -> Dict[str, Any]:
         """Process a new epoch (inflation, rewards, etc.)"""
         self.current_epoch = epoch
+        if not self._replaying:
+            self.journal.append(JOURNAL_EPOCH, amount=epoch, timestamp=int(time.time()))
         
         # Calculate inflation
         inflation_amount = int(self.circulating_supply * self.inflation_rate / (365 * 24 * 60 * 60 / self.epoch_duration))
@@ -456,6 +658,7 @@ class GICEconomics:
             "epoch": epoch,
             "inflation_amount": inflation_amount,
             "staking_rewards": len(staking_rewards),
+            "staking_rewards_total": staking_rewards.total,
             "total_supply": self.total_supply,
             "circulating_supply": self.circulating_supply
         }
@@ -479,7 +682,7 @@ class GICEconomics:
         from_account.last_updated = tx.timestamp
         to_account.last_updated = tx.timestamp
         
-        self.transactions.append(tx)
+        self._record_transaction(tx)
     
     def _apply_reward(self, event: RewardEvent):
         """Apply a reward event"""
@@ -488,7 +691,13 @@ class GICEconomics:
         account.activity_score += 1.0
         account.last_updated = event.timestamp
         
-        self.reward_events.append(event)
+        if not self._replaying:
+            self.journal.append(
+                JOURNAL_REWARD, to_addr=event.recipient, amount=event.amount,
+                timestamp=event.timestamp, block_height=event.block_height,
+                multiplier=event.multiplier,
+                extra={"event_id": event.event_id, "reason": event.reason, "cycle_id": event.cycle_id}
+            )
     
     def _apply_stake(self, tx: GICTransaction):
         """Apply a staking transaction"""
@@ -515,7 +724,7 @@ class GICEconomics:
                 last_claim_epoch=self.current_epoch
             )
         
-        self.transactions.append(tx)
+        self._record_transaction(tx)
     
     def _apply_unstake(self, tx: GICTransaction):
         """Apply an unstaking transaction"""
@@ -536,7 +745,7 @@ class GICEconomics:
         staking.unstaking_amount += tx.amount
         staking.unstake_epoch = unstake_epoch
         
-        self.transactions.append(tx)
+        self._record_transaction(tx)
     
     def _apply_burn(self, tx: GICTransaction):
         """Apply a burn transaction"""
@@ -551,28 +760,199 @@ class GICEconomics:
         self.total_supply -= tx.amount
         self.circulating_supply -= tx.amount
         
-        self.transactions.append(tx)
+        self._record_transaction(tx)
+    
+    def _record_transaction(self, tx: GICTransaction):
+        """Append an applied transaction to the journal"""
+        if self._replaying:
+            return
+        self.journal.append(
+            JOURNAL_TRANSACTION, code=TRANSACTION_TYPE_CODES[tx.tx_type],
+            from_addr=tx.from_addr, to_addr=tx.to_addr, amount=tx.amount,
+            gas_fee=tx.gas_fee, nonce=tx.nonce, timestamp=tx.timestamp,
+            block_height=tx.block_height,
+            extra={"tx_id": tx.tx_id, "memo": tx.memo, "signature": tx.signature}
+        )
+    
+    def _entry_to_record(self, entry: JournalEntry):
+        """Turn a journal entry back into a GICTransaction or RewardEvent"""
+        if entry.kind == JOURNAL_TRANSACTION:
+            return GICTransaction(
+                tx_id=entry.extra["tx_id"],
+                tx_type=TRANSACTION_TYPES[entry.code],
+                from_addr=entry.from_addr,
+                to_addr=entry.to_addr,
+                amount=entry.amount,
+                nonce=entry.nonce,
+                memo=entry.extra.get("memo"),
+                signature=entry.extra.get("signature", ""),
+                timestamp=entry.timestamp,
+                block_height=entry.block_height,
+                gas_fee=entry.gas_fee
+            )
+        if entry.kind in (JOURNAL_REWARD, JOURNAL_STAKING_REWARD):
+            return RewardEvent(
+                event_id=entry.extra.get("event_id") or f"{entry.extra['event_prefix']}_{entry.to_addr}",
+                recipient=entry.to_addr,
+                amount=entry.amount,
+                reason=entry.extra["reason"],
+                cycle_id=entry.extra["cycle_id"],
+                multiplier=entry.multiplier,
+                timestamp=entry.timestamp,
+                block_height=entry.block_height
+            )
+        return None
+    
+    def get_history(self, address: str, limit: int = 50,
+                    before_seq: Optional[int] = None) -> Dict[str, Any]:
+        """Page through the transactions and rewards touching an address
+        
+        Entries are newest first; pass next_before_seq back as before_seq
+        to fetch the following page.
+        """
+        entries = [
+            entry for entry in self.journal.history(address, limit, before_seq)
+            if entry.kind in (JOURNAL_TRANSACTION, JOURNAL_REWARD, JOURNAL_STAKING_REWARD)
+        ]
+        return {
+            "entries": [self._entry_to_record(entry) for entry in entries],
+            "next_before_seq": entries[-1].seq if len(entries) == limit else None
+        }
+    
+    def snapshot(self, path: str) -> int:
+        """Write the current state to path and return the journal position it covers"""
+        state = {
+            "journal_seq": self.journal.next_seq,
+            "genesis_supply": self.genesis_supply,
+            "total_supply": self.total_supply,
+            "circulating_supply": self.circulating_supply,
+            "current_epoch": self.current_epoch,
+            "parameters": {
+                "inflation_rate": self.inflation_rate,
+                "staking_reward_rate": self.staking_reward_rate,
+                "burn_rate": self.burn_rate,
+                "epoch_duration": self.epoch_duration,
+            },
+            "pools": {
+                "reflection_reward_pool": self.reflection_reward_pool,
+                "attestation_reward_pool": self.attestation_reward_pool,
+                "vote_reward_pool": self.vote_reward_pool,
+                "cycle_reward_pool": self.cycle_reward_pool,
+                "staking_reward_pool": self.staking_reward_pool,
+            },
+            "accounts": [account.to_dict() for account in self.accounts.values()],
+            "staking_info": [asdict(info) for info in self.staking_info.values()],
+            "vesting_schedules": [asdict(schedule) for schedule in self.vesting_schedules.values()],
+        }
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        return state["journal_seq"]
+    
+    @classmethod
+    def restore(cls, journal_dir: str, snapshot_path: Optional[str] = None,
+                genesis_supply: int = 1000000 * 10**18, journal_ring_size: int = 4096) -> "GICEconomics":
+        """Rebuild state from a snapshot plus the journal entries after it
+        
+        Without a snapshot the whole journal is replayed on top of genesis.
+        """
+        state = None
+        if snapshot_path:
+            with open(snapshot_path) as f:
+                state = json.load(f)
+        
+        economics = cls(
+            genesis_supply=state["genesis_supply"] if state else genesis_supply,
+            journal_dir=journal_dir,
+            journal_ring_size=journal_ring_size
+        )
+        if state:
+            economics._load_state(state)
+        economics.replay(state["journal_seq"] if state else 0)
+        return economics
+    
+    def _load_state(self, state: Dict[str, Any]):
+        """Replace in-memory state with a snapshot"""
+        self.genesis_supply = state["genesis_supply"]
+        self.total_supply = state["total_supply"]
+        self.circulating_supply = state["circulating_supply"]
+        self.current_epoch = state["current_epoch"]
+        for name, value in {**state["parameters"], **state["pools"]}.items():
+            setattr(self, name, value)
+        
+        self.account_store = AccountStore()
+        self.accounts = {
+            account["address"]: GICAccount(**account, store=self.account_store)
+            for account in state["accounts"]
+        }
+        self.staking_info = {info["address"]: StakingInfo(**info) for info in state["staking_info"]}
+        self.vesting_schedules = {
+            schedule["address"]: VestingSchedule(**schedule)
+            for schedule in state["vesting_schedules"]
+        }
+    
+    def replay(self, from_seq: int = 0):
+        """Re-apply journal entries from from_seq without journaling them again"""
+        self._replaying = True
+        try:
+            for entry in self.journal.replay(from_seq):
+                self._replay_entry(entry)
+        finally:
+            self._replaying = False
+    
+    def _replay_entry(self, entry: JournalEntry):
+        if entry.kind == JOURNAL_ACCOUNT:
+            self.create_account(entry.to_addr, entry.amount)
+        elif entry.kind == JOURNAL_EPOCH:
+            # Re-derives the epoch's staking rewards, so those entries are skipped
+            self.process_epoch(entry.amount)
+        elif entry.kind == JOURNAL_REWARD:
+            self._apply_reward(self._entry_to_record(entry))
+        elif entry.kind == JOURNAL_TRANSACTION:
+            tx = self._entry_to_record(entry)
+            apply = {
+                TransactionType.TRANSFER: self._apply_transfer,
+                TransactionType.AIRDROP: self._apply_transfer,
+                TransactionType.STAKE: self._apply_stake,
+                TransactionType.UNSTAKE: self._apply_unstake,
+                TransactionType.BURN: self._apply_burn,
+            }.get(tx.tx_type)
+            if apply:
+                apply(tx)
     
     def _process_unstaking(self, epoch: int):
         """Process completed unstaking"""
-        for address, account in self.accounts.items():
-            if account.unstake_epoch and epoch >= account.unstake_epoch:
-                # Complete unstaking
-                account.balance += account.unstaking
-                account.unstaking = 0
-                account.unstake_epoch = None
-                
-                # Update staking info
-                if address in self.staking_info:
-                    staking = self.staking_info[address]
-                    staking.unstaking_amount = 0
-                    staking.unstake_epoch = None
+        store = self.account_store
+        unstake_epoch = store.view("unstake_epoch")
+        matured = np.flatnonzero((unstake_epoch > 0) & (unstake_epoch <= epoch))
+        if len(matured) == 0:
+            return
+        
+        # Complete unstaking
+        store.balance[matured] += store.unstaking[matured]
+        store.unstaking[matured] = 0
+        store.unstake_epoch[matured] = AccountStore.NO_EPOCH
+        
+        # Update staking info
+        for slot in matured:
+            staking = self.staking_info.get(store.addresses[slot])
+            if staking:
+                staking.unstaking_amount = 0
+                staking.unstake_epoch = None
     
     def _decay_activity_scores(self):
         """Apply decay to activity scores"""
         decay_factor = 0.99  # 1% decay per epoch
-        for account in self.accounts.values():
-            account.activity_score *= decay_factor
+        self.account_store.view("activity_score")[:] *= decay_factor
+
+TRANSACTION_TYPES = list(TransactionType)
+TRANSACTION_TYPE_CODES = {tx_type: code for code, tx_type in enumerate(TRANSACTION_TYPES)}
+
+def _to_exact_int(values: np.ndarray) -> np.ndarray:
+    """Convert integral float64 values to an object column of Python ints"""
+    return np.frompyfunc(int, 1, 1)(values).astype(object)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+MIC Journal - Append-only, segmented history for the MIC economics
+
+Every state change in GICEconomics is appended here as a fixed-width record.
+Records live in on-disk segments that are memory-mapped for reads, variable
+fields (ids, memos, reasons) go to a per-segment heap, and addresses are
+interned into a shared table so each record refers to them by number. Each
+sealed segment also gets a sorted (address, seq) index file that is
+memory-mapped for history lookups. Only a ring of recent entries and the
+address index of the active segment are kept in memory, so memory no longer
+grows with the full history.
+
+Without a directory the journal keeps the ring only.
+"""
+
+import json
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# On-disk record layout (little endian, packed)
+RECORD_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("kind", "u1"),
+    ("code", "u1"),
+    ("from_id", "<u4"),
+    ("to_id", "<u4"),
+    ("amount_lo", "<u8"),  # amounts are split into two 64-bit limbs
+    ("amount_hi", "<u8"),
+    ("gas_fee", "<u8"),
+    ("nonce", "<u8"),
+    ("timestamp", "<i8"),
+    ("block_height", "<i8"),
+    ("multiplier", "<f8"),
+    ("heap_offset", "<u8"),
+    ("heap_length", "<u4"),
+])
+
+# Per-segment address index: (address id, seq) pairs sorted by id, then seq
+INDEX_DTYPE = np.dtype([("id", "<u4"), ("seq", "<u8")])
+
+NO_ADDRESS = 0xFFFFFFFF
+LIMB_MASK = (1 << 64) - 1
+MAX_AMOUNT = 1 << 128
+
+ADDRESS_FILE = "addresses.jsonl"
+
+@dataclass
+class JournalEntry:
+    """One decoded journal record"""
+    seq: int
+    kind: int
+    code: int = 0
+    from_addr: Optional[str] = None
+    to_addr: Optional[str] = None
+    amount: int = 0
+    gas_fee: int = 0
+    nonce: int = 0
+    timestamp: int = 0
+    block_height: int = 0
+    multiplier: float = 1.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+def _address_pairs(records: np.ndarray) -> np.ndarray:
+    """Sorted, de-duplicated (address id, seq) pairs of the records"""
+    pairs = []
+    for column in ("from_id", "to_id"):
+        present = records[column] != NO_ADDRESS
+        chunk = np.zeros(int(present.sum()), dtype=INDEX_DTYPE)
+        chunk["id"] = records[column][present]
+        chunk["seq"] = records["seq"][present]
+        pairs.append(chunk)
+    # A transfer to oneself indexes the same record twice
+    return np.unique(np.concatenate(pairs))
+
+class _Segment:
+    """A records file plus its heap and address index files, named by the seq of its first record"""
+
+    def __init__(self, directory: str, base_seq: int):
+        self.base_seq = base_seq
+        self.records_path = os.path.join(directory, f"segment-{base_seq:016d}.rec")
+        self.heap_path = os.path.join(directory, f"segment-{base_seq:016d}.heap")
+        self.index_path = os.path.join(directory, f"segment-{base_seq:016d}.idx")
+        self._records: Optional[np.ndarray] = None
+        self._heap: Optional[np.ndarray] = None
+        self._index: Optional[np.ndarray] = None
+
+    def count(self) -> int:
+        return os.path.getsize(self.records_path) // RECORD_DTYPE.itemsize
+
+    def records(self) -> np.ndarray:
+        """Memory-mapped records of a sealed segment"""
+        if self._records is None:
+            if self.count() == 0:
+                return np.zeros(0, dtype=RECORD_DTYPE)
+            self._records = np.memmap(self.records_path, dtype=RECORD_DTYPE, mode="r")
+        return self._records
+
+    def heap(self) -> np.ndarray:
+        """Memory-mapped heap of a sealed segment"""
+        if self._heap is None:
+            if os.path.getsize(self.heap_path) == 0:
+                return np.zeros(0, dtype=np.uint8)
+            self._heap = np.memmap(self.heap_path, dtype=np.uint8, mode="r")
+        return self._heap
+
+    def write_index(self):
+        """Write the address index of a sealed segment (atomically)"""
+        pairs = _address_pairs(self.records())
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pairs.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+        self.release()
+
+    def index(self) -> np.ndarray:
+        """Memory-mapped address index of a sealed segment"""
+        if self._index is None:
+            if os.path.getsize(self.index_path) == 0:
+                return np.zeros(0, dtype=INDEX_DTYPE)
+            self._index = np.memmap(self.index_path, dtype=INDEX_DTYPE, mode="r")
+        return self._index
+
+    def seqs_for(self, address_id: int) -> np.ndarray:
+        """Ascending seqs of the records touching address_id"""
+        index = self.index()
+        ids = index["id"]
+        lo = int(np.searchsorted(ids, address_id, side="left"))
+        hi = int(np.searchsorted(ids, address_id, side="right"))
+        return index["seq"][lo:hi]
+
+    def release(self):
+        self._records = None
+        self._heap = None
+        self._index = None
+
+class GICJournal:
+    """Segmented append-only journal with a recent-entry ring and per-segment address indexes"""
+
+    def __init__(self, directory: Optional[str] = None,
+                 records_per_segment: int = 1 << 16,
+                 ring_size: int = 4096):
+        self.directory = directory
+        self.records_per_segment = records_per_segment
+        self.ring: Deque[JournalEntry] = deque(maxlen=ring_size)
+        self.next_seq = 0
+
+        self._addresses: List[str] = []
+        self._address_ids: Dict[str, int] = {}
+        # address id -> seqs in the active segment; sealed segments use their .idx files
+        self._index: Dict[int, array] = {}
+        self._segments: List[_Segment] = []
+        self._records_file = None
+        self._heap_file = None
+        self._address_file = None
+        self._heap_size = 0
+        # Read handles on the active segment, reused by get()
+        self._records_fd: Optional[int] = None
+        self._heap_fd: Optional[int] = None
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._open()
+
+    # Opening and recovery
+
+    def _open(self):
+        """Load the address table and segments, dropping any torn tail, and rebuild the index"""
+        address_path = os.path.join(self.directory, ADDRESS_FILE)
+        if os.path.exists(address_path):
+            with open(address_path, "rb") as f:
+                data = f.read()
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                self._intern(json.loads(line), persist=False)
+            if len(complete) != len(data):
+                with open(address_path, "r+b") as f:
+                    f.truncate(len(complete))
+        self._address_file = open(address_path, "ab")
+
+        bases = sorted(
+            int(name[len("segment-"):-len(".rec")])
+            for name in os.listdir(self.directory)
+            if name.startswith("segment-") and name.endswith(".rec")
+        )
+        self._segments = [_Segment(self.directory, base) for base in bases]
+        if not self._segments:
+            self._segments.append(_Segment(self.directory, 0))
+            open(self._segments[0].records_path, "ab").close()
+            open(self._segments[0].heap_path, "ab").close()
+
+        active = self._segments[-1]
+        self._recover_tail(active)
+        self.next_seq = active.base_seq + active.count()
+        self._build_index()
+
+        self._open_active(active)
+        self._heap_size = os.path.getsize(active.heap_path)
+
+        # Warm the ring with the newest entries
+        start = max(0, self.next_seq - self.ring.maxlen) if self.ring.maxlen else self.next_seq
+        self.ring.extend(self.replay(start))
+
+    def _recover_tail(self, segment: _Segment):
+        """Truncate a partially written record and any heap bytes past the last record"""
+        size = os.path.getsize(segment.records_path)
+        whole = size - size % RECORD_DTYPE.itemsize
+        if whole != size:
+            with open(segment.records_path, "r+b") as f:
+                f.truncate(whole)
+
+        records = segment.records()
+        heap_end = 0
+        if len(records):
+            ends = records["heap_offset"].astype(np.int64) + records["heap_length"].astype(np.int64)
+            heap_end = int(ends.max())
+        if os.path.getsize(segment.heap_path) > heap_end:
+            segment.release()
+            with open(segment.heap_path, "r+b") as f:
+                f.truncate(heap_end)
+        segment.release()
+
+    def _build_index(self):
+        """Write missing index files of sealed segments and index the active one in memory"""
+        for segment in self._segments[:-1]:
+            if not os.path.exists(segment.index_path):
+                segment.write_index()
+
+        active = self._segments[-1]
+        pairs = _address_pairs(active.records())
+        active.release()
+        self._index = {}
+        if not len(pairs):
+            return
+        bounds = np.flatnonzero(np.diff(pairs["id"].astype(np.int64))) + 1
+        for chunk in np.split(pairs, bounds):
+            self._index[int(chunk["id"][0])] = array("Q", chunk["seq"].astype("<u8").tobytes())
+
+    def _open_active(self, segment: _Segment):
+        """Open the append and read handles of the active segment"""
+        self._records_file = open(segment.records_path, "ab")
+        self._heap_file = open(segment.heap_path, "ab")
+        self._records_fd = os.open(segment.records_path, os.O_RDONLY)
+        self._heap_fd = os.open(segment.heap_path, os.O_RDONLY)
+
+    def _close_active(self):
+        for f in (self._heap_file, self._records_file):
+            if f:
+                f.close()
+        for fd in (self._records_fd, self._heap_fd):
+            if fd is not None:
+                os.close(fd)
+        self._heap_file = self._records_file = None
+        self._records_fd = self._heap_fd = None
+
+    # Appending
+
+    def _intern(self, address: str, persist: bool = True) -> int:
+        """Return the id of address, adding it to the table if needed"""
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            address_id = len(self._addresses)
+            self._addresses.append(address)
+            self._address_ids[address] = address_id
+            if persist and self._address_file:
+                self._address_file.write(json.dumps(address).encode() + b"\n")
+                self._address_file.flush()
+        return address_id
+
+    def _address_id(self, address: Optional[str]) -> int:
+        return NO_ADDRESS if address is None else self._intern(address)
+
+    def _roll_segment(self):
+        """Seal the active segment, move its address index to disk and start the next one"""
+        self._close_active()
+        self._segments[-1].write_index()
+        self._index = {}
+        segment = _Segment(self.directory, self.next_seq)
+        self._segments.append(segment)
+        self._open_active(segment)
+        self._heap_size = 0
+
+    def _write_heap(self, extra: Optional[Dict[str, Any]]) -> tuple:
+        if not extra or not self._heap_file:
+            return 0, 0
+        blob = json.dumps(extra, separators=(",", ":")).encode()
+        offset = self._heap_size
+        self._heap_file.write(blob)
+        self._heap_size += len(blob)
+        return offset, len(blob)
+
+    def append(self, kind: int, code: int = 0, from_addr: Optional[str] = None,
+               to_addr: Optional[str] = None, amount: int = 0, gas_fee: int = 0,
+               nonce: int = 0, timestamp: int = 0, block_height: int = 0,
+               multiplier: float = 1.0, extra: Optional[Dict[str, Any]] = None) -> int:
+        """Append one entry and return its sequence number"""
+        entry = JournalEntry(self.next_seq, kind, code, from_addr, to_addr, amount,
+                             gas_fee, nonce, timestamp, block_height, multiplier, extra or {})
+        self._write([entry], [from_addr], [to_addr], extra)
+        return entry.seq
+
+    def append_many(self, kind: int, to_addrs: List[str], amounts: np.ndarray,
+                    code: int = 0, timestamp: int = 0, block_height: int = 0,
+                    extra: Optional[Dict[str, Any]] = None) -> int:
+        """Append one entry per recipient sharing a single heap blob; returns the first sequence number"""
+        first = self.next_seq
+        entries = [
+            JournalEntry(first + i, kind, code, None, address, int(amount),
+                         timestamp=timestamp, block_height=block_height, extra=extra or {})
+            for i, (address, amount) in enumerate(zip(to_addrs, amounts))
+        ]
+        self._write(entries, [None] * len(entries), to_addrs, extra)
+        return first
+
+    def _write(self, entries: List[JournalEntry], from_addrs: List[Optional[str]],
+               to_addrs: List[Optional[str]], extra: Optional[Dict[str, Any]]):
+        """Persist entries (split across segment boundaries) and update the ring and index"""
+        for entry in entries:
+            if not 0 <= entry.amount < MAX_AMOUNT:
+                raise ValueError(f"Journal amount out of range (0 <= amount < 2**128): {entry.amount}")
+        from_ids = [self._address_id(a) for a in from_addrs]
+        to_ids = [self._address_id(a) for a in to_addrs]
+
+        position = 0
+        while position < len(entries):
+            room = len(entries) - position
+            if self._records_file:
+                room = self._segments[-1].base_seq + self.records_per_segment - self.next_seq
+                if room <= 0:
+                    self._roll_segment()
+                    room = self.records_per_segment
+            chunk = entries[position:position + room]
+
+            if self._records_file:
+                heap_offset, heap_length = self._write_heap(extra)
+                records = np.zeros(len(chunk), dtype=RECORD_DTYPE)
+                amounts = [entry.amount for entry in chunk]
+                records["seq"] = [entry.seq for entry in chunk]
+                records["kind"] = chunk[0].kind
+                records["code"] = chunk[0].code
+                records["from_id"] = from_ids[position:position + len(chunk)]
+                records["to_id"] = to_ids[position:position + len(chunk)]
+                records["amount_lo"] = [amount & LIMB_MASK for amount in amounts]
+                records["amount_hi"] = [amount >> 64 for amount in amounts]
+                records["gas_fee"] = [entry.gas_fee for entry in chunk]
+                records["nonce"] = [entry.nonce for entry in chunk]
+                records["timestamp"] = [entry.timestamp for entry in chunk]
+                records["block_height"] = [entry.block_height for entry in chunk]
+                records["multiplier"] = [entry.multiplier for entry in chunk]
+                records["heap_offset"] = heap_offset
+                records["heap_length"] = heap_length
+                self._heap_file.flush()
+                self._records_file.write(records.tobytes())
+                self._records_file.flush()
+
+                for offset, entry in enumerate(chunk, start=position):
+                    for address_id in {from_ids[offset], to_ids[offset]} - {NO_ADDRESS}:
+                        self._index.setdefault(address_id, array("Q")).append(entry.seq)
+
+            self.next_seq += len(chunk)
+            self.ring.extend(chunk)
+            position += len(chunk)
+
+    def sync(self):
+        """Force appended entries to stable storage"""
+        for f in (self._address_file, self._heap_file, self._records_file):
+            if f:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def close(self):
+        """Close the active files and unmap sealed segments"""
+        if self._address_file:
+            self._address_file.close()
+        self._address_file = None
+        self._close_active()
+        for segment in self._segments:
+            segment.release()
+
+    # Reading
+
+    def _decode(self, record: np.void, blob: bytes) -> JournalEntry:
+        from_id, to_id = int(record["from_id"]), int(record["to_id"])
+        return JournalEntry(
+            seq=int(record["seq"]),
+            kind=int(record["kind"]),
+            code=int(record["code"]),
+            from_addr=None if from_id == NO_ADDRESS else self._addresses[from_id],
+            to_addr=None if to_id == NO_ADDRESS else self._addresses[to_id],
+            amount=int(record["amount_lo"]) | int(record["amount_hi"]) << 64,
+            gas_fee=int(record["gas_fee"]),
+            nonce=int(record["nonce"]),
+            timestamp=int(record["timestamp"]),
+            block_height=int(record["block_height"]),
+            multiplier=float(record["multiplier"]),
+            extra=json.loads(blob) if blob else {}
+        )
+
+    def _segment_index(self, seq: int) -> int:
+        """Index into self._segments of the segment holding seq"""
+        return bisect_right([segment.base_seq for segment in self._segments], seq) - 1
+
+    def get(self, seq: int) -> Optional[JournalEntry]:
+        """Fetch one entry by sequence number"""
+        if seq < 0 or seq >= self.next_seq:
+            return None
+        if self.ring and self.ring[0].seq <= seq:
+            return self.ring[seq - self.ring[0].seq]
+        if not self._records_file:
+            return None
+
+        segment = self._segments[self._segment_index(seq)]
+        position = seq - segment.base_seq
+        if segment is not self._segments[-1]:
+            record = segment.records()[position]
+            offset, length = int(record["heap_offset"]), int(record["heap_length"])
+            return self._decode(record, segment.heap()[offset:offset + length].tobytes())
+
+        # The active segment is still growing, so read it with pread
+        self._heap_file.flush()
+        self._records_file.flush()
+        size = RECORD_DTYPE.itemsize
+        record = np.frombuffer(os.pread(self._records_fd, size, position * size), dtype=RECORD_DTYPE)[0]
+        length = int(record["heap_length"])
+        blob = os.pread(self._heap_fd, length, int(record["heap_offset"])) if length else b""
+        return self._decode(record, blob)
+
+    def replay(self, from_seq: int = 0) -> Iterator[JournalEntry]:
+        """Yield every entry with seq >= from_seq in order"""
+        if not self._records_file:
+            for entry in list(self.ring):
+                if entry.seq >= from_seq:
+                    yield entry
+            return
+
+        end = self.next_seq
+        if from_seq >= end:
+            return
+        for segment in self._segments[max(0, self._segment_index(from_seq)):]:
+            if segment is self._segments[-1]:
+                self._heap_file.flush()
+                self._records_file.flush()
+                with open(segment.records_path, "rb") as f:
+                    records = np.frombuffer(f.read(), dtype=RECORD_DTYPE)
+                with open(segment.heap_path, "rb") as f:
+                    heap = np.frombuffer(f.read(), dtype=np.uint8)
+            else:
+                records, heap = segment.records(), segment.heap()
+
+            base = segment.base_seq
+            blobs: Dict[tuple, bytes] = {}
+            for i in range(max(0, from_seq - base), min(len(records), end - base)):
+                record = records[i]
+                key = (int(record["heap_offset"]), int(record["heap_length"]))
+                if key not in blobs:
+                    blobs = {key: heap[key[0]:key[0] + key[1]].tobytes()}
+                yield self._decode(record, blobs[key])
+
+    def history(self, address: str, limit: int = 50,
+                before_seq: Optional[int] = None) -> List[JournalEntry]:
+        """Entries touching address, newest first, strictly before before_seq"""
+        if limit <= 0:
+            return []
+        if not self._records_file:
+            # Memory-only journal: the ring is all there is
+            entries = [
+                entry for entry in reversed(self.ring)
+                if address in (entry.from_addr, entry.to_addr)
+                and (before_seq is None or entry.seq < before_seq)
+            ]
+            return entries[:limit]
+
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            return []
+        # Walk segments newest first until limit seqs are found
+        seqs: List[int] = []
+        for segment in reversed(self._segments):
+            if before_seq is not None and segment.base_seq >= before_seq:
+                continue
+            if segment is self._segments[-1]:
+                found = self._index.get(address_id, array("Q"))
+            else:
+                found = segment.seqs_for(address_id)
+            stop = len(found) if before_seq is None else bisect_left(found, before_seq)
+            seqs.extend(int(seq) for seq in reversed(found[max(0, stop - (limit - len(seqs))):stop]))
+            if len(seqs) >= limit:
+                break
+        entries = (self.get(seq) for seq in seqs)
+        return [entry for entry in entries if entry is not None]
@@ -2,23 +2,24 @@
 VIP Embedder Adapter - Validate, Embed, Attest
 """
 
+import asyncio
 import json
 import hashlib
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .validator import VIPValidator
 
 
 class VIPEmbedder:
     """
     Embeds content into vector stores with full integrity attestation
-    
+
     Flow:
     1. Validate (constitutional + GI)
     2. Embed + upsert to vector DB
     3. Attest to Kaizen Ledger
     """
-    
+
     def __init__(
         self,
         vecdb,
@@ -30,45 +31,29 @@ class VIPEmbedder:
         self.ledger = ledger
         self.validator = validator
         self.namespace = namespace
-    
+
     def _hash(self, s: str) -> str:
         """Generate SHA-256 hash"""
         return hashlib.sha256(s.encode()).hexdigest()
-    
-    async def embed(
+
+    def _rejected(self, verdict: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "accepted": False,
+            "verdict": verdict,
+            "reason": f"Failed VIP thresholds: {verdict.get('reason')}"
+        }
+
+    async def _store(
         self,
         text: str,
-        meta: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Embed content with integrity validation
-        
-        Args:
-            text: Content to embed
-            meta: Metadata {source, user, companion, ...}
-            
-        Returns:
-            {
-                "accepted": bool,
-                "doc_id": str,
-                "ledger_hash": Optional[str],
-                "verdict": Dict
-            }
-        """
-        # 1. Validate integrity
-        verdict = await self.validator.evaluate(text, meta.get("user", "unknown"))
-        
-        if not verdict["approved"]:
-            return {
-                "accepted": False,
-                "verdict": verdict,
-                "reason": f"Failed VIP thresholds: {verdict.get('reason')}"
-            }
-        
-        # 2. Generate document ID
+        meta: Dict[str, Any],
+        verdict: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Embed + upsert an approved document; returns its id and ledger attestation"""
+        # Generate document ID
         doc_id = self._hash(f"{text}:{meta.get('source', '')}")
-        
-        # 3. Embed content (mock - integrate with actual vector DB)
+
+        # Embed content (mock - integrate with actual vector DB)
         try:
             # vector = await self.vecdb.embed(text)
             # await self.vecdb.upsert(
@@ -88,8 +73,7 @@ class VIPEmbedder:
             pass
         except Exception as e:
             print(f"⚠️ Vector DB error (mock): {e}")
-        
-        # 4. Attest to ledger
+
         attestation = {
             "action": "vip.embed",
             "namespace": self.namespace,
@@ -103,19 +87,113 @@ class VIPEmbedder:
             },
             "timestamp": time.time()
         }
-        
-        try:
-            ledger_resp = await self.ledger.attest(attestation)
-            ledger_hash = ledger_resp.get("hash") if ledger_resp else None
-        except Exception as e:
-            print(f"⚠️ Ledger attestation failed: {e}")
-            ledger_hash = None
-        
+        return doc_id, attestation
+
+    def _accepted(
+        self,
+        doc_id: str,
+        ledger_resp: Optional[Dict[str, Any]],
+        verdict: Dict[str, Any]
+    ) -> Dict[str, Any]:
         return {
             "accepted": True,
             "doc_id": doc_id,
-            "ledger_hash": ledger_hash,
+            "ledger_hash": ledger_resp.get("hash") if ledger_resp else None,
             "verdict": verdict,
             "namespace": self.namespace
         }
 
+    async def embed(
+        self,
+        text: str,
+        meta: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Embed content with integrity validation
+
+        Args:
+            text: Content to embed
+            meta: Metadata {source, user, companion, ...}
+
+        Returns:
+            {
+                "accepted": bool,
+                "doc_id": str,
+                "ledger_hash": Optional[str],
+                "verdict": Dict
+            }
+        """
+        # 1. Validate integrity
+        verdict = await self.validator.evaluate(text, meta.get("user", "unknown"))
+
+        if not verdict["approved"]:
+            return self._rejected(verdict)
+
+        # 2. Embed content
+        doc_id, attestation = await self._store(text, meta, verdict)
+
+        # 3. Attest to ledger
+        try:
+            ledger_resp = await self.ledger.attest(attestation)
+        except Exception as e:
+            print(f"⚠️ Ledger attestation failed: {e}")
+            ledger_resp = None
+
+        return self._accepted(doc_id, ledger_resp, verdict)
+
+    async def _attest_batch(self, attestations: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Attest a batch through the ledger client's attest_many() when it has one"""
+        try:
+            if hasattr(self.ledger, "attest_many"):
+                return list(await self.ledger.attest_many(attestations))
+            return list(await asyncio.gather(*(self.ledger.attest(a) for a in attestations)))
+        except Exception as e:
+            print(f"⚠️ Ledger attestation failed: {e}")
+            return [None] * len(attestations)
+
+    async def embed_many(
+        self,
+        docs: List[Tuple[str, Dict[str, Any]]],
+        concurrency: int = 8,
+        batch_size: int = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Embed many documents with integrity validation
+
+        Documents are processed in batches of batch_size: up to concurrency
+        documents are validated and embedded at a time, then the accepted
+        documents in the batch are sealed together through the ledger's
+        attest_many() (concurrent single attestations unless the ledger is
+        configured with a batch_path).
+
+        Args:
+            docs: (text, meta) pairs, as for embed()
+            concurrency: Maximum documents in flight at once
+            batch_size: Documents per attest_many() call
+
+        Returns:
+            One embed() result per document, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def prepare(text: str, meta: Dict[str, Any]):
+            async with semaphore:
+                verdict = await self.validator.evaluate(text, meta.get("user", "unknown"))
+                if not verdict["approved"]:
+                    return verdict, None, None
+                doc_id, attestation = await self._store(text, meta, verdict)
+                return verdict, doc_id, attestation
+
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(docs), batch_size):
+            prepared = await asyncio.gather(
+                *(prepare(text, meta) for text, meta in docs[start:start + batch_size])
+            )
+            attestations = [a for _, _, a in prepared if a is not None]
+            receipts = iter(await self._attest_batch(attestations) if attestations else [])
+            for verdict, doc_id, attestation in prepared:
+                if attestation is None:
+                    results.append(self._rejected(verdict))
+                else:
+                    results.append(self._accepted(doc_id, next(receipts), verdict))
+        return results
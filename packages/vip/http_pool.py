@@ -0,0 +1,45 @@
+"""
+HTTP Pool - Shared pooled httpx client for VIP components
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+
+class PooledClient:
+    """One httpx.AsyncClient per event loop (connections cannot cross loops)"""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        """Client for the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            kwargs = {"timeout": self.timeout, "transport": self.transport}
+            if self.max_connections:
+                kwargs["limits"] = httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            self._client = httpx.AsyncClient(**kwargs)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self):
+        """Close the client if it belongs to the running event loop"""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
@@ -2,34 +2,50 @@
 Ledger Hooks - Attest VIP records to Kaizen Ledger
 """
 
+import asyncio
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from .http_pool import PooledClient
 
 
 class LedgerHooks:
-    """Minimal async client for Kaizen Ledger attestations"""
-    
-    def __init__(self, base_url: str):
+    """Minimal async client for Kaizen Ledger attestations
+
+    batch_path names a bulk attestation endpoint (e.g. "/api/attestations/batch")
+    for ledgers that provide one; none of the ledgers in this repository do,
+    so by default attest_many() sends concurrent single attestations.
+    """
+
+    def __init__(self, base_url: str, batch_path: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
-    
+        self.batch_path = batch_path
+        self._pool = PooledClient(timeout=10.0)
+
+    def _http(self) -> httpx.AsyncClient:
+        return self._pool.get()
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self._pool.aclose()
+
     async def attest(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Seal VIP record to Kaizen Ledger
-        
+
         Args:
             payload: VIP record with metadata and scores
-            
+
         Returns:
             {"hash": str, ...}
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/attestations",
-                    json=payload
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._http().post(
+                f"{self.base_url}/api/attestations",
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.RequestError as e:
             print(f"⚠️ Ledger connection failed: {e}")
             return {"hash": None, "error": str(e)}
@@ -37,3 +53,41 @@ class LedgerHooks:
             print(f"⚠️ Ledger returned error: {e}")
             return {"hash": None, "error": str(e.response.status_code)}
 
+    async def attest_many(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Seal several VIP records
+
+        Uses one request to batch_path when configured, otherwise concurrent
+        single attestations over the pooled client.
+
+        Args:
+            payloads: VIP records with metadata and scores
+
+        Returns:
+            One {"hash": str, ...} per payload, in order
+        """
+        if not payloads:
+            return []
+        if not self.batch_path or len(payloads) == 1:
+            return list(await asyncio.gather(*(self.attest(p) for p in payloads)))
+
+        try:
+            response = await self._http().post(
+                f"{self.base_url}{self.batch_path}",
+                json={"attestations": payloads}
+            )
+            response.raise_for_status()
+            data = response.json()
+        except httpx.RequestError as e:
+            print(f"⚠️ Ledger connection failed: {e}")
+            return [{"hash": None, "error": str(e)} for _ in payloads]
+        except httpx.HTTPStatusError as e:
+            print(f"⚠️ Ledger returned error: {e}")
+            return [{"hash": None, "error": str(e.response.status_code)} for _ in payloads]
+
+        results = data if isinstance(data, list) else data.get("results", [])
+        if len(results) != len(payloads):
+            print(f"⚠️ Ledger returned {len(results)} results for {len(payloads)} attestations")
+            results = list(results[:len(payloads)])
+            results += [{"hash": None, "error": "missing"} for _ in range(len(payloads) - len(results))]
+        return results
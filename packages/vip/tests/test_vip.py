@@ -0,0 +1,111 @@
+"""Tests for VIP validation, bulk embedding and ledger attestation."""
+import asyncio
+import hashlib
+import json
+
+import httpx
+import pytest
+from packages.vip import LedgerHooks, VIPEmbedder, VIPValidator
+from packages.vip.http_pool import PooledClient
+
+def _validator(handler):
+    validator = VIPValidator("http://charter", "http://gi")
+    validator._pool = PooledClient(transport=httpx.MockTransport(handler))
+    return validator
+
+def _ledger(handler, batch_path=None):
+    ledger = LedgerHooks("http://ledger", batch_path=batch_path)
+    ledger._pool = PooledClient(transport=httpx.MockTransport(handler))
+    return ledger
+
+def _scores(gi_calls, gi_delay=0.02):
+    """Charter rejects texts containing "bad"; GI answers slowly and counts calls."""
+    async def handler(request):
+        if request.url.path == "/api/charter/validate":
+            text = json.loads(request.content)["prompt"]
+            return httpx.Response(200, json={"integrity_score": 10 if "bad" in text else 90})
+        gi_calls.append(request.url.params["identityId"])
+        await asyncio.sleep(gi_delay)
+        return httpx.Response(200, json={"mii": 0.95})
+    return handler
+
+def test_gi_lookups_are_cached_and_shared():
+    gi_calls = []
+    validator = _validator(_scores(gi_calls))
+
+    async def run():
+        users = [f"u{i % 2}" for i in range(20)]
+        verdicts = await asyncio.gather(*(validator.evaluate("ok", u) for u in users))
+        await validator.evaluate("ok", "u0")
+        await validator.aclose()
+        return verdicts
+
+    verdicts = asyncio.run(run())
+    assert all(v["approved"] for v in verdicts)
+    assert sorted(gi_calls) == ["u0", "u1"]
+
+def test_cancelled_evaluation_does_not_fail_shared_gi_lookup():
+    gi_calls = []
+    validator = _validator(_scores(gi_calls, gi_delay=0.05))
+
+    async def run():
+        first = asyncio.create_task(validator.evaluate("ok", "u0"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(validator.evaluate("ok", "u0"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        verdict = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await validator.aclose()
+        return verdict
+
+    assert asyncio.run(run())["mii"] == 0.95
+    assert gi_calls == ["u0"]
+
+def test_embed_many_keeps_order_and_skips_rejected_documents():
+    attested = []
+
+    def ledger_handler(request):
+        doc_id = json.loads(request.content)["doc_id"]
+        attested.append(doc_id)
+        return httpx.Response(200, json={"hash": f"h-{doc_id}"})
+
+    validator = _validator(_scores([]))
+    ledger = _ledger(ledger_handler)
+    embedder = VIPEmbedder(vecdb=None, ledger=ledger, validator=validator)
+    texts = ["bad" if i % 3 == 0 else f"doc {i}" for i in range(10)]
+
+    async def run():
+        results = await embedder.embed_many([(t, {"source": "s", "user": "u"}) for t in texts],
+                                            concurrency=4, batch_size=4)
+        await validator.aclose()
+        await ledger.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert [r["accepted"] for r in results] == ["bad" not in t for t in texts]
+    for text, result in zip(texts, results):
+        if result["accepted"]:
+            doc_id = hashlib.sha256(f"{text}:s".encode()).hexdigest()
+            assert result["doc_id"] == doc_id
+            assert result["ledger_hash"] == f"h-{doc_id}"
+    assert sorted(attested) == sorted(r["doc_id"] for r in results if r["accepted"])
+
+@pytest.mark.parametrize("returned", [1, 5])
+def test_attest_many_pads_or_truncates_batch_results(returned):
+    def handler(request):
+        assert request.url.path == "/batch"
+        return httpx.Response(200, json={"results": [{"hash": f"h{i}"} for i in range(returned)]})
+
+    ledger = _ledger(handler, batch_path="/batch")
+
+    async def run():
+        results = await ledger.attest_many([{"n": i} for i in range(3)])
+        await ledger.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert len(results) == 3
+    assert [r["hash"] for r in results[:min(returned, 3)]] == [f"h{i}" for i in range(min(returned, 3))]
+    assert all(r == {"hash": None, "error": "missing"} for r in results[returned:])
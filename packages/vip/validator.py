@@ -2,10 +2,14 @@
 VIP Validator - Constitutional + GI Integrity Scoring
 """
 
+import asyncio
+import time
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import httpx
 
+from .http_pool import PooledClient
+
 
 @dataclass
 class VIPThresholds:
@@ -17,31 +21,107 @@ class VIPThresholds:
 class VIPValidator:
     """
     Validates content before embedding into vector stores
-    
+
     Combines:
     - Constitutional score (AI behavior compliance)
     - GI score (user integrity)
     → Integrity score (weighted composite)
+
+    The charter and GI checks run concurrently over one pooled HTTP client,
+    and GI scores are cached per user for gi_cache_ttl seconds (failed
+    lookups are not cached). Call aclose() when done with the validator.
     """
-    
+
     def __init__(
-        self, 
+        self,
         charter_client: str,
         gi_client: str,
-        thresholds: VIPThresholds = VIPThresholds()
+        thresholds: VIPThresholds = VIPThresholds(),
+        gi_cache_ttl: float = 60.0,
+        gi_cache_size: int = 10000,
+        max_connections: int = 20
     ):
         self.charter_url = charter_client
         self.gi_url = gi_client
         self.t = thresholds
-    
+        self.gi_cache_ttl = gi_cache_ttl
+        self.gi_cache_size = gi_cache_size
+        self.max_connections = max_connections
+        self._pool = PooledClient(timeout=10.0, max_connections=max_connections)
+        self._gi_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._gi_inflight: Dict[str, asyncio.Task] = {}
+
+    def _http(self) -> httpx.AsyncClient:
+        return self._pool.get()
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self._pool.aclose()
+
+    def clear_gi_cache(self):
+        self._gi_cache.clear()
+
+    async def _charter(self, text: str) -> Dict[str, Any]:
+        try:
+            # Get constitutional score
+            charter_resp = await self._http().post(
+                f"{self.charter_url}/api/charter/validate",
+                json={"prompt": text, "source": "vip"}
+            )
+            return charter_resp.json() if charter_resp.status_code == 200 else {}
+        except Exception as e:
+            print(f"⚠️ Constitutional validation failed: {e}")
+            return {"score": 100, "clause_violations": []}
+
+    async def _fetch_gi(self, user_id: str) -> Tuple[Dict[str, Any], bool]:
+        """GI response for user_id and whether it may be cached"""
+        try:
+            gi_resp = await self._http().get(
+                f"{self.gi_url}/api/integrity/calculate",
+                params={"identityId": user_id}
+            )
+            if gi_resp.status_code != 200:
+                return {}, False
+            return gi_resp.json(), True
+        except Exception as e:
+            print(f"⚠️ GI validation failed: {e}")
+            return {"mii": 1.0}, False
+
+    async def _load_gi(self, user_id: str) -> Dict[str, Any]:
+        gi_data, cacheable = await self._fetch_gi(user_id)
+        if cacheable:
+            self._gi_cache.pop(user_id, None)
+            if len(self._gi_cache) >= self.gi_cache_size:
+                # Entries are re-inserted on every fetch, so the first is the stalest
+                del self._gi_cache[next(iter(self._gi_cache))]
+            self._gi_cache[user_id] = (gi_data, time.monotonic())
+        return gi_data
+
+    async def _gi(self, user_id: str) -> Dict[str, Any]:
+        """GI response for user_id, cached; concurrent misses share one request
+
+        The shared request is a task of its own, so one document's evaluation
+        being cancelled does not cancel the lookup for other documents.
+        """
+        cached = self._gi_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[1] < self.gi_cache_ttl:
+            return cached[0]
+
+        task = self._gi_inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load_gi(user_id))
+            self._gi_inflight[user_id] = task
+            task.add_done_callback(lambda _: self._gi_inflight.pop(user_id, None))
+        return await asyncio.shield(task)
+
     async def evaluate(self, text: str, user_id: str) -> Dict[str, Any]:
         """
         Evaluate text for embedding eligibility
-        
+
         Args:
             text: Content to validate
             user_id: User ID for GI score lookup
-            
+
         Returns:
             {
                 "constitutional_score": float,
@@ -51,52 +131,32 @@ class VIPValidator:
                 "violations": List[str]
             }
         """
-        try:
-            # Get constitutional score
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                charter_resp = await client.post(
-                    f"{self.charter_url}/api/charter/validate",
-                    json={"prompt": text, "source": "vip"}
-                )
-                charter_data = charter_resp.json() if charter_resp.status_code == 200 else {}
-        except Exception as e:
-            print(f"⚠️ Constitutional validation failed: {e}")
-            charter_data = {"score": 100, "clause_violations": []}
-        
-        try:
-            # Get GI score
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                gi_resp = await client.get(
-                    f"{self.gi_url}/api/integrity/calculate",
-                    params={"identityId": user_id}
-                )
-                gi_data = gi_resp.json() if gi_resp.status_code == 200 else {}
-        except Exception as e:
-            print(f"⚠️ GI validation failed: {e}")
-            gi_data = {"mii": 1.0}
-        
+        charter_data, gi_data = await asyncio.gather(
+            self._charter(text),
+            self._gi(user_id)
+        )
+
         # Calculate scores
         constitutional_score = charter_data.get("integrity_score", 100)
         gi = gi_data.get("mii", 1.0)
-        
+
         # Weighted integrity score
         integrity_score = round(
             0.6 * constitutional_score + 0.4 * (gi * 100.0),
             2
         )
-        
+
         # Check thresholds
         approved = (
             constitutional_score >= self.t.min_constitutional and
             gi >= self.t.min_gi
         )
-        
+
         return {
             "constitutional_score": constitutional_score,
-            "mii": mii,
+            "mii": gi,
             "integrity_score": integrity_score,
             "approved": approved,
             "violations": charter_data.get("clause_violations", []),
             "reason": None if approved else "Below thresholds"
         }
-
@@ -0,0 +1,212 @@
+"""Near-duplicate clustering of raw items with MinHash and LSH banding."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import unicodedata
+from itertools import pairwise
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .models import RawItem
+
+STOPWORDS = {
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "is", "it",
+    "its", "of", "on", "or", "over", "says", "the", "to", "with",
+}
+
+# Only the lead of a summary is compared; the rest is mostly outlet boilerplate
+SUMMARY_TOKENS = 20
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+
+
+def _tokens(value: Optional[str]) -> List[str]:
+    normalized = unicodedata.normalize("NFKD", value or "").lower()
+    words = "".join(ch if ch.isalnum() else " " for ch in normalized).split()
+    return [word for word in words if word not in STOPWORDS]
+
+
+def shingles(item: RawItem) -> Set[str]:
+    """Title unigrams and bigrams plus the leading summary words."""
+    title = _tokens(item.title)
+    result = set(title)
+    result.update(f"{first} {second}" for first, second in pairwise(title))
+    result.update(f"~{word}" for word in _tokens(item.summary)[:SUMMARY_TOKENS])
+    return result
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) for recall: the widest band whose S-curve midpoint is <= threshold.
+
+    Candidates are confirmed on estimated similarity afterwards, so extra
+    candidates only cost a comparison while missed ones lose a cluster.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1.0 / bands) ** (1.0 / rows) > threshold:
+            break
+        best = (bands, rows)
+    return best
+
+
+class NearDuplicateClusterer:
+    """Groups items whose title+summary shingles have Jaccard similarity >= threshold.
+
+    Each item gets a MinHash signature; signatures are split into LSH bands
+    so only items sharing a band bucket are compared, which keeps clustering
+    roughly linear in the number of items. Candidate pairs are confirmed on
+    the estimated similarity and merged with union-find.
+
+    The clusterer is incremental: calling ``add`` again assigns new items to
+    the clusters built so far. Items older than ``retention`` seconds are
+    dropped, so a long-lived instance can carry clusters across scans.
+    ``add`` holds an internal lock, so one instance can be shared by
+    concurrent scans.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.3,
+        num_perm: int = 128,
+        retention: Optional[float] = None,
+        seed: int = 1,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.retention = retention
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: odd 64-bit multipliers, wrapping arithmetic
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64, endpoint=True)
+
+        self._items: Dict[int, RawItem] = {}
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._added_at: Dict[int, float] = {}
+        self._parent: Dict[int, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._urls: Dict[str, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def signature(self, item: RawItem) -> np.ndarray:
+        values = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+            for shingle in shingles(item)
+        ]
+        if not values:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        x = np.asarray(values, dtype=np.uint64)
+        return ((np.outer(x, self._a) + self._b) >> _SHIFT).min(axis=0)
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(first == second)) / self.num_perm
+
+    def _bucket_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _find(self, node: int) -> int:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, first: int, second: int) -> None:
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            # Keep the oldest item as the root so it stays the cluster headline
+            self._parent[max(first, second)] = min(first, second)
+
+    def _expire(self, now: float) -> None:
+        """Drop items past retention and rebuild the index from the survivors."""
+        if self.retention is None or not self._added_at:
+            return
+        cutoff = now - self.retention
+        if min(self._added_at.values()) >= cutoff:
+            return
+
+        survivors = [node for node, added in self._added_at.items() if added >= cutoff]
+        clusters = {node: self._find(node) for node in survivors}
+        items, signatures, added_at = self._items, self._signatures, self._added_at
+        self._items, self._signatures, self._added_at = {}, {}, {}
+        self._parent, self._buckets, self._urls = {}, {}, {}
+        for node in survivors:
+            self._insert(node, items[node], signatures[node], added_at[node])
+        # Survivors keep their clusters even if the item that linked them expired
+        roots: Dict[int, int] = {}
+        for node in survivors:
+            root = roots.setdefault(clusters[node], node)
+            self._union(root, node)
+
+    def _insert(self, node: int, item: RawItem, signature: np.ndarray, added_at: float) -> List[int]:
+        """Index one item and return the ids of bucket neighbours."""
+        self._items[node] = item
+        self._signatures[node] = signature
+        self._added_at[node] = added_at
+        self._parent[node] = node
+        self._urls[str(item.url)] = node
+        candidates: List[int] = []
+        for key in self._bucket_keys(signature):
+            bucket = self._buckets.setdefault(key, [])
+            candidates.extend(bucket)
+            bucket.append(node)
+        return candidates
+
+    def add(self, items: List[RawItem], now: Optional[float] = None) -> List[List[RawItem]]:
+        """Cluster items into the existing state and return every cluster they touched.
+
+        Clusters are listed in order of their oldest item and hold items in
+        insertion order. An item whose URL is already tracked is not added
+        twice but still marks its cluster as touched.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._add(items, now)
+
+    def _add(self, items: List[RawItem], now: float) -> List[List[RawItem]]:
+        self._expire(now)
+
+        touched: List[int] = []
+        for item in items:
+            existing = self._urls.get(str(item.url))
+            if existing is not None:
+                touched.append(existing)
+                continue
+
+            node = self._next_id
+            self._next_id += 1
+            signature = self.signature(item)
+            for candidate in set(self._insert(node, item, signature, now)):
+                if self.similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    self._union(node, candidate)
+            touched.append(node)
+
+        roots = sorted({self._find(node) for node in touched})
+        members: Dict[int, List[int]] = {root: [] for root in roots}
+        for node in self._items:
+            root = self._find(node)
+            if root in members:
+                members[root].append(node)
+        return [[self._items[node] for node in sorted(members[root])] for root in roots]
+
+
+def cluster_items(items: List[RawItem], threshold: float = 0.3) -> List[List[RawItem]]:
+    """One-shot clustering of a batch of items."""
+    return NearDuplicateClusterer(threshold=threshold).add(items)
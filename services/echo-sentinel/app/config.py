@@ -28,13 +28,48 @@ class Settings(BaseSettings):
         description="Base URL for the Civic Ledger API.",
     )
     LEDGER_API_TOKEN: str = Field(default="changeme", description="Bearer token for Civic Ledger API.")
+    LEDGER_OUTBOX_PATH: str = Field(
+        default=".cache/ledger-outbox.jsonl", description="File queueing ledger anchors that failed after retries."
+    )
+    LEDGER_OUTBOX_MAX_ATTEMPTS: int = Field(
+        default=10, ge=1, description="Delivery attempts before a queued anchor is dead-lettered."
+    )
+    LEDGER_OUTBOX_MAX_AGE_SECS: float = Field(
+        default=7 * 24 * 60 * 60, gt=0, description="Age (seconds) after which a queued anchor is dead-lettered."
+    )
+    LEDGER_OUTBOX_FLUSH_LIMIT: int = Field(
+        default=50, ge=1, description="Most queued anchors resent per scan."
+    )
+    LEDGER_MAX_RETRIES: int = Field(default=3, ge=0, description="Retries for a transient ledger failure.")
+    LEDGER_BACKOFF_SECS: float = Field(
+        default=0.5, ge=0, description="Initial ledger retry delay (seconds); doubles on each retry."
+    )
 
     # Operational knobs
     MIN_IMPACT_FOR_ALERT: Literal["low", "medium", "high"] = Field(
         default="medium", description="Minimum impact level required before returning an alert."
     )
     REQUIRED_SOURCES: int = Field(default=2, ge=1, description="Minimum distinct sources per verified event.")
+    CLUSTER_SIMILARITY: float = Field(
+        default=0.3, gt=0, le=1, description="Jaccard similarity at which items count as the same story."
+    )
+    CLUSTER_RETENTION_SECS: int = Field(
+        default=6 * 60 * 60, ge=0, description="How long items stay clusterable across scans (0 = per scan only)."
+    )
     TIMEOUT_SECS: int = Field(default=12, ge=1, description="HTTP timeout (seconds) for source fetch adapters.")
+    SCAN_BUDGET_SECS: float = Field(
+        default=15.0, gt=0, description="Overall deadline (seconds) for fetching all sources in one scan."
+    )
+    GATE_CONCURRENCY: int = Field(default=8, ge=1, description="Concurrent OAA Integrity Gate calls per scan.")
+    ANCHOR_CONCURRENCY: int = Field(
+        default=8, ge=1, description="Concurrent ledger anchor calls when the ledger has no batch endpoint."
+    )
+    FEED_CACHE_PATH: str = Field(
+        default=".cache/feeds.json", description="File persisting the feed cache across restarts; empty disables it."
+    )
+    FEED_CACHE_TTL_SECS: int = Field(
+        default=86400, ge=60, description="Seconds a feed or parsed entry stays cached after it was last seen."
+    )
 
 
 settings = Settings()
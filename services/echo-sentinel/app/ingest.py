@@ -2,46 +2,68 @@
 
 from __future__ import annotations
 
-import unicodedata
-from typing import Dict, List
+from typing import List, Optional, Tuple
 
+from .clustering import NearDuplicateClusterer
 from .models import RawItem, VerifiedEvent
 from .scoring import score_impact
 from .sources import ap, bis, bloomberg, ecb, eu_cp, fema, nasa, reuters, who
-from .sources.typing import FetchResult
+from .sources.feeds import FeedFetcher, SourceStatus, fetcher
 
 ADAPTERS = [reuters, ap, bloomberg, who, nasa, ecb, bis, fema, eu_cp]
 
 
-def collect(topic: str, timeout: int) -> List[RawItem]:
+def collect(topic: str, timeout: int, budget: Optional[float] = None) -> List[RawItem]:
     """Collect RawItem entries from all configured adapters."""
+    items, _ = collect_with_status(topic, timeout, budget)
+    return items
+
+
+def collect_with_status(
+    topic: str,
+    timeout: int,
+    budget: Optional[float] = None,
+    feed_fetcher: Optional[FeedFetcher] = None,
+    adapters: Optional[List] = None,
+) -> Tuple[List[RawItem], SourceStatus]:
+    """Fetch all adapters concurrently and report each source's outcome.
+
+    Every adapter has ``timeout`` seconds and the scan as a whole ``budget``
+    seconds (defaults to ``timeout``); late sources are dropped so the scan
+    returns partial results instead of waiting on them.
+    """
+    results, status = (feed_fetcher or fetcher).gather(
+        adapters if adapters is not None else ADAPTERS,
+        topic,
+        timeout,
+        budget if budget is not None else timeout,
+    )
     items: List[RawItem] = []
-    for adapter in ADAPTERS:
+    for result in results:
         try:
-            results: List[FetchResult] = adapter.fetch(topic, timeout)
+            items.append(RawItem(**result.model_dump()))
         except Exception:
             continue
-        for result in results:
-            try:
-                items.append(RawItem(**result.model_dump()))
-            except Exception:
-                continue
-    return items
-
+    return items, status
 
-def _title_key(value: str) -> str:
-    normalized = unicodedata.normalize("NFKD", value).lower()
-    return "".join(ch for ch in normalized if ch.isalnum())[:120]
 
+def cross_verify(
+    items: List[RawItem],
+    min_sources: int,
+    clusterer: Optional[NearDuplicateClusterer] = None,
+    similarity: float = 0.3,
+) -> List[VerifiedEvent]:
+    """Group near-duplicate RawItems and enforce source diversity.
 
-def cross_verify(items: List[RawItem], min_sources: int) -> List[VerifiedEvent]:
-    """Group RawItems by approximate headline similarity and enforce source diversity."""
-    buckets: Dict[str, List[RawItem]] = {}
-    for item in items:
-        buckets.setdefault(_title_key(item.title), []).append(item)
+    Pass a long-lived ``clusterer`` to match items against clusters from
+    earlier scans; otherwise items are clustered on their own at the given
+    ``similarity`` threshold.
+    """
+    if clusterer is None:
+        clusterer = NearDuplicateClusterer(threshold=similarity)
 
     verified: List[VerifiedEvent] = []
-    for group in buckets.values():
+    for group in clusterer.add(items):
         sources = {g.source for g in group}
         if len(sources) < min_sources:
             continue
@@ -55,4 +77,3 @@ def cross_verify(items: List[RawItem], min_sources: int) -> List[VerifiedEvent]:
             )
         )
     return verified
-
@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import List, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import settings
 from .models import Attestation, VerifiedEvent
 
+# Pooled session so a scan's gate calls reuse connections
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=settings.GATE_CONCURRENCY))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=settings.GATE_CONCURRENCY))
+
 
 def gate(event: VerifiedEvent) -> float:
     """Submit event to OAA Integrity Gate and return GI score."""
@@ -19,7 +27,7 @@ def gate(event: VerifiedEvent) -> float:
         timestamp=datetime.now(timezone.utc),
     ).model_dump(mode="json")
 
-    response = requests.post(
+    response = _session.post(
         str(settings.OAA_INTEGRITY_API),
         headers={
             "Authorization": f"Bearer {settings.OAA_API_KEY}",
@@ -32,3 +40,17 @@ def gate(event: VerifiedEvent) -> float:
     data = response.json()
     return float(data.get("gi", 0.0))
 
+
+def _gate_or_none(event: VerifiedEvent) -> Optional[float]:
+    try:
+        return gate(event)
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def gate_many(events: Sequence[VerifiedEvent]) -> List[Optional[float]]:
+    """Gate events concurrently; returns a GI score per event, ``None`` where the gate failed."""
+    if not events:
+        return []
+    with ThreadPoolExecutor(max_workers=min(settings.GATE_CONCURRENCY, len(events))) as pool:
+        return list(pool.map(_gate_or_none, events))
@@ -3,32 +3,139 @@
 from __future__ import annotations
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import settings
 from .models import VerifiedEvent
+from .outbox import Outbox
 
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
 
-def write_event(event: VerifiedEvent, gi: float) -> dict:
-    """Anchor attested event into Civic Ledger and return receipt."""
-    payload = {
+# Pooled session shared by every anchor request
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=settings.ANCHOR_CONCURRENCY))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=settings.ANCHOR_CONCURRENCY))
+
+outbox = Outbox(
+    settings.LEDGER_OUTBOX_PATH,
+    max_attempts=settings.LEDGER_OUTBOX_MAX_ATTEMPTS,
+    max_age=settings.LEDGER_OUTBOX_MAX_AGE_SECS,
+)
+
+# None until the ledger has told us whether it accepts batches
+_batch_supported: Optional[bool] = None
+
+
+def _payload(event: VerifiedEvent, gi: float) -> dict:
+    return {
         "type": "echo.alert",
         "gi": gi,
         "topic": event.topic,
         "headline": event.headline,
-        "citations": [item.url for item in event.items],
+        "citations": [str(item.url) for item in event.items],
         "impact": event.impact,
     }
-    response = requests.post(
-        f"{settings.LEDGER_API_BASE.rstrip('/')}/ledger/attest",
+
+
+def _post(path: str, body: dict) -> dict:
+    response = _session.post(
+        f"{str(settings.LEDGER_API_BASE).rstrip('/')}{path}",
         headers={
             "Authorization": f"Bearer {settings.LEDGER_API_TOKEN}",
             "Content-Type": "application/json",
         },
-        data=json.dumps(payload),
+        data=json.dumps(body),
         timeout=settings.TIMEOUT_SECS,
     )
     response.raise_for_status()
     return response.json()
 
+
+def _retrying(call: Callable[[], dict], retries: Optional[int] = None) -> dict:
+    """Run call, retrying transient failures with exponential backoff."""
+    retries = settings.LEDGER_MAX_RETRIES if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if status not in RETRYABLE_STATUS or attempt == retries:
+                raise
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        time.sleep(settings.LEDGER_BACKOFF_SECS * (2**attempt))
+    raise AssertionError("unreachable")
+
+
+def _send_one(payload: dict, retries: Optional[int] = None) -> Optional[dict]:
+    try:
+        return _retrying(lambda: _post("/ledger/attest", payload), retries)
+    except requests.RequestException:
+        return None
+
+
+def _send(payloads: Sequence[dict], retries: Optional[int] = None) -> List[Optional[dict]]:
+    """Deliver payloads as one batch when supported, else concurrently one by one.
+
+    Returns a receipt per payload, ``None`` where delivery failed. A batch
+    response without exactly one receipt per payload counts as a failure.
+    """
+    global _batch_supported
+    if not payloads:
+        return []
+    if len(payloads) > 1 and _batch_supported is not False:
+        try:
+            data = _retrying(lambda: _post("/ledger/attest/batch", {"events": list(payloads)}), retries)
+            _batch_supported = True
+            receipts = data["receipts"]
+            if not isinstance(receipts, list) or len(receipts) != len(payloads):
+                return [None] * len(payloads)
+            return receipts
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if status not in {404, 405}:
+                return [None] * len(payloads)
+            _batch_supported = False
+        except (requests.RequestException, KeyError, TypeError, ValueError):
+            return [None] * len(payloads)
+
+    with ThreadPoolExecutor(max_workers=min(settings.ANCHOR_CONCURRENCY, len(payloads))) as pool:
+        return list(pool.map(lambda payload: _send_one(payload, retries), payloads))
+
+
+def flush_outbox() -> int:
+    """Resend the oldest anchors queued by earlier scans; returns how many were delivered.
+
+    Each flush sends at most LEDGER_OUTBOX_FLUSH_LIMIT entries, once each:
+    the outbox itself is the retry loop, so entries are not retried inline.
+    """
+    return outbox.flush(lambda payloads: _send(payloads, retries=0), limit=settings.LEDGER_OUTBOX_FLUSH_LIMIT)
+
+
+def write_events(events: Sequence[Tuple[VerifiedEvent, float]]) -> List[Dict[str, object]]:
+    """Anchor (event, gi) pairs in one round and return a receipt per event.
+
+    Events that still fail after retries are queued in the outbox and get
+    a ``{"queued": True, "outbox_id": ...}`` receipt instead. Queued anchors
+    from earlier scans are resent afterwards, unless this round already
+    found the ledger unreachable.
+    """
+    payloads = [_payload(event, gi) for event, gi in events]
+    receipts = _send(payloads)
+    failed = [index for index, receipt in enumerate(receipts) if receipt is None]
+    for index, outbox_id in zip(failed, outbox.append(payloads[index] for index in failed)):
+        receipts[index] = {"queued": True, "outbox_id": outbox_id}
+    if not failed:
+        flush_outbox()
+    return receipts
+
+
+def write_event(event: VerifiedEvent, gi: float) -> dict:
+    """Anchor attested event into Civic Ledger and return receipt."""
+    return _retrying(lambda: _post("/ledger/attest", _payload(event, gi)))
@@ -2,19 +2,51 @@
 
 from __future__ import annotations
 
+import threading
 from typing import Dict, List
 
 from fastapi import FastAPI, HTTPException, Query
 
+from .clustering import NearDuplicateClusterer
 from .config import settings
-from .ingest import collect, cross_verify
-from .integrity import gate
-from .ledger import write_event
+from .ingest import collect_with_status, cross_verify
+from .integrity import gate_many
+from .ledger import outbox, write_events
+from .models import VerifiedEvent
+from .sources.feeds import fetcher
 
 GI_THRESHOLD = 0.95
 
 app = FastAPI(title="Echo Sentinel", version="0.1.0")
 
+# One streaming clusterer per topic so stories corroborated across scans still verify
+clusterers: Dict[str, NearDuplicateClusterer] = {}
+_clusterers_lock = threading.Lock()
+
+
+def get_clusterer(topic: str) -> NearDuplicateClusterer | None:
+    if not settings.CLUSTER_RETENTION_SECS:
+        return None
+    with _clusterers_lock:
+        if topic not in clusterers:
+            clusterers[topic] = NearDuplicateClusterer(
+                threshold=settings.CLUSTER_SIMILARITY, retention=settings.CLUSTER_RETENTION_SECS
+            )
+        return clusterers[topic]
+
+
+def meets_impact(event: VerifiedEvent) -> bool:
+    if settings.MIN_IMPACT_FOR_ALERT == "high":
+        return event.impact == "high"
+    if settings.MIN_IMPACT_FOR_ALERT == "medium":
+        return event.impact in {"medium", "high"}
+    return True
+
+
+@app.on_event("shutdown")
+def close_fetcher() -> None:
+    fetcher.close()
+
 
 @app.get("/health")
 def health() -> Dict[str, object]:
@@ -24,29 +56,34 @@ def health() -> Dict[str, object]:
 @app.post("/scan")
 def scan(topic: str = Query(..., pattern="^(economy|technology|climate|defense)$")) -> Dict[str, object]:
     try:
-        items = collect(topic, settings.TIMEOUT_SECS)
-        verified_events = cross_verify(items, settings.REQUIRED_SOURCES)
-        alerts: List[Dict[str, object]] = []
-        for event in verified_events:
-            if settings.MIN_IMPACT_FOR_ALERT == "high" and event.impact != "high":
-                continue
-            if settings.MIN_IMPACT_FOR_ALERT == "medium" and event.impact not in {"medium", "high"}:
-                continue
-            gi = gate(event)
-            if gi < GI_THRESHOLD:
-                continue
-            receipt = write_event(event, gi)
-            alerts.append(
-                {
-                    "domain": event.topic,
-                    "summary": event.headline,
-                    "impact": event.impact,
-                    "citations": [item.url for item in event.items],
-                    "ledger_receipt": receipt,
-                    "gi": gi,
-                }
-            )
-        return {"alerts": alerts, "count": len(alerts)}
+        items, sources = collect_with_status(topic, settings.TIMEOUT_SECS, settings.SCAN_BUDGET_SECS)
+        verified_events = cross_verify(
+            items, settings.REQUIRED_SOURCES, get_clusterer(topic), settings.CLUSTER_SIMILARITY
+        )
+        candidates = [event for event in verified_events if meets_impact(event)]
+        scores = gate_many(candidates)
+        passing = [
+            (event, gi) for event, gi in zip(candidates, scores) if gi is not None and gi >= GI_THRESHOLD
+        ]
+        receipts = write_events(passing)
+        alerts: List[Dict[str, object]] = [
+            {
+                "domain": event.topic,
+                "summary": event.headline,
+                "impact": event.impact,
+                "citations": [item.url for item in event.items],
+                "ledger_receipt": receipt,
+                "gi": gi,
+            }
+            for (event, gi), receipt in zip(passing, receipts)
+        ]
+        return {
+            "alerts": alerts,
+            "count": len(alerts),
+            "sources": sources,
+            "gate_errors": scores.count(None),
+            "outbox": len(outbox),
+        }
     except HTTPException:
         raise
     except Exception as exc:  # pragma: no cover
@@ -0,0 +1,133 @@
+"""On-disk outbox for ledger anchors that could not be delivered."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class Outbox:
+    """Append-only JSONL queue of undelivered payloads.
+
+    Entries are ``{"id", "payload", "attempts", "queued_at"}``. Delivered
+    entries are removed by rewriting the file atomically, so a crash never
+    loses a queued anchor (at worst it is retried twice). Entries that have
+    failed ``max_attempts`` times or are older than ``max_age`` seconds are
+    moved to a ``.dead`` file next to the queue instead of being retried.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 10, max_age: Optional[float] = 7 * 24 * 60 * 60):
+        self.path = path
+        self.dead_path = f"{path}.dead"
+        self.max_attempts = max_attempts
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+        # Queue length, read from the file once and then kept up to date
+        self._count: Optional[int] = None
+
+    def _read(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                lines = handle.readlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # torn final line from a crash mid-append
+        return entries
+
+    def _append_lines(self, path: str, entries: List[Dict[str, Any]]) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _write(self, entries: List[Dict[str, Any]]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def append(self, payloads: Iterable[Dict[str, Any]]) -> List[str]:
+        """Queue payloads and return their outbox ids."""
+        entries = [
+            {"id": uuid.uuid4().hex, "payload": payload, "attempts": 1, "queued_at": time.time()}
+            for payload in payloads
+        ]
+        if not entries:
+            return []
+        with self._lock:
+            self._append_lines(self.path, entries)
+            if self._count is not None:
+                self._count += len(entries)
+        return [entry["id"] for entry in entries]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = self._read()
+            self._count = len(entries)
+            return entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._count is None:
+                self._count = len(self._read())
+            return self._count
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        if entry["attempts"] >= self.max_attempts:
+            return True
+        return self.max_age is not None and now - entry.get("queued_at", now) > self.max_age
+
+    def settle(self, delivered: Iterable[str], failed: Iterable[str] = ()) -> None:
+        """Drop delivered entries, bump the attempt count of failed ones and dead-letter the exhausted."""
+        delivered, failed = set(delivered), set(failed)
+        if not delivered and not failed:
+            return
+        now = time.time()
+        with self._lock:
+            entries, dead = [], []
+            for entry in self._read():
+                if entry["id"] in delivered:
+                    continue
+                if entry["id"] in failed:
+                    entry["attempts"] += 1
+                (dead if self._expired(entry, now) else entries).append(entry)
+            if dead:
+                self._append_lines(self.dead_path, dead)
+            self._write(entries)
+            self._count = len(entries)
+
+    def flush(self, send, limit: Optional[int] = None) -> int:
+        """Retry up to ``limit`` of the oldest queued payloads with ``send(payloads) -> results``.
+
+        ``send`` returns one result per payload, ``None`` for failures.
+        Returns how many entries were delivered; concurrent flushes are
+        skipped rather than sending the same entries twice.
+        """
+        if not self._flushing.acquire(blocking=False):
+            return 0
+        try:
+            entries = self.pending()[:limit]
+            if not entries:
+                return 0
+            results = send([entry["payload"] for entry in entries])
+            delivered = [entry["id"] for entry, result in zip(entries, results) if result is not None]
+            failed = [entry["id"] for entry, result in zip(entries, results) if result is None]
+            self.settle(delivered, failed)
+            return len(delivered)
+        finally:
+            self._flushing.release()
@@ -3,10 +3,9 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import List
-
-import feedparser
+from typing import List, Optional
 
+from .feeds import fetcher
 from .typing import FetchResult
 
 AP_FEEDS = {
@@ -30,10 +29,16 @@ def _parse_entry(entry, topic: str) -> FetchResult:
     )
 
 
+def feed_url(topic: str) -> Optional[str]:
+    return AP_FEEDS.get(topic)
+
+
+def parse(feed, topic: str) -> List[FetchResult]:
+    return [_parse_entry(entry, topic) for entry in feed.entries[:20]]
+
+
 def fetch(topic: str, timeout: int) -> List[FetchResult]:
-    url = AP_FEEDS.get(topic)
+    url = feed_url(topic)
     if not url:
         return []
-    feed = feedparser.parse(url)
-    return [_parse_entry(entry, topic) for entry in feed.entries[:20]]
-
+    return parse(fetcher.fetch_feed(url, timeout), topic)
@@ -3,19 +3,21 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import List
-
-import feedparser
+from typing import List, Optional
 
+from .feeds import fetcher
 from .typing import FetchResult
 
 BIS_NEWS = "https://www.bis.org/whats_new_rss.xml"
 
 
-def fetch(topic: str, timeout: int) -> List[FetchResult]:
+def feed_url(topic: str) -> Optional[str]:
     if topic != "economy":
-        return []
-    feed = feedparser.parse(BIS_NEWS)
+        return None
+    return BIS_NEWS
+
+
+def parse(feed, topic: str) -> List[FetchResult]:
     results: List[FetchResult] = []
     for entry in feed.entries[:20]:
         published = getattr(entry, "published_parsed", None)
@@ -32,3 +34,9 @@ def fetch(topic: str, timeout: int) -> List[FetchResult]:
         )
     return results
 
+
+def fetch(topic: str, timeout: int) -> List[FetchResult]:
+    url = feed_url(topic)
+    if not url:
+        return []
+    return parse(fetcher.fetch_feed(url, timeout), topic)
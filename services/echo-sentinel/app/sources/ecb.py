@@ -3,19 +3,21 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import List
-
-import feedparser
+from typing import List, Optional
 
+from .feeds import fetcher
 from .typing import FetchResult
 
 ECB_PRESS = "https://www.ecb.europa.eu/press/pr/html/index.en.rss"
 
 
-def fetch(topic: str, timeout: int) -> List[FetchResult]:
+def feed_url(topic: str) -> Optional[str]:
     if topic != "economy":
-        return []
-    feed = feedparser.parse(ECB_PRESS)
+        return None
+    return ECB_PRESS
+
+
+def parse(feed, topic: str) -> List[FetchResult]:
     results: List[FetchResult] = []
     for entry in feed.entries[:20]:
         published = getattr(entry, "published_parsed", None)
@@ -32,3 +34,9 @@ def fetch(topic: str, timeout: int) -> List[FetchResult]:
         )
     return results
 
+
+def fetch(topic: str, timeout: int) -> List[FetchResult]:
+    url = feed_url(topic)
+    if not url:
+        return []
+    return parse(fetcher.fetch_feed(url, timeout), topic)
@@ -0,0 +1,196 @@
+"""Conditional-GET feed cache and parsed-entry memo shared by all adapters."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import feedparser
+
+from .typing import FetchResult
+
+# Entry fields the adapters read; everything else is dropped from the cache
+ENTRY_FIELDS = ("id", "title", "link", "summary", "published_parsed")
+
+# Adapters only look at the first MAX_ENTRIES entries of a feed
+MAX_ENTRIES = 20
+
+CACHE_VERSION = 1
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+
+def _entry_state(entry) -> Dict[str, Any]:
+    state = {name: entry.get(name) for name in ENTRY_FIELDS if entry.get(name) is not None}
+    if "published_parsed" in state:
+        state["published_parsed"] = list(state["published_parsed"])
+    return state
+
+
+def _entry_from_state(state: Dict[str, Any]) -> feedparser.FeedParserDict:
+    entry = feedparser.FeedParserDict(state)
+    if "published_parsed" in state:
+        entry["published_parsed"] = time.struct_time(state["published_parsed"])
+    return entry
+
+
+class FeedCache:
+    """Remembers feed validators, feed bodies and parsed results.
+
+    For every feed URL the cache keeps the ETag/Last-Modified validators
+    and the entries of the last good response, so a ``304 Not Modified``
+    (or an unchanged body from a server without validators) skips parsing.
+    Parsed ``FetchResult`` objects are memoized per adapter and topic by
+    entry GUID (or link) and content fingerprint, and anything not seen
+    within ``ttl`` seconds is evicted. With a ``path`` the cache is loaded
+    on start and saved after each scan so restarts are warm.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 24 * 60 * 60):
+        self.path = path
+        self.ttl = ttl
+        self.feeds: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path:
+            self._load()
+
+    # Feed level
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for url."""
+        cached = self.feeds.get(url)
+        if not cached:
+            return {}
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def cached_feed(self, url: str, body: Optional[bytes] = None) -> Optional[feedparser.FeedParserDict]:
+        """Last parsed feed for url; with body, only if the body is unchanged."""
+        cached = self.feeds.get(url)
+        if not cached:
+            return None
+        if body is not None and cached.get("body_digest") != hashlib.sha1(body).hexdigest():
+            return None
+        cached["seen"] = time.time()
+        self._dirty = True
+        return feedparser.FeedParserDict(entries=[_entry_from_state(state) for state in cached["entries"]])
+
+    def store_feed(self, url: str, body: bytes, headers, feed: feedparser.FeedParserDict) -> None:
+        """Remember validators and entries of a fresh 200 response."""
+        self.feeds[url] = {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "body_digest": hashlib.sha1(body).hexdigest(),
+            "entries": [_entry_state(entry) for entry in feed.entries[:MAX_ENTRIES]],
+            "seen": time.time(),
+        }
+        self._dirty = True
+
+    # Entry level
+
+    def parse(
+        self,
+        adapter: str,
+        parse: Callable[[feedparser.FeedParserDict, str], List[FetchResult]],
+        feed: feedparser.FeedParserDict,
+        topic: str,
+    ) -> List[FetchResult]:
+        """Run an adapter's parse() only on entries that are not memoized."""
+        entries = feed.entries[:MAX_ENTRIES]
+        now = time.time()
+        keys = []
+        misses = []
+        for entry in entries:
+            state = _entry_state(entry)
+            fingerprint = _digest(state)
+            key = f"{adapter}|{topic}|{state.get('id') or state.get('link') or fingerprint}"
+            keys.append(key)
+            memo = self.results.get(key)
+            if memo is None or memo["fingerprint"] != fingerprint:
+                misses.append((key, entry, fingerprint))
+
+        if misses:
+            parsed = parse(feedparser.FeedParserDict(entries=[entry for _, entry, _ in misses]), topic)
+            for (key, _, fingerprint), result in zip(misses, parsed):
+                self.results[key] = {"fingerprint": fingerprint, "result": result, "seen": now}
+            self._dirty = True
+        self.misses += len(misses)
+        self.hits += len(entries) - len(misses)
+
+        results = []
+        for key in keys:
+            memo = self.results.get(key)
+            if memo is None:
+                continue
+            memo["seen"] = now
+            results.append(memo["result"])
+        return results
+
+    # Eviction and persistence
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop feeds and entries not seen within ttl; returns how many were dropped."""
+        cutoff = (now if now is not None else time.time()) - self.ttl
+        dropped = 0
+        for table in (self.feeds, self.results):
+            stale = [key for key, value in table.items() if value["seen"] < cutoff]
+            for key in stale:
+                del table[key]
+            dropped += len(stale)
+        if dropped:
+            self._dirty = True
+        return dropped
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        self.feeds = data.get("feeds", {})
+        for key, memo in data.get("results", {}).items():
+            try:
+                memo["result"] = FetchResult(**memo["result"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.results[key] = memo
+        self.evict()
+
+    def save(self) -> None:
+        """Persist the cache if it changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+        self.evict()
+        data = {
+            "version": CACHE_VERSION,
+            "feeds": self.feeds,
+            "results": {
+                key: {**memo, "result": memo["result"].model_dump(mode="json")}
+                for key, memo in self.results.items()
+            },
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def stats(self) -> Dict[str, int]:
+        return {"feeds": len(self.feeds), "entries": len(self.results), "hits": self.hits, "misses": self.misses}
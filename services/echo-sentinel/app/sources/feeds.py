@@ -0,0 +1,168 @@
+"""Concurrent feed fetching shared by all source adapters."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import ModuleType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import feedparser
+import httpx
+
+from ..config import settings
+from .feed_cache import FeedCache
+from .typing import FetchResult
+
+USER_AGENT = "EchoSentinel/0.1"
+
+SourceStatus = Dict[str, str]
+
+
+def adapter_name(adapter: ModuleType) -> str:
+    return adapter.__name__.rsplit(".", 1)[-1]
+
+
+class FeedFetcher:
+    """Runs adapter fetches concurrently over one pooled HTTP client.
+
+    The client lives on a private event loop thread so its connection pool
+    survives across scans. With a ``FeedCache`` feeds are fetched with
+    conditional GETs and only new or changed entries are parsed. Adapters
+    expose ``feed_url(topic)`` and ``parse(feed, topic)``; adapters with only
+    ``fetch(topic, timeout)`` (e.g. authenticated clients) run in a worker
+    thread under the same deadlines.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 32,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[FeedCache] = None,
+    ):
+        self.max_connections = max_connections
+        self.transport = transport
+        self.cache = cache
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="echo-feed-fetcher", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _run(self, coro):
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self.transport,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def _fetch_feed(self, url: str, timeout: float) -> feedparser.FeedParserDict:
+        cache = self.cache
+        headers = cache.validators(url) if cache else {}
+        response = await self._get_client().get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and cache:
+            feed = cache.cached_feed(url)
+            if feed is not None:
+                return feed
+        response.raise_for_status()
+        if cache:
+            feed = cache.cached_feed(url, body=response.content)
+            if feed is not None:
+                return feed
+        feed = await asyncio.to_thread(feedparser.parse, response.content)
+        if cache:
+            cache.store_feed(url, response.content, response.headers, feed)
+        return feed
+
+    async def _run_adapter(self, adapter: ModuleType, topic: str, timeout: float) -> List[FetchResult]:
+        feed_url = getattr(adapter, "feed_url", None)
+        if feed_url is None:
+            return await asyncio.wait_for(asyncio.to_thread(adapter.fetch, topic, timeout), timeout)
+        url = feed_url(topic)
+        if not url:
+            return []
+        feed = await asyncio.wait_for(self._fetch_feed(url, timeout), timeout)
+        if self.cache:
+            return self.cache.parse(adapter_name(adapter), adapter.parse, feed, topic)
+        return adapter.parse(feed, topic)
+
+    async def _gather(
+        self, adapters: Sequence[ModuleType], topic: str, timeout: float, budget: float
+    ) -> Tuple[List[FetchResult], SourceStatus]:
+        tasks = {
+            asyncio.ensure_future(self._run_adapter(adapter, topic, timeout)): adapter_name(adapter)
+            for adapter in adapters
+        }
+        _, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in pending:
+            task.cancel()
+
+        results: List[FetchResult] = []
+        status: SourceStatus = {}
+        for task, name in tasks.items():
+            if task in pending:
+                status[name] = "timeout"
+                continue
+            error = task.exception()
+            if isinstance(error, asyncio.TimeoutError):
+                status[name] = "timeout"
+            elif error is not None:
+                status[name] = "error"
+            else:
+                status[name] = "ok"
+                results.extend(task.result())
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self.cache:
+            self.cache.save()
+        return results, status
+
+    def gather(
+        self, adapters: Sequence[ModuleType], topic: str, timeout: float, budget: float
+    ) -> Tuple[List[FetchResult], SourceStatus]:
+        """Fetch from every adapter at once.
+
+        Each adapter gets ``timeout`` seconds and the whole scan ``budget``
+        seconds; sources that miss their deadline are reported as
+        ``"timeout"`` and the rest are returned as partial results.
+        """
+        return self._run(self._gather(adapters, topic, timeout, budget))
+
+    def fetch_feed(self, url: str, timeout: float) -> feedparser.FeedParserDict:
+        """Fetch and parse a single feed on the shared client."""
+        return self._run(asyncio.wait_for(self._fetch_feed(url, timeout), timeout))
+
+    def close(self) -> None:
+        """Close the pooled client and stop the event loop thread."""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+
+fetcher = FeedFetcher(cache=FeedCache(settings.FEED_CACHE_PATH or None, settings.FEED_CACHE_TTL_SECS))
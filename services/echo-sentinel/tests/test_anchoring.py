@@ -0,0 +1,112 @@
+import json
+
+import requests
+
+from app import integrity, ledger
+from app.config import settings
+from app.models import RawItem, VerifiedEvent
+from app.outbox import Outbox
+
+
+def _event(headline: str) -> VerifiedEvent:
+    items = [
+        RawItem(source=source, title=headline, url=f"https://{source.lower()}.example/{len(headline)}", topic="economy")
+        for source in ("Reuters", "AP")
+    ]
+    return VerifiedEvent(topic="economy", headline=headline, items=items, impact="high")
+
+
+def _response(status: int, body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+def test_anchors_fall_back_per_event_and_queue_failures(tmp_path, monkeypatch):
+    calls = []
+    ledger_down = {"value": True}
+
+    def post(url, headers, data, timeout):
+        body = json.loads(data)
+        calls.append(url.rsplit("/ledger", 1)[1])
+        if url.endswith("/batch"):
+            return _response(404, {})
+        if body["headline"] == "Flaky" and ledger_down["value"]:
+            return _response(503, {})
+        return _response(200, {"receipt": body["headline"]})
+
+    monkeypatch.setattr(ledger._session, "post", post)
+    monkeypatch.setattr(ledger, "outbox", Outbox(str(tmp_path / "outbox.jsonl")))
+    monkeypatch.setattr(ledger, "_batch_supported", None)
+    monkeypatch.setattr(settings, "LEDGER_BACKOFF_SECS", 0)
+    monkeypatch.setattr(settings, "LEDGER_MAX_RETRIES", 2)
+
+    receipts = ledger.write_events([(_event("Steady"), 0.99), (_event("Flaky"), 0.97)])
+    assert receipts[0] == {"receipt": "Steady"}
+    assert receipts[1]["queued"] is True
+    assert calls.count("/attest/batch") == 1
+    assert calls.count("/attest") == 1 + 3  # one success, then Flaky retried twice
+    assert [entry["payload"]["headline"] for entry in ledger.outbox.pending()] == ["Flaky"]
+
+    # The ledger is known not to batch, and the next round also drains the outbox
+    ledger_down["value"] = False
+    calls.clear()
+    assert ledger.write_events([(_event("Later"), 0.99)]) == [{"receipt": "Later"}]
+    assert calls == ["/attest", "/attest"]
+    assert len(ledger.outbox) == 0
+
+
+def test_short_batch_response_queues_every_event(tmp_path, monkeypatch):
+    def post(url, headers, data, timeout):
+        return _response(200, {"receipts": [{"receipt": "only one"}]})
+
+    monkeypatch.setattr(ledger._session, "post", post)
+    monkeypatch.setattr(ledger, "outbox", Outbox(str(tmp_path / "outbox.jsonl")))
+    monkeypatch.setattr(ledger, "_batch_supported", None)
+
+    receipts = ledger.write_events([(_event("One"), 0.99), (_event("Two"), 0.99)])
+    assert [receipt["queued"] for receipt in receipts] == [True, True]
+    assert len(ledger.outbox) == 2
+
+
+def test_outbox_flush_is_bounded_and_dead_letters(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"), max_attempts=3)
+    outbox.append({"n": n} for n in range(5))
+    sent = []
+
+    def down(payloads):
+        sent.append(len(payloads))
+        return [None] * len(payloads)
+
+    assert outbox.flush(down, limit=2) == 0
+    assert sent == [2]
+    assert len(outbox) == 5
+    outbox.flush(down, limit=2)
+    # the first two have now failed three times and are moved aside
+    assert len(outbox) == 3
+    assert [entry["payload"]["n"] for entry in outbox.pending()] == [2, 3, 4]
+    with open(outbox.dead_path, encoding="utf-8") as handle:
+        assert [json.loads(line)["payload"]["n"] for line in handle] == [0, 1]
+
+
+def test_outbox_dead_letters_old_entries(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"), max_age=60)
+    outbox.append([{"n": 0}])
+    entry = outbox.pending()[0]
+    entry["queued_at"] -= 120
+    outbox._write([entry])
+    outbox.flush(lambda payloads: [None] * len(payloads))
+    assert len(outbox) == 0
+
+
+def test_gate_many_scores_concurrently_and_isolates_failures(monkeypatch):
+    def post(url, headers, data, timeout):
+        headline = json.loads(data)["event"]["headline"]
+        if headline == "Broken":
+            return _response(500, {})
+        return _response(200, {"gi": 0.98})
+
+    monkeypatch.setattr(integrity._session, "post", post)
+    scores = integrity.gate_many([_event("First"), _event("Broken"), _event("Third")])
+    assert scores == [0.98, None, 0.98]
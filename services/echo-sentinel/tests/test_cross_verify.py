@@ -1,3 +1,7 @@
+import threading
+import time
+
+from app.clustering import NearDuplicateClusterer
 from app.ingest import cross_verify
 from app.models import RawItem
 
@@ -23,3 +27,101 @@ def test_cross_verify_minimum_sources():
     event = events[0]
     assert event.topic == "economy"
     assert len(event.items) == 2
+
+
+def test_cross_verify_clusters_near_duplicate_headlines():
+    items = [
+        RawItem(
+            source="Reuters",
+            title="ECB holds rates as inflation cools",
+            url="https://www.reuters.com/ecb",
+            topic="economy",
+        ),
+        RawItem(
+            source="AP",
+            title="ECB holds interest rates steady as inflation cools",
+            url="https://apnews.com/ecb",
+            topic="economy",
+        ),
+        RawItem(
+            source="AP",
+            title="Oil prices fall on demand worries",
+            url="https://apnews.com/oil",
+            topic="economy",
+        ),
+    ]
+
+    events = cross_verify(items, min_sources=2)
+    assert len(events) == 1
+    assert events[0].headline == "ECB holds rates as inflation cools"
+    assert {item.source for item in events[0].items} == {"Reuters", "AP"}
+
+
+def test_cross_verify_streams_across_scans():
+    clusterer = NearDuplicateClusterer(retention=3600)
+    first_scan = [
+        RawItem(
+            source="Reuters",
+            title="Strong earthquake strikes off Japan coast",
+            url="https://www.reuters.com/quake",
+            topic="climate",
+        )
+    ]
+    second_scan = [
+        RawItem(
+            source="AP",
+            title="Earthquake strikes off coast of Japan",
+            url="https://apnews.com/quake",
+            topic="climate",
+        )
+    ]
+
+    assert cross_verify(first_scan, min_sources=2, clusterer=clusterer) == []
+    events = cross_verify(second_scan, min_sources=2, clusterer=clusterer)
+    assert len(events) == 1
+    assert [item.source for item in events[0].items] == ["Reuters", "AP"]
+
+    # Items age out after the retention window
+    clusterer.add([], now=time.time() + 7200)
+    assert len(clusterer) == 0
+
+
+def test_clusterer_concurrent_add():
+    clusterer = NearDuplicateClusterer(retention=60)
+    errors = []
+
+    def scan(worker: int) -> None:
+        try:
+            for round_ in range(30):
+                # Shared stories plus per-worker ones; the clock moves so old items expire
+                clusterer.add(
+                    [
+                        RawItem(
+                            source=f"S{worker}",
+                            title=f"Story {round_ % 5} about the central bank rate decision",
+                            url=f"https://example.com/{worker}/{round_}",
+                            topic="economy",
+                        ),
+                        RawItem(
+                            source="Wire",
+                            title=f"Shared wire story number {round_}",
+                            url=f"https://wire.example.com/{round_}",
+                            topic="economy",
+                        ),
+                    ],
+                    now=1000.0 + round_ * 10,
+                )
+        except Exception as exc:  # pragma: no cover - surfaced by the assert below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=scan, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    urls = [str(item.url) for item in clusterer._items.values()]
+    assert len(urls) == len(set(urls)) == len(clusterer._urls)
+    # Every tracked item resolves to a root within the tracked set
+    assert all(clusterer._find(node) in clusterer._items for node in clusterer._items)
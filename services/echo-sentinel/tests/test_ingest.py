@@ -0,0 +1,75 @@
+import asyncio
+import time
+from types import ModuleType
+
+import httpx
+
+from app.ingest import collect_with_status
+from app.sources import reuters
+from app.sources.feed_cache import FeedCache
+from app.sources.feeds import FeedFetcher
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>ECB holds rates as inflation cools</title><link>https://www.reuters.com/example</link></item>
+</channel></rss>"""
+
+
+def _slow_adapter(name: str, delay: float) -> ModuleType:
+    adapter = ModuleType(f"app.sources.{name}")
+
+    def fetch(topic, timeout):
+        time.sleep(delay)
+        return []
+
+    adapter.fetch = fetch
+    return adapter
+
+
+def test_collect_runs_adapters_concurrently_with_deadlines():
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, content=RSS)
+
+    fetcher = FeedFetcher(transport=httpx.MockTransport(handler))
+    adapters = [reuters, _slow_adapter("fast", 0.2), _slow_adapter("stuck", 1.5)]
+    try:
+        started = time.monotonic()
+        items, status = collect_with_status("economy", 1, budget=1, feed_fetcher=fetcher, adapters=adapters)
+        elapsed = time.monotonic() - started
+    finally:
+        fetcher.close()
+
+    assert elapsed < 2
+    assert status == {"reuters": "ok", "fast": "ok", "stuck": "timeout"}
+    assert [item.source for item in items] == ["Reuters"]
+
+
+def test_feed_cache_conditional_get_and_warm_restart(tmp_path):
+    seen_headers = []
+
+    async def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"ETag": '"v1"'})
+
+    path = str(tmp_path / "feeds.json")
+    first = FeedFetcher(transport=httpx.MockTransport(handler), cache=FeedCache(path))
+    try:
+        items, _ = collect_with_status("economy", 1, feed_fetcher=first, adapters=[reuters])
+        again, _ = collect_with_status("economy", 1, feed_fetcher=first, adapters=[reuters])
+    finally:
+        first.close()
+    assert seen_headers == [None, '"v1"']
+    assert again == items
+    assert first.cache.stats()["hits"] == 1
+
+    restarted = FeedFetcher(transport=httpx.MockTransport(handler), cache=FeedCache(path))
+    try:
+        warm, _ = collect_with_status("economy", 1, feed_fetcher=restarted, adapters=[reuters])
+    finally:
+        restarted.close()
+    assert seen_headers[-1] == '"v1"'
+    assert warm == items
+    assert restarted.cache.stats() == {"feeds": 1, "entries": 1, "hits": 1, "misses": 0}
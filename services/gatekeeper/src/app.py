@@ -1,26 +1,38 @@
 """Gatekeeper FastAPI application - main entry point."""
+import asyncio
 import json
+from contextlib import asynccontextmanager
 import os
 import httpx
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from src.types import ExecRequest, ExecResponse
-from src.auth import verify_did_signature, mint_scoped_token
-from src.gi_client import assert_gi_ok
+from src.auth import did_keys, verify_actor_signature, mint_scoped_token
+from src.gi_client import assert_gi_ok, gi_cache, close_client as close_gi_client
 from src.policies import allowed, risk_requires_consensus, get_action_risk
-from src.detectors import looks_malicious
-from src.sandbox import run_in_sandbox, validate_script_safety
-from src.consensus import delibproof_consensus
+from src.detectors import detect_injection
+from src.sandbox import SandboxBusy, close_pool, get_pool, validate_script_safety
+from src.consensus import evaluate_consensus, close_client as close_consensus_client
 from src.attestation import attest, attest_blocked
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start sandbox workers up front; release pooled clients and workers on shutdown."""
+    get_pool()
+    yield
+    await close_consensus_client()
+    await close_gi_client()
+    await asyncio.to_thread(close_pool)
+
 app = FastAPI(
     title="Kaizen Gatekeeper",
     description="Security gatekeeper for agent tool calls",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -53,6 +65,15 @@ async def health():
     """Health check endpoint."""
     return {"status": "ok", "service": "gatekeeper"}
 
+@app.get("/stats")
+async def stats():
+    """Cache hit rates and sandbox pool load."""
+    return {
+        "gi_cache": gi_cache.stats(),
+        "did_key_cache": did_keys.stats(),
+        "sandbox": get_pool().stats(),
+    }
+
 @app.post("/execute", response_model=ExecResponse)
 async def execute(req: ExecRequest, request: Request):
     """
@@ -76,16 +97,9 @@ async def execute(req: ExecRequest, request: Request):
             await attest_blocked(req.model_dump(), "Missing DID signature headers")
             raise HTTPException(status_code=401, detail="Missing DID signature headers")
         
-        try:
-            sig_bytes = bytes.fromhex(sig_header) if len(sig_header) == 128 else sig_header.encode()
-            pub_bytes = bytes.fromhex(pub_header) if len(pub_header) == 128 else pub_header.encode()
-        except Exception:
-            sig_bytes = sig_header.encode()
-            pub_bytes = pub_header.encode()
-        
         payload_bytes = json.dumps(req.model_dump(), sort_keys=True).encode()
         
-        if not verify_did_signature(payload_bytes, pub_bytes, sig_bytes):
+        if not verify_actor_signature(req.actor_did, payload_bytes, pub_header, sig_header):
             await attest_blocked(req.model_dump(), "Invalid DID signature")
             raise HTTPException(status_code=401, detail="Invalid DID signature")
         
@@ -103,8 +117,12 @@ async def execute(req: ExecRequest, request: Request):
             raise HTTPException(status_code=403, detail=f"Not allowed for role: {role}")
         
         # 4) Heuristic detector
-        if looks_malicious(req.payload):
-            await attest_blocked(req.model_dump(), "Payload flagged by injection detector")
+        detection = detect_injection(req.payload)
+        if detection:
+            await attest_blocked(
+                req.model_dump(),
+                f"Payload flagged by injection detector (rule {detection.rule} at {detection.path})",
+            )
             raise HTTPException(status_code=403, detail="Payload flagged by injection detector")
         
         # 5) Validate script safety (for execute_script actions)
@@ -118,14 +136,19 @@ async def execute(req: ExecRequest, request: Request):
         # 6) High-risk actions require DelibProof consensus
         if risk_requires_consensus(req.risk):
             logger.info(f"High-risk action {req.action} requires consensus for {req.actor_did}")
-            consensus_ok = await delibproof_consensus(req.model_dump())
-            if not consensus_ok:
+            consensus = await evaluate_consensus(req.model_dump())
+            if not consensus["consensus_reached"]:
                 await attest_blocked(req.model_dump(), "Sentinel consensus failed")
                 raise HTTPException(status_code=403, detail="Consensus veto")
         
         # 7) Execute action
         if req.action == "execute_script":
-            result = run_in_sandbox(req.payload.get("script", ""))
+            try:
+                result = await asyncio.wrap_future(get_pool().submit(req.payload.get("script", "")))
+            except SandboxBusy:
+                raise HTTPException(
+                    status_code=503, detail="Sandbox busy", headers={"Retry-After": "1"}
+                )
         elif req.action == "http_request":
             # TODO: Implement HTTP request broker
             result = {"rc": 0, "stdout": "HTTP request brokered (stub)", "stderr": ""}
@@ -186,7 +209,8 @@ async def execute(req: ExecRequest, request: Request):
         return ExecResponse(
             status="ok",
             attestation_tx=tx_hash,
-            result_preview=preview
+            result_preview=preview,
+            usage=result.get("usage"),
         )
         
     except HTTPException:
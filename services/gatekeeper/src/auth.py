@@ -1,5 +1,8 @@
 """DID signature verification and short-lived token minting."""
+import os
 import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import jwt
 from fastapi import HTTPException
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
@@ -9,6 +12,8 @@ ISSUER = "kaizen-gatekeeper"
 AUD = "kaizen-internal"
 TTL = 60  # seconds
 
+DID_KEY_CACHE_SIZE = int(os.getenv("DID_KEY_CACHE_SIZE", "4096"))
+
 def verify_did_signature(payload: bytes, did_pubkey_pem: bytes, signature: bytes) -> bool:
     """
     Verify DID signature using Ed25519.
@@ -30,6 +35,89 @@ def verify_did_signature(payload: bytes, did_pubkey_pem: bytes, signature: bytes
     except (InvalidSignature, ValueError, Exception):
         return False
 
+def decode_did_header(value: str) -> bytes:
+    """
+    Decode an x-did-pub / x-did-sig header value.
+
+    Hex-encoded keys (64 chars) and signatures (128 chars) are decoded;
+    anything else is taken as raw bytes.
+    """
+    if len(value) in (64, 128):
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return value.encode()
+
+class PublicKeyCache:
+    """LRU cache of parsed Ed25519 public keys keyed by (DID, header value)."""
+
+    def __init__(self, max_size: int = DID_KEY_CACHE_SIZE):
+        self.max_size = max_size
+        self._keys: "OrderedDict[Tuple[str, str], Optional[Ed25519PublicKey]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, actor_did: str, pub_header: str) -> Optional[Ed25519PublicKey]:
+        """
+        Parsed public key for a DID's header value, or None if it is not a valid key.
+
+        Args:
+            actor_did: DID of the actor
+            pub_header: The x-did-pub header value
+
+        Returns:
+            The public key, or None if the header does not hold a valid key
+        """
+        cache_key = (actor_did, pub_header)
+        if cache_key in self._keys:
+            self.hits += 1
+            self._keys.move_to_end(cache_key)
+            return self._keys[cache_key]
+
+        self.misses += 1
+        try:
+            pubkey = Ed25519PublicKey.from_public_bytes(decode_did_header(pub_header))
+        except ValueError:
+            pubkey = None
+        self._keys[cache_key] = pubkey
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return pubkey
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+did_keys = PublicKeyCache()
+
+def verify_actor_signature(actor_did: str, payload: bytes, pub_header: str, sig_header: str) -> bool:
+    """
+    Verify a request signature from its DID headers, reusing parsed keys.
+
+    Args:
+        actor_did: DID of the actor
+        payload: The signed payload bytes
+        pub_header: The x-did-pub header value
+        sig_header: The x-did-sig header value
+
+    Returns:
+        True if signature is valid, False otherwise
+    """
+    pubkey = did_keys.get(actor_did, pub_header)
+    if pubkey is None:
+        return False
+    try:
+        pubkey.verify(decode_did_header(sig_header), payload)
+        return True
+    except InvalidSignature:
+        return False
+
 def mint_scoped_token(actor_did: str, scope: str, seconds: int = 30) -> str:
     """
     Mint a short-lived scoped token for the actor.
@@ -1,7 +1,16 @@
 """DelibProof consensus wrapper for multi-agent validation."""
-import httpx
+import asyncio
+import hashlib
+import json
+import math
 import os
-from typing import Dict, List
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from src.http_pool import PooledClient
 
 # Sentinel endpoints for consensus
 SENTINELS = [
@@ -11,87 +20,222 @@ SENTINELS = [
     os.getenv("SENTINEL_ZEUS_URL", "https://zeus.svc/assess"),
 ]
 
-async def delibproof_consensus(request_payload: dict, threshold: float = 0.90) -> bool:
-    """
-    Query sentinels for consensus on a high-risk action.
-    
-    Args:
-        request_payload: The request payload to evaluate
-        threshold: Minimum consensus threshold (default 0.90)
-        
-    Returns:
-        True if consensus reached, False otherwise
-    """
-    votes: List[float] = []
-    
-    async with httpx.AsyncClient(timeout=4.0) as client:
-        for url in SENTINELS:
-            try:
-                response = await client.post(
-                    url,
-                    json={"intent": "risk_eval", "payload": request_payload}
-                )
-                response.raise_for_status()
-                data = response.json()
-                votes.append(float(data.get("approval", 0.0)))
-            except Exception:
-                # On error, sentinel votes 0.0 (fail closed)
-                votes.append(0.0)
-    
+SENTINEL_TIMEOUT = float(os.getenv("SENTINEL_TIMEOUT", "4.0"))
+
+# A vote at or above this counts as an approval
+APPROVAL_VOTE = 0.9
+# Maximum spread of votes for sentinels to count as agreeing
+MAX_STDDEV = 0.15
+
+# Identical requests within this window reuse the previous decision
+CONSENSUS_CACHE_TTL = float(os.getenv("CONSENSUS_CACHE_TTL", "30"))
+CONSENSUS_CACHE_SIZE = int(os.getenv("CONSENSUS_CACHE_SIZE", "1024"))
+
+_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Shared client so sentinel calls reuse connections
+_client = PooledClient(timeout=SENTINEL_TIMEOUT)
+
+
+async def close_client():
+    """Close the shared sentinel client (call on application shutdown)."""
+    await _client.aclose()
+
+
+def payload_key(request_payload: dict, threshold: float) -> str:
+    """Canonical hash of a payload and threshold, used as the cache key."""
+    canonical = json.dumps(request_payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{threshold}|{canonical}".encode()).hexdigest()
+
+
+def clear_cache():
+    """Forget every cached decision."""
+    _cache.clear()
+
+
+def _decide(votes: List[float], threshold: float) -> bool:
+    """Consensus: fraction of votes >= APPROVAL_VOTE reaches threshold AND votes agree."""
     if not votes:
         return False
-    
-    # Consensus: fraction of votes >= 0.9 AND standard deviation is small
-    approval_count = sum(1 for v in votes if v >= 0.9)
+
+    approval_count = sum(1 for v in votes if v >= APPROVAL_VOTE)
     agreement = approval_count / len(votes)
-    
-    # Calculate standard deviation
+
     if len(votes) > 1:
         mean_vote = sum(votes) / len(votes)
         variance = sum((v - mean_vote) ** 2 for v in votes) / len(votes)
         stddev = variance ** 0.5
         # Require agreement >= threshold AND low variance (sentinels agree)
-        return agreement >= threshold and stddev < 0.15
-    
+        return agreement >= threshold and stddev < MAX_STDDEV
+
     # Single vote must be >= threshold
     return agreement >= threshold
 
-async def get_consensus_details(request_payload: dict) -> Dict:
+
+async def _poll_sentinel(client: httpx.AsyncClient, index: int, url: str, request_payload: dict) -> Dict:
+    try:
+        response = await client.post(
+            url,
+            json={"intent": "risk_eval", "payload": request_payload}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "sentinel": f"sentinel_{index}",
+            "url": url,
+            "approval": float(data.get("approval", 0.0)),
+            "reason": data.get("reason", ""),
+            "status": "ok",
+        }
+    except Exception as e:
+        # On error, sentinel votes 0.0 (fail closed)
+        return {
+            "sentinel": f"sentinel_{index}",
+            "url": url,
+            "approval": 0.0,
+            "reason": f"Error: {str(e)}",
+            "status": "error",
+        }
+
+
+async def _poll_sentinels(request_payload: dict, threshold: float) -> Dict:
+    """
+    Fan out to all sentinels at once and stop as soon as the verdict is fixed.
+
+    Approval needs at least ceil(threshold * n) approving votes, so once
+    more sentinels have rejected than that allows, the outcome cannot
+    change and the remaining calls are cancelled. Approval itself needs
+    every vote because the spread check depends on all of them.
+    """
+    client = _client.get()
+    tasks = [
+        asyncio.create_task(_poll_sentinel(client, i, url, request_payload))
+        for i, url in enumerate(SENTINELS)
+    ]
+    required = math.ceil(threshold * len(tasks) - 1e-9)
+    max_rejects = len(tasks) - required
+
+    rejects = 0
+    decided_early = False
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            rejects += sum(1 for task in done if task.result()["approval"] < APPROVAL_VOTE)
+            if rejects > max_rejects and pending:
+                decided_early = True
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    votes = []
+    for i, (task, url) in enumerate(zip(tasks, SENTINELS)):
+        if task.cancelled():
+            votes.append({
+                "sentinel": f"sentinel_{i}",
+                "url": url,
+                "approval": None,
+                "reason": "Skipped: outcome already decided",
+                "status": "skipped",
+            })
+        else:
+            votes.append(task.result())
+
+    if decided_early:
+        consensus_reached = False
+    else:
+        consensus_reached = _decide([vote["approval"] for vote in votes], threshold)
+
+    return {
+        "votes": votes,
+        "consensus_reached": consensus_reached,
+        "decided_early": decided_early,
+    }
+
+
+async def evaluate_consensus(request_payload: dict, threshold: float = 0.90) -> Dict:
+    """
+    Query sentinels once and return both the per-sentinel votes and the verdict.
+
+    Decisions are cached for CONSENSUS_CACHE_TTL seconds by canonical payload
+    hash, and concurrent identical requests share a single sentinel round.
+    Rounds where a sentinel errored are never cached.
+
+    Args:
+        request_payload: The request payload to evaluate
+        threshold: Minimum consensus threshold (default 0.90)
+
+    Returns:
+        Dictionary with "votes", "consensus_reached", "decided_early" and "cached"
+    """
+    key = payload_key(request_payload, threshold)
+    now = time.monotonic()
+
+    cached = _cache.get(key)
+    if cached is not None:
+        expires_at, decision = cached
+        if expires_at > now:
+            _cache.move_to_end(key)
+            return {**decision, "cached": True}
+        del _cache[key]
+
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        decision = await asyncio.shield(inflight)
+        return {**decision, "cached": True}
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        decision = await _poll_sentinels(request_payload, threshold)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Retrieve so an unawaited future does not log "exception never retrieved"
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+    future.set_result(decision)
+
+    if CONSENSUS_CACHE_TTL > 0 and all(vote["status"] != "error" for vote in decision["votes"]):
+        _cache[key] = (time.monotonic() + CONSENSUS_CACHE_TTL, decision)
+        while len(_cache) > CONSENSUS_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return {**decision, "cached": False}
+
+
+async def delibproof_consensus(request_payload: dict, threshold: float = 0.90) -> bool:
+    """
+    Query sentinels for consensus on a high-risk action.
+
+    Args:
+        request_payload: The request payload to evaluate
+        threshold: Minimum consensus threshold (default 0.90)
+
+    Returns:
+        True if consensus reached, False otherwise
+    """
+    decision = await evaluate_consensus(request_payload, threshold)
+    return decision["consensus_reached"]
+
+
+async def get_consensus_details(request_payload: dict, threshold: float = 0.90) -> Dict:
     """
     Get detailed consensus results from all sentinels.
-    
+
     Args:
         request_payload: The request payload to evaluate
-        
+        threshold: Minimum consensus threshold (default 0.90)
+
     Returns:
         Dictionary with consensus details
     """
-    votes: List[Dict] = []
-    
-    async with httpx.AsyncClient(timeout=4.0) as client:
-        for i, url in enumerate(SENTINELS):
-            try:
-                response = await client.post(
-                    url,
-                    json={"intent": "risk_eval", "payload": request_payload}
-                )
-                response.raise_for_status()
-                data = response.json()
-                votes.append({
-                    "sentinel": f"sentinel_{i}",
-                    "url": url,
-                    "approval": float(data.get("approval", 0.0)),
-                    "reason": data.get("reason", ""),
-                })
-            except Exception as e:
-                votes.append({
-                    "sentinel": f"sentinel_{i}",
-                    "url": url,
-                    "approval": 0.0,
-                    "reason": f"Error: {str(e)}",
-                })
-    
-    return {
-        "votes": votes,
-        "consensus_reached": await delibproof_consensus(request_payload),
-    }
+    return await evaluate_consensus(request_payload, threshold)
@@ -1,89 +1,211 @@
 """Heuristic detectors for prompt injection and jailbreak attempts."""
 import re
 import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
 
-# Suspicious patterns that may indicate prompt injection or jailbreak attempts
-SUSPICIOUS_PATTERNS = [
-    r"ignore\s+previous\s+instructions",
-    r"disregard\s+safety",
-    r"developer\s+mode",
-    r"\bDAN\b",  # "Do Anything Now" jailbreak pattern
-    r"bypass",
-    r"disable\s+guardrails",
-    r"base64\s*[,:]",
-    r"\u202e",  # Right-to-left override character
-    r"system\s*[:=]\s*",
-    r"assistant\s*[:=]\s*",
-    r"user\s*[:=]\s*",
-    r"<\|[a-z_]+\|>",  # Token injection patterns
-    r"\[INST\]",  # Llama instruction injection
-    r"\{INST\}",  # Variant instruction injection
+# Suspicious patterns that may indicate prompt injection or jailbreak attempts,
+# matched against normalized (lowercased, control-stripped) text, so keep them lowercase
+SUSPICIOUS_RULES = {
+    "ignore_previous": r"ignore\s+previous\s+instructions",
+    "disregard_safety": r"disregard\s+safety",
+    "developer_mode": r"developer\s+mode",
+    "dan": r"\bdan\b",  # "Do Anything Now" jailbreak pattern
+    "bypass": r"bypass",
+    "disable_guardrails": r"disable\s+guardrails",
+    "base64_marker": r"base64\s*[,:]",
+    "system_role": r"system\s*[:=]\s*",
+    "assistant_role": r"assistant\s*[:=]\s*",
+    "user_role": r"user\s*[:=]\s*",
+    "special_token": r"<\|[a-z_]+\|>",  # Token injection patterns
+    "inst_brackets": r"\[inst\]",  # Llama instruction injection
+    "inst_braces": r"\{inst\}",  # Variant instruction injection
+}
+
+# Patterns made of control characters, matched before normalization strips them
+CONTROL_RULES = {
+    "rtl_override": r"\u202e",  # Right-to-left override character
+}
+
+SUSPICIOUS_PATTERNS = list(SUSPICIOUS_RULES.values()) + list(CONTROL_RULES.values())
+
+JAILBREAK_INDICATORS = [
+    "pretend you are",
+    "act as if",
+    "roleplay as",
+    "ignore all previous",
+    "override",
+    "break out of",
+    "jailbreak",
+    "hack",
 ]
 
+# Payloads longer than this that mention base64 repeatedly are flagged
+LONG_PAYLOAD_CHARS = 1000
+MAX_BASE64_MENTIONS = 2
+
+
+class _ControlCharTable(dict):
+    """str.translate table deleting control chars (except newline and tab).
+
+    Decisions are memoized for the Basic Multilingual Plane so the table
+    stays bounded no matter which code points a payload contains.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        value = None if unicodedata.category(char)[0] == "C" and char not in "\n\t" else codepoint
+        if codepoint < 0x10000:
+            self[codepoint] = value
+        return value
+
+
+_CONTROL_TABLE = _ControlCharTable()
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize text for detection (lowercase, remove control chars).
-    
+
     Args:
         text: Input text
-        
+
     Returns:
         Normalized text
     """
-    # Remove control characters except newlines and tabs
-    text = "".join(
-        char for char in text 
-        if unicodedata.category(char)[0] != "C" or char in "\n\t"
-    )
-    return text.lower()
+    return text.translate(_CONTROL_TABLE).lower()
+
+
+@dataclass(frozen=True)
+class Detection:
+    """A detector hit: which rule fired, on what text, and where in the payload."""
+    rule: str
+    match: str
+    path: str
+
+
+def _compile(rules: Dict[str, str]) -> "re.Pattern[str]":
+    """
+    Compile named rules into one alternation; match.lastgroup is the rule name.
+
+    Each branch is tagged with an empty group at its end rather than wrapped
+    in a group, which keeps the branches' leading literals visible to the
+    regex engine's first-character scan.
+    """
+    return re.compile("|".join(f"(?:{pattern})(?P<{name}>)" for name, pattern in rules.items()))
+
+
+def _leaves(payload) -> Iterator[Tuple[str, str]]:
+    """Yield (path, text) for every string key and scalar value in a nested payload."""
+    stack = [("payload", payload)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, str):
+            yield path, value
+        elif isinstance(value, dict):
+            for key, item in reversed(list(value.items())):
+                key_text = str(key)
+                yield f"{path}.{key_text}", key_text
+                stack.append((f"{path}.{key_text}", item))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for index, item in reversed(list(enumerate(value))):
+                stack.append((f"{path}[{index}]", item))
+        elif isinstance(value, (bool, int, float)) or value is None:
+            continue
+        else:
+            yield path, str(value)
+
+
+class DetectorEngine:
+    """
+    Single-pass injection detector.
+
+    Every rule set is compiled once into a single alternation, the payload
+    is walked leaf by leaf (no repr of the whole structure), and each leaf
+    is normalized with one translate pass before matching.
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, str] = SUSPICIOUS_RULES,
+        control_rules: Dict[str, str] = CONTROL_RULES,
+    ):
+        self._pattern = _compile(rules)
+        self._control_pattern = _compile(control_rules) if control_rules else None
+
+    def _match(self, text: str, normalized: str, path: str) -> Optional[Detection]:
+        if self._control_pattern is not None:
+            match = self._control_pattern.search(text)
+            if match:
+                return Detection(match.lastgroup, match.group(), path)
+        match = self._pattern.search(normalized)
+        if match:
+            return Detection(match.lastgroup, match.group(), path)
+        return None
+
+    def scan_text(self, text: str, path: str = "text") -> Optional[Detection]:
+        """Return the first rule that fires on text, or None."""
+        return self._match(text, normalize_text(text), path)
+
+    def scan(self, payload) -> Optional[Detection]:
+        """Return the first rule that fires anywhere in payload, or None."""
+        total_chars = 0
+        base64_mentions = 0
+        for path, text in _leaves(payload):
+            normalized = normalize_text(text)
+            detection = self._match(text, normalized, path)
+            if detection:
+                return detection
+            total_chars += len(normalized)
+            base64_mentions += normalized.count("base64")
+
+        # Very long payloads that keep mentioning base64 may be smuggling data
+        if total_chars > LONG_PAYLOAD_CHARS and base64_mentions > MAX_BASE64_MENTIONS:
+            return Detection("base64_flood", f"{base64_mentions} base64 mentions", "payload")
+        return None
+
+
+_injection_engine = DetectorEngine()
+_jailbreak_engine = DetectorEngine(
+    {f"indicator_{i}": re.escape(indicator) for i, indicator in enumerate(JAILBREAK_INDICATORS)},
+    control_rules={},
+)
+
+
+def detect_injection(payload: dict) -> Optional[Detection]:
+    """
+    Find the first injection rule that fires on a payload.
+
+    Args:
+        payload: Request payload dictionary
+
+    Returns:
+        The Detection describing the rule and location, or None if clean
+    """
+    return _injection_engine.scan(payload)
+
 
 def looks_malicious(payload: dict) -> bool:
     """
     Check if payload contains suspicious patterns indicating injection attempts.
-    
+
     Args:
         payload: Request payload dictionary
-        
+
     Returns:
         True if payload looks malicious, False otherwise
     """
-    # Convert payload to string for pattern matching
-    blob = normalize_text(str(payload))
-    
-    # Check for suspicious patterns
-    for pattern in SUSPICIOUS_PATTERNS:
-        if re.search(pattern, blob, re.IGNORECASE):
-            return True
-    
-    # Check for unusual Unicode sequences
-    if len(blob) > 1000:  # Very long prompts may be suspicious
-        # Additional heuristics for long inputs
-        if blob.count("base64") > 2:
-            return True
-    
-    return False
+    return detect_injection(payload) is not None
+
 
 def detect_jailbreak_attempt(text: str) -> bool:
     """
     Detect common jailbreak patterns in text.
-    
+
     Args:
         text: Input text to check
-        
+
     Returns:
         True if jailbreak pattern detected
     """
-    normalized = normalize_text(text)
-    
-    jailbreak_indicators = [
-        "pretend you are",
-        "act as if",
-        "roleplay as",
-        "ignore all previous",
-        "override",
-        "break out of",
-        "jailbreak",
-        "hack",
-    ]
-    
-    return any(indicator in normalized for indicator in jailbreak_indicators)
+    return _jailbreak_engine.scan_text(text) is not None
@@ -1,49 +1,171 @@
 """GI (Mobius Integrity Index) client for checking actor integrity scores."""
-import httpx
+import asyncio
 import os
+import time
+from typing import Dict, Optional, Set, Tuple
+
+import httpx
+
+from src.http_pool import PooledClient
 
 GI_FLOOR = float(os.getenv("GI_FLOOR", "0.95"))
 GI_INDEXER_URL = os.getenv("GI_INDEXER_URL", "https://gic-indexer.onrender.com")
 
+# Scores younger than GI_CACHE_TTL are served as-is; up to GI_CACHE_STALE
+# seconds old they are still served while a background refresh runs
+GI_CACHE_TTL = float(os.getenv("GI_CACHE_TTL", "10"))
+GI_CACHE_STALE = float(os.getenv("GI_CACHE_STALE", "30"))
+GI_CACHE_SIZE = int(os.getenv("GI_CACHE_SIZE", "10000"))
+
+_client = PooledClient(timeout=2.0, limits=httpx.Limits(max_keepalive_connections=20))
+
+
+class GICache:
+    """
+    Per-actor GI scores with TTL and stale-while-revalidate refresh.
+
+    Concurrent misses for the same actor share one indexer call. Failed
+    lookups are never cached, so a transient indexer error does not pin an
+    actor at 0.0.
+    """
+
+    def __init__(self, ttl: float = GI_CACHE_TTL, stale: float = GI_CACHE_STALE, max_size: int = GI_CACHE_SIZE):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_size = max_size
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def clear(self):
+        self._scores.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._scores),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
+
+    def _store(self, actor_did: str, score: float):
+        if actor_did not in self._scores and len(self._scores) >= self.max_size:
+            # Drop the oldest entry (dicts keep insertion order)
+            del self._scores[next(iter(self._scores))]
+        self._scores.pop(actor_did, None)
+        self._scores[actor_did] = (score, time.monotonic())
+
+    async def _fetch(self, actor_did: str) -> Optional[float]:
+        score = await fetch_gi(actor_did)
+        if score is None:
+            self.errors += 1
+        else:
+            self._store(actor_did, score)
+        return score
+
+    async def _load(self, actor_did: str) -> Optional[float]:
+        """Fetch a score once for all concurrent callers; None if the indexer failed.
+
+        The fetch runs in its own task, so a caller that is cancelled (e.g. a
+        request that timed out) stops waiting without failing the others.
+        """
+        task = self._inflight.get(actor_did)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(actor_did))
+            self._inflight[actor_did] = task
+            task.add_done_callback(lambda _: self._inflight.pop(actor_did, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, actor_did: str):
+        try:
+            await self._load(actor_did)
+        finally:
+            self._refreshing.discard(actor_did)
+
+    async def get(self, actor_did: str) -> float:
+        """GI score for actor_did; 0.0 (fail closed) if it cannot be fetched."""
+        cached = self._scores.get(actor_did)
+        if cached is not None:
+            score, fetched_at = cached
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return score
+            if age < self.ttl + self.stale:
+                self.stale_hits += 1
+                if actor_did not in self._refreshing:
+                    self._refreshing.add(actor_did)
+                    task = asyncio.create_task(self._refresh(actor_did))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return score
+
+        self.misses += 1
+        score = await self._load(actor_did)
+        return 0.0 if score is None else score
+
+
+gi_cache = GICache()
+
+
+async def fetch_gi(actor_did: str) -> Optional[float]:
+    """
+    Fetch GI score for an actor from the MIC Indexer, bypassing the cache.
+
+    Args:
+        actor_did: DID of the actor
+
+    Returns:
+        GI score (0.0 to 1.0), or None if the indexer could not be reached
+    """
+    try:
+        response = await _client.get().get(
+            f"{GI_INDEXER_URL}/gi",
+            params={"actor": actor_did}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return float(data.get("mii", 0.0))
+    except Exception:
+        return None
+
+
 async def get_gi(actor_did: str) -> float:
     """
     Fetch GI score for an actor from the MIC Indexer.
-    
+
     Args:
         actor_did: DID of the actor
-        
+
     Returns:
-        GI score (0.0 to 1.0)
-        
-    Raises:
-        httpx.HTTPError: If the request fails
+        GI score (0.0 to 1.0); 0.0 if the indexer fails (fail closed)
     """
-    async with httpx.AsyncClient(timeout=2.0) as client:
-        try:
-            response = await client.get(
-                f"{GI_INDEXER_URL}/gi",
-                params={"actor": actor_did}
-            )
-            response.raise_for_status()
-            data = response.json()
-            return float(data.get("mii", 0.0))
-        except httpx.TimeoutException:
-            # Timeout defaults to 0.0 (fail closed)
-            return 0.0
-        except Exception:
-            # Fail closed on any error
-            return 0.0
+    return await gi_cache.get(actor_did)
+
 
 async def assert_gi_ok(actor_did: str):
     """
     Assert that actor's GI meets the floor threshold.
-    
+
     Args:
         actor_did: DID of the actor
-        
+
     Raises:
         ValueError: If GI is below the floor threshold
     """
     gi = await get_gi(actor_did)
     if gi < GI_FLOOR:
         raise ValueError(f"GI below floor ({gi:.3f} < {GI_FLOOR})")
+
+
+async def close_client():
+    """Close the shared GI indexer client (call on application shutdown)."""
+    await _client.aclose()
@@ -0,0 +1,33 @@
+"""Pooled outbound HTTP clients shared across requests."""
+import asyncio
+from typing import Optional
+
+import httpx
+
+
+class PooledClient:
+    """
+    Lazily created httpx.AsyncClient reused by every call on the same event loop.
+
+    A client's connections belong to the loop that opened them, so a new
+    client is created if the running loop changes (e.g. between test runs).
+    """
+
+    def __init__(self, **client_kwargs):
+        self._client_kwargs = client_kwargs
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(**self._client_kwargs)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self):
+        """Close the client (call on application shutdown)."""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
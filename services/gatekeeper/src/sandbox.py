@@ -1,89 +1,255 @@
 """Sandbox execution environment for untrusted code."""
+import atexit
+import json
+import os
+import queue
+import select
+import signal
 import subprocess
+import sys
 import tempfile
-import os
-import json
-import resource
-from typing import Dict
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from .sandbox_worker import wipe
 
 # Resource limits
 MAX_CPU_TIME = 2  # seconds
+MAX_WALL_TIME = float(os.getenv("SANDBOX_WALL_TIME", str(MAX_CPU_TIME)))  # seconds
 MAX_MEMORY = 262144  # 256 MB in KB
+MAX_FILE_SIZE = 1048576  # bytes any single file (including captured output) may grow to
 MAX_OUTPUT_SIZE = 2048  # bytes
 
+# Warm worker pool
+SANDBOX_WORKERS = int(os.getenv("SANDBOX_WORKERS", "4"))
+SANDBOX_QUEUE_SIZE = int(os.getenv("SANDBOX_QUEUE_SIZE", "32"))
+SANDBOX_SCRATCH_ROOT = os.getenv(
+    "SANDBOX_SCRATCH_ROOT", os.path.join(tempfile.gettempdir(), "gatekeeper-sandbox")
+)
+
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+# Grace period on top of the wall-time limit before a worker is presumed hung
+_WORKER_GRACE = 5.0
+
+
+class SandboxBusy(Exception):
+    """Raised when the sandbox queue is full and the caller should back off."""
+
+
+def _error_result(message: str) -> Dict:
+    return {"rc": -1, "stdout": "", "stderr": message, "sandboxed": True}
+
+
+class _Worker:
+    """One long-lived sandbox_worker.py process with its own scratch directory."""
+
+    def __init__(self, scratch_dir: str):
+        self.scratch_dir = scratch_dir
+        self.proc: Optional[subprocess.Popen] = None
+        self.runs = 0
+        self._buffer = b""
+
+    def start(self):
+        self._buffer = b""
+        self.proc = subprocess.Popen(
+            [sys.executable, _WORKER_SCRIPT, self.scratch_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def _readline(self, deadline: float) -> Optional[Dict]:
+        """Next JSON line from the worker, or None on EOF or once deadline passes."""
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def _abort(self, pgid: Optional[int]):
+        """Kill a hung worker and the script it started, and reset the scratch directory."""
+        if pgid is not None:
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.proc.kill()
+        self.proc.wait()
+        self.proc = None
+        try:
+            wipe(self.scratch_dir)
+        except OSError:
+            pass  # the restarted worker wipes it again on startup
+
+    def run(self, job: Dict) -> Dict:
+        """Send one job and wait for its result, restarting the worker if it fails."""
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+        deadline = time.monotonic() + job["wall_seconds"] + _WORKER_GRACE
+        pgid = None
+        error = "Sandbox error: worker did not respond"
+        try:
+            self.proc.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+            self.proc.stdin.flush()
+            message = self._readline(deadline)
+            if message is not None and "pgid" in message:
+                pgid = message["pgid"]
+                message = self._readline(deadline)
+        except (OSError, ValueError) as e:
+            message = None
+            error = f"Sandbox error: {str(e)}"
+        if message is None:
+            self._abort(pgid)
+            return _error_result(error)
+        self.runs += 1
+        return message
+
+
+class SandboxPool:
+    """
+    Pool of pre-started sandbox workers fed from a bounded queue.
+
+    Each worker owns a scratch directory that is wiped between runs and
+    applies rlimits only to the child it forks for a script, so the API
+    process itself is never limited. When ``queue_size`` jobs are already
+    waiting, ``submit`` raises SandboxBusy instead of queueing more work.
+    """
+
+    def __init__(
+        self,
+        workers: int = SANDBOX_WORKERS,
+        queue_size: int = SANDBOX_QUEUE_SIZE,
+        scratch_root: str = SANDBOX_SCRATCH_ROOT,
+    ):
+        os.makedirs(scratch_root, mode=0o700, exist_ok=True)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._workers: List[_Worker] = []
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        for i in range(workers):
+            worker = _Worker(os.path.join(scratch_root, f"worker-{os.getpid()}-{i}"))
+            worker.start()
+            thread = threading.Thread(target=self._serve, args=(worker,), daemon=True)
+            thread.start()
+            self._workers.append(worker)
+            self._threads.append(thread)
+
+    def _serve(self, worker: _Worker):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                worker.stop()
+                return
+            job, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(worker.run(job))
+            except Exception as e:
+                future.set_result(_error_result(f"Sandbox error: {str(e)}"))
+
+    def submit(self, script: str) -> "Future[Dict]":
+        """Queue a script; the future resolves to the result dictionary."""
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+        job = {
+            "script": script,
+            "cpu_seconds": MAX_CPU_TIME,
+            "memory_kb": MAX_MEMORY,
+            "wall_seconds": MAX_WALL_TIME,
+            "max_file_bytes": MAX_FILE_SIZE,
+            "max_output": MAX_OUTPUT_SIZE,
+        }
+        future: "Future[Dict]" = Future()
+        try:
+            self._queue.put_nowait((job, future))
+        except queue.Full:
+            raise SandboxBusy("Sandbox queue is full")
+        return future
+
+    def run(self, script: str) -> Dict:
+        """Run a script and wait for its result."""
+        return self.submit(script).result()
+
+    def stats(self) -> Dict:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize(),
+            "runs": sum(worker.runs for worker in self._workers),
+        }
+
+    def close(self):
+        """Stop every worker once the queued jobs have run."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SandboxPool:
+    """Return the process-wide sandbox pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def close_pool():
+    """Stop the process-wide sandbox pool (call on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
 def run_in_sandbox(script: str) -> Dict:
     """
     Execute script in a sandboxed environment with resource limits.
-    
+
     Args:
         script: Script content to execute
-        
+
     Returns:
-        Dictionary with execution results
-        
+        Dictionary with execution results, including a "usage" entry with
+        CPU seconds, peak RSS and wall time of the run
+
+    Raises:
+        SandboxBusy: If the sandbox queue is full
+
     Note:
         In production, use nsjail, gVisor, or container isolation
-        instead of basic ulimit/timeout
+        instead of basic rlimits
     """
-    # Write script to temporary file
-    with tempfile.TemporaryDirectory() as tmpdir:
-        script_path = os.path.join(tmpdir, "task.sh")
-        
-        # Write script with shebang
-        with open(script_path, "w") as f:
-            f.write("#!/bin/bash\n")
-            f.write(script)
-        
-        # Make executable
-        os.chmod(script_path, 0o755)
-        
-        # Set resource limits
-        try:
-            resource.setrlimit(resource.RLIMIT_CPU, (MAX_CPU_TIME, MAX_CPU_TIME))
-            resource.setrlimit(resource.RLIMIT_AS, (MAX_MEMORY * 1024, MAX_MEMORY * 1024))
-        except Exception:
-            # Limits may not be settable in all environments
-            pass
-        
-        # Execute with timeout and no network (via environment)
-        env = os.environ.copy()
-        env["PATH"] = "/usr/bin:/bin"  # Minimal PATH
-        env["NETWORK"] = "0"  # Flag to disable network
-        
-        try:
-            proc = subprocess.run(
-                ["bash", "-c", f"ulimit -t {MAX_CPU_TIME} -v {MAX_MEMORY}; timeout {MAX_CPU_TIME}s {script_path}"],
-                capture_output=True,
-                text=True,
-                timeout=MAX_CPU_TIME + 1,
-                env=env,
-                cwd=tmpdir,
-            )
-            
-            # Truncate output to prevent exfiltration
-            stdout = proc.stdout[-MAX_OUTPUT_SIZE:] if proc.stdout else ""
-            stderr = proc.stderr[-MAX_OUTPUT_SIZE:] if proc.stderr else ""
-            
-            return {
-                "rc": proc.returncode,
-                "stdout": stdout,
-                "stderr": stderr,
-                "sandboxed": True,
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                "rc": -1,
-                "stdout": "",
-                "stderr": "Execution timeout",
-                "sandboxed": True,
-            }
-        except Exception as e:
-            return {
-                "rc": -1,
-                "stdout": "",
-                "stderr": f"Sandbox error: {str(e)}",
-                "sandboxed": True,
-            }
+    return get_pool().run(script)
 
 def validate_script_safety(script: str) -> tuple[bool, str]:
     """
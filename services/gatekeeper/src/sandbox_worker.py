@@ -0,0 +1,152 @@
+"""Long-lived sandbox worker process.
+
+Started by ``SandboxPool`` as ``python sandbox_worker.py <scratch_dir>``. It
+reads one JSON job per line on stdin, runs the script in a child process
+with resource limits applied in that child only, and writes one JSON result
+per line on stdout. Before waiting on the script it writes a
+``{"pgid": ...}`` line naming the script's process group, so the pool can
+kill it if this worker stops responding. The scratch directory is reused
+and wiped between runs.
+"""
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+
+def _limit_child(cpu_seconds: int, memory_kb: int, max_file_bytes: int):
+    """Return a preexec_fn applying rlimits to the forked child."""
+    def apply():
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+        resource.setrlimit(resource.RLIMIT_AS, (memory_kb * 1024, memory_kb * 1024))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (max_file_bytes, max_file_bytes))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    return apply
+
+
+def wipe(scratch_dir: str):
+    """Empty scratch_dir, even if the script removed permissions inside it."""
+    os.chmod(scratch_dir, 0o700)
+    for root, dirs, _ in os.walk(scratch_dir):
+        for name in dirs:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                os.chmod(path, 0o700)
+    shutil.rmtree(scratch_dir)
+    os.makedirs(scratch_dir, mode=0o700)
+
+
+def _tail(handle, limit: int) -> str:
+    handle.seek(0, os.SEEK_END)
+    size = handle.tell()
+    handle.seek(max(0, size - limit))
+    data = handle.read(limit)
+    handle.seek(0)
+    handle.truncate()
+    return data.decode("utf-8", errors="replace")
+
+
+def run_job(job: Dict, scratch_dir: str, stdout_file, stderr_file) -> Dict:
+    """Run one script and return its result with resource accounting."""
+    script_path = os.path.join(scratch_dir, "task.sh")
+    with open(script_path, "w") as f:
+        f.write("#!/bin/bash\n")
+        f.write(job["script"])
+    os.chmod(script_path, 0o755)
+
+    env = os.environ.copy()
+    env["PATH"] = "/usr/bin:/bin"  # Minimal PATH
+    env["NETWORK"] = "0"  # Flag to disable network
+
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        ["/bin/bash", script_path],
+        stdin=subprocess.DEVNULL,
+        stdout=stdout_file,
+        stderr=stderr_file,
+        cwd=scratch_dir,
+        env=env,
+        start_new_session=True,
+        preexec_fn=_limit_child(job["cpu_seconds"], job["memory_kb"], job["max_file_bytes"]),
+    )
+
+    # Tell the pool which process group to kill should this worker hang
+    sys.stdout.write(json.dumps({"pgid": proc.pid}) + "\n")
+    sys.stdout.flush()
+
+    # The worker is single-threaded (preexec_fn is only fork-safe without
+    # threads), so the wall-clock deadline is an interval timer
+    timed_out = False
+
+    def kill_on_deadline(signum, frame):
+        nonlocal timed_out
+        timed_out = True
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    signal.signal(signal.SIGALRM, kill_on_deadline)
+    signal.setitimer(signal.ITIMER_REAL, job["wall_seconds"])
+    try:
+        _, status, usage = os.wait4(proc.pid, 0)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    wall_seconds = time.monotonic() - started
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    # Reap anything the script left running in the background
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+    stdout = _tail(stdout_file, job["max_output"])
+    stderr = _tail(stderr_file, job["max_output"])
+    rc = proc.returncode
+    if timed_out:
+        rc, stdout, stderr = -1, "", "Execution timeout"
+
+    return {
+        "rc": rc,
+        "stdout": stdout,
+        "stderr": stderr,
+        "sandboxed": True,
+        "usage": {
+            "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 6),
+            "user_seconds": round(usage.ru_utime, 6),
+            "system_seconds": round(usage.ru_stime, 6),
+            "max_rss_kb": usage.ru_maxrss,
+            "wall_seconds": round(wall_seconds, 6),
+            "timed_out": timed_out,
+        },
+    }
+
+
+def main(scratch_dir: str):
+    os.makedirs(scratch_dir, mode=0o700, exist_ok=True)
+    wipe(scratch_dir)
+    # Output is captured in files outside the scratch dir so scripts cannot
+    # tamper with it and RLIMIT_FSIZE bounds how much they can write
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        for line in sys.stdin:
+            try:
+                result = run_job(json.loads(line), scratch_dir, stdout_file, stderr_file)
+            except Exception as e:
+                result = {"rc": -1, "stdout": "", "stderr": f"Sandbox error: {str(e)}", "sandboxed": True}
+            try:
+                wipe(scratch_dir)
+            except OSError as e:
+                result["stderr"] = f"{result['stderr']}\nSandbox cleanup error: {str(e)}"
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
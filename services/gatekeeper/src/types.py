@@ -20,3 +20,4 @@ class ExecResponse(BaseModel):
     status: Literal["ok", "blocked"]
     attestation_tx: Optional[str] = Field(None, description="Transaction hash of the attestation")
     result_preview: Optional[str] = Field(None, description="Preview of the execution result")
+    usage: Optional[dict] = Field(None, description="CPU, memory and wall-time accounting of a sandboxed run")
@@ -42,3 +42,37 @@ def test_execute_invalid_signature():
         }
     )
     assert response.status_code == 401
+
+def test_execute_valid_signature_checks_gi_floor():
+    """A valid hex-encoded DID signature passes and the cached GI floor applies."""
+    import json
+    from unittest.mock import patch
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+    from src import gi_client
+    from src.auth import did_keys
+    from src.types import ExecRequest
+
+    private_key = Ed25519PrivateKey.generate()
+    pub_hex = private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw).hex()
+    body = {
+        "actor_did": "did:key:signed",
+        "action": "http_request",
+        "risk": "low",
+        "payload": {},
+        "context_hash": "abc123",
+    }
+    signed = json.dumps(ExecRequest(**body).model_dump(), sort_keys=True).encode()
+    headers = {"x-did-sig": private_key.sign(signed).hex(), "x-did-pub": pub_hex}
+
+    async def low_gi(actor_did):
+        return 0.5
+
+    gi_client.gi_cache.clear()
+    with patch.object(gi_client, "fetch_gi", new=low_gi):
+        misses = did_keys.misses
+        for _ in range(2):
+            response = client.post("/execute", json=body, headers=headers)
+            assert response.status_code == 403
+            assert "Integrity floor" in response.json()["detail"]
+    assert did_keys.misses == misses + 1
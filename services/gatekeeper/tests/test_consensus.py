@@ -1,6 +1,11 @@
 """Tests for DelibProof consensus."""
+import asyncio
+import time
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch
+from src import consensus
 from src.consensus import delibproof_consensus, get_consensus_details
 
 @pytest.mark.asyncio
@@ -39,3 +44,52 @@ async def test_consensus_details():
         details = await get_consensus_details({"test": "data"})
         assert "votes" in details
         assert "consensus_reached" in details
+
+def _sentinel_response(approval: float) -> httpx.Response:
+    return httpx.Response(200, json={"approval": approval}, request=httpx.Request("POST", "https://s"))
+
+@pytest.mark.asyncio
+async def test_consensus_stops_early_on_veto():
+    """A single veto decides the outcome without waiting for slow sentinels."""
+    consensus.clear_cache()
+
+    async def post(self, url, json):
+        if url == consensus.SENTINELS[0]:
+            return _sentinel_response(0.1)
+        await asyncio.sleep(5)
+        return _sentinel_response(0.95)
+
+    with patch("httpx.AsyncClient.post", new=post):
+        started = time.monotonic()
+        details = await consensus.evaluate_consensus({"test": "veto"})
+    assert time.monotonic() - started < 1
+    assert details["consensus_reached"] is False
+    assert details["decided_early"] is True
+    assert [v["status"] for v in details["votes"]] == ["ok", "skipped", "skipped", "skipped"]
+
+@pytest.mark.asyncio
+async def test_consensus_polls_concurrently_and_caches_by_payload():
+    """Sentinels are polled in parallel and identical payloads reuse the decision."""
+    consensus.clear_cache()
+    calls = []
+
+    async def post(self, url, json):
+        calls.append(url)
+        await asyncio.sleep(0.2)
+        return _sentinel_response(0.95)
+
+    with patch("httpx.AsyncClient.post", new=post):
+        started = time.monotonic()
+        first, concurrent = await asyncio.gather(
+            consensus.evaluate_consensus({"b": 2, "a": 1}),
+            consensus.evaluate_consensus({"a": 1, "b": 2}),
+        )
+        elapsed = time.monotonic() - started
+        again = await consensus.evaluate_consensus({"a": 1, "b": 2})
+        approved = await delibproof_consensus({"a": 1, "b": 2})
+
+    assert elapsed < 0.6
+    assert len(calls) == len(consensus.SENTINELS)
+    assert first["consensus_reached"] is True and first["cached"] is False
+    assert concurrent["cached"] is True and again["cached"] is True
+    assert approved is True
@@ -0,0 +1,67 @@
+"""Tests for the cached GI client."""
+import asyncio
+import pytest
+from unittest.mock import patch
+from src import gi_client
+from src.gi_client import GICache
+
+@pytest.mark.asyncio
+async def test_gi_cache_ttl_and_stale_while_revalidate():
+    """Fresh scores are hits; stale ones are served while a refresh runs."""
+    scores = iter([0.97, 0.5])
+    calls = []
+
+    async def fetch(actor_did):
+        calls.append(actor_did)
+        return next(scores)
+
+    cache = GICache(ttl=0.05, stale=1.0)
+    with patch.object(gi_client, "fetch_gi", new=fetch):
+        assert await cache.get("did:key:a") == 0.97
+        assert await cache.get("did:key:a") == 0.97
+        await asyncio.sleep(0.06)
+        assert await cache.get("did:key:a") == 0.97  # stale, refresh scheduled
+        await asyncio.sleep(0.01)
+        assert await cache.get("did:key:a") == 0.5
+
+    assert calls == ["did:key:a", "did:key:a"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (2, 1, 1)
+
+@pytest.mark.asyncio
+async def test_gi_cache_shares_misses_and_skips_errors():
+    """Concurrent misses make one call; failures fail closed and are not cached."""
+    calls = []
+
+    async def fetch(actor_did):
+        calls.append(actor_did)
+        await asyncio.sleep(0.05)
+        return None
+
+    cache = GICache(ttl=10, stale=10)
+    with patch.object(gi_client, "fetch_gi", new=fetch):
+        results = await asyncio.gather(*(cache.get("did:key:b") for _ in range(5)))
+        assert results == [0.0] * 5
+        assert len(calls) == 1
+        await cache.get("did:key:b")
+    assert len(calls) == 2
+    assert cache.stats()["errors"] == 2
+
+@pytest.mark.asyncio
+async def test_gi_cache_cancelled_caller_does_not_fail_others():
+    """Cancelling the caller that started a fetch leaves other waiters with the score."""
+    async def fetch(actor_did):
+        await asyncio.sleep(0.05)
+        return 0.99
+
+    cache = GICache(ttl=10, stale=10)
+    with patch.object(gi_client, "fetch_gi", new=fetch):
+        first = asyncio.create_task(cache.get("did:key:c"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get("did:key:c"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == 0.99
+        with pytest.raises(asyncio.CancelledError):
+            await first
+    assert cache.stats()["size"] == 1
@@ -1,6 +1,11 @@
 """Tests for sandbox execution."""
+import os
+import signal
+import time
+
 import pytest
-from src.sandbox import run_in_sandbox, validate_script_safety
+from src import sandbox
+from src.sandbox import SandboxBusy, SandboxPool, run_in_sandbox, validate_script_safety
 
 def test_sandbox_safe_script():
     """Test sandbox execution of safe script."""
@@ -24,3 +29,72 @@ def test_sandbox_validate_eval():
     """Test script validation rejects eval patterns."""
     is_safe, reason = validate_script_safety("python -c 'eval(\"bad\")'")
     assert is_safe == False
+
+def test_sandbox_reports_usage_and_wipes_scratch():
+    """Runs report resource accounting and never see earlier runs' files."""
+    first = run_in_sandbox("touch leftover; ls")
+    second = run_in_sandbox("ls")
+    assert "leftover" in first["stdout"]
+    assert "leftover" not in second["stdout"]
+    usage = second["usage"]
+    assert usage["timed_out"] is False
+    assert usage["wall_seconds"] > 0
+    assert usage["max_rss_kb"] > 0
+
+def test_sandbox_wall_time_limit():
+    """Scripts that outlive the wall-time limit are killed."""
+    result = run_in_sandbox("sleep 30")
+    assert result["rc"] == -1
+    assert result["usage"]["timed_out"] is True
+
+def test_sandbox_pool_backpressure(tmp_path):
+    """A full queue rejects new work instead of growing without bound."""
+    pool = SandboxPool(workers=1, queue_size=1, scratch_root=str(tmp_path))
+    try:
+        futures = []
+        with pytest.raises(SandboxBusy):
+            for _ in range(5):
+                futures.append(pool.submit("sleep 0.3"))
+        assert all(f.result()["rc"] == 0 for f in futures)
+    finally:
+        pool.close()
+
+def test_hung_worker_takes_its_script_down(tmp_path, monkeypatch):
+    """A worker that stops responding is killed along with the script's process group."""
+    monkeypatch.setattr(sandbox, "_WORKER_GRACE", 0.5)
+    worker = sandbox._Worker(str(tmp_path / "worker"))
+    worker.start()
+    seen = {}
+    readline = worker._readline
+
+    def stall_after_pgid(deadline):
+        message = readline(deadline)
+        if message and "pgid" in message:
+            seen["pgid"] = message["pgid"]
+            # A stopped worker can no longer enforce the wall-time limit itself
+            os.kill(worker.proc.pid, signal.SIGSTOP)
+        return message
+
+    monkeypatch.setattr(worker, "_readline", stall_after_pgid)
+    job = {
+        "script": "touch leftover; sleep 30",
+        "cpu_seconds": 2,
+        "memory_kb": sandbox.MAX_MEMORY,
+        "wall_seconds": 0.5,
+        "max_file_bytes": sandbox.MAX_FILE_SIZE,
+        "max_output": sandbox.MAX_OUTPUT_SIZE,
+    }
+    result = worker.run(job)
+    assert result["rc"] == -1
+    assert worker.proc is None
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.killpg(seen["pgid"], 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("script process group survived its worker")
+    assert os.listdir(worker.scratch_dir) == []
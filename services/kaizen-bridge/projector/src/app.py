@@ -1,19 +1,83 @@
-from fastapi import FastAPI
-import torch
-from .io_types import ProjectRequest, ProjectResponse
-from .registry import get_projector
-from .model import b64_to_tensor, tensor_to_packet_like
+import asyncio
+import base64
+import json
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
+from .io_types import KVCachePacket, ProjectRequest, ProjectResponse, BatchProjectRequest, BatchProjectResponse
+from .registry import get_batcher, get_spec, batcher_stats, preload
+from .model import bytes_to_tensor, tensor_to_bytes, projected_shape
+from .wire import MEDIA_TYPE, decode_frame, encode_frame
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Build every configured projector before serving so first requests are not slow
+    if os.getenv("PROJECTOR_PRELOAD", "1") != "0":
+        await asyncio.to_thread(preload)
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/health")
 def health(): return {"status":"ok", "service":"kaizen-bridge-projector"}
 
+@app.get("/stats")
+def stats(): return batcher_stats()
+
+async def _project_many(name, metas, buffers):
+    """Project raw packet buffers through the projector's micro-batcher; returns (meta, bytes) pairs."""
+    try:
+        spec = get_spec(name)
+        # Building a projector is slow; keep it off the event loop
+        batcher = get_batcher(name, build=False) or await asyncio.to_thread(get_batcher, name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown projector: {name}")
+    try:
+        xs = [bytes_to_tensor(buf, meta["dtype"], spec["in_dim"]) for meta, buf in zip(metas, buffers)]
+    except (ValueError, RuntimeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    ys = await asyncio.gather(*(batcher.project(x) for x in xs))
+    out = []
+    for meta, y in zip(metas, ys):
+        pkt = dict(meta)
+        pkt["shape"] = projected_shape(meta.get("shape"), y.shape[0], y.shape[1])
+        out.append((pkt, tensor_to_bytes(y, meta["dtype"])))
+    return out
+
 @app.post("/project", response_model=ProjectResponse)
-def project(req: ProjectRequest):
-    proj = get_projector(req.projector)
-    x = b64_to_tensor(req.packet.dict())
-    with torch.no_grad():
-        y = proj(x)
-    projected = tensor_to_packet_like(y, req.packet.dict())
+async def project(req: ProjectRequest):
+    packet = req.packet.dict()
+    [(pkt, raw)] = await _project_many(req.projector, [packet], [base64.b64decode(packet["bytes_b64"])])
+    pkt["bytes_b64"] = base64.b64encode(raw).decode("utf-8")
+    return {"projected": pkt}
+
+@app.post("/project/batch", response_model=BatchProjectResponse)
+async def project_batch(request: Request):
+    """Project many packets per call.
+
+    JSON bodies use BatchProjectRequest; application/octet-stream bodies use
+    the binary frame from wire.py (no base64) and get a frame back.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith(MEDIA_TYPE):
+        try:
+            header, buffers = decode_frame(body)
+            name = header["projector"]
+            metas = [KVCachePacket(**{**m, "bytes_b64": ""}).dict(exclude={"bytes_b64"}) for m in header["packets"]]
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Bad frame: {e}")
+        results = await _project_many(name, metas, buffers)
+        frame = encode_frame({"projector": name, "packets": [pkt for pkt, _ in results]}, [raw for _, raw in results])
+        return Response(content=frame, media_type=MEDIA_TYPE)
+
+    try:
+        req = BatchProjectRequest(**json.loads(body))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    metas = [p.dict() for p in req.packets]
+    results = await _project_many(req.projector, metas, [base64.b64decode(m["bytes_b64"]) for m in metas])
+    projected = []
+    for pkt, raw in results:
+        pkt["bytes_b64"] = base64.b64encode(raw).decode("utf-8")
+        projected.append(pkt)
     return {"projected": projected}
@@ -0,0 +1,108 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+MAX_BATCH_ROWS = int(os.getenv("PROJECTOR_MAX_BATCH_ROWS", "64"))
+MAX_WAIT_MS = float(os.getenv("PROJECTOR_MAX_WAIT_MS", "2"))
+
+
+class MicroBatcher:
+    """Coalesces concurrent projection calls for one projector into batched forward passes.
+
+    Callers submit [rows, in_dim] tensors; the first waiting call opens a
+    batch that closes after max_rows rows or max_wait_ms, whichever comes
+    first. Forward passes run one at a time on a dedicated thread so torch's
+    intra-op threads are not oversubscribed and the event loop stays free.
+
+    close() lets queued work finish and then stops the worker; a later call
+    to project() simply starts a new one.
+    """
+
+    def __init__(self, module, compute_dtype=torch.float32, max_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS):
+        self.module = module
+        self.compute_dtype = compute_dtype
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._worker = None
+        self.batches = 0
+        self.rows = 0
+
+    async def project(self, x):
+        """Project x ([rows, in_dim]); returns [rows, out_dim] in the compute dtype."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        fut = loop.create_future()
+        await self._queue.put((x, fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="projector")
+        closing = False
+        try:
+            # After close() the queue is drained before the worker exits, so
+            # nothing submitted before the worker finishes is left behind
+            while not (closing and self._queue.empty()):
+                first = await self._queue.get()
+                if first is None:
+                    closing = True
+                    continue
+                batch = [first]
+                rows = first[0].shape[0]
+                deadline = loop.time() + self.max_wait
+                while rows < self.max_rows:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+                    rows += item[0].shape[0]
+                await self._dispatch(loop, executor, batch)
+        finally:
+            executor.shutdown(wait=False)
+
+    async def _dispatch(self, loop, executor, batch):
+        live = [(x, fut) for x, fut in batch if not fut.cancelled()]
+        if not live:
+            return
+        try:
+            outputs = await loop.run_in_executor(executor, self._forward, [x for x, _ in live])
+        except Exception as e:
+            for _, fut in live:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), y in zip(live, outputs):
+            if not fut.done():
+                fut.set_result(y)
+
+    def _forward(self, xs):
+        batch = torch.cat([x.to(self.compute_dtype) for x in xs]) if len(xs) > 1 else xs[0].to(self.compute_dtype)
+        with torch.inference_mode():
+            y = self.module(batch)
+        self.batches += 1
+        self.rows += batch.shape[0]
+        return torch.split(y, [x.shape[0] for x in xs])
+
+    def stats(self):
+        return {"batches": self.batches, "rows": self.rows, "dtype": str(self.compute_dtype).replace("torch.", "")}
+
+    def close(self):
+        """Stop the worker once queued work is done; safe to call from any thread."""
+        worker = self._worker
+        if worker is None or worker.done():
+            return
+        loop = worker.get_loop()
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._queue.put_nowait, None)
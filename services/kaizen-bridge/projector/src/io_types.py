@@ -16,3 +16,10 @@ class ProjectRequest(BaseModel):
 
 class ProjectResponse(BaseModel):
     projected: KVCachePacket
+
+class BatchProjectRequest(BaseModel):
+    projector: str
+    packets: List[KVCachePacket]
+
+class BatchProjectResponse(BaseModel):
+    projected: List[KVCachePacket]
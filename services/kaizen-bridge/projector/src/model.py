@@ -1,10 +1,23 @@
 import torch
 import base64
+import functools
 import numpy as np
 import os
 import json
+import logging
+import struct
+import time
+import warnings
 import yaml
 
+logger = logging.getLogger(__name__)
+
+# Wire dtypes; anything else is read as float32 like the original packets
+WIRE_DTYPES = {"float16": torch.float16, "bfloat16": torch.bfloat16, "float32": torch.float32}
+
+# Request bodies are read-only; projection never writes into its input
+warnings.filterwarnings("ignore", message="The given buffer is not writable")
+
 class MLPProjector(torch.nn.Module):
     def __init__(self, in_dim, out_dim, hidden):
         super().__init__()
@@ -17,15 +30,146 @@ class MLPProjector(torch.nn.Module):
     def forward(self, x):  # x: [N, D]
         return self.net(x)
 
+# safetensors dtype codes -> (numpy storage dtype, torch dtype)
+_ST_DTYPES = {
+    "F64": (np.float64, torch.float64), "F32": (np.float32, torch.float32),
+    "F16": (np.float16, torch.float16), "BF16": (np.uint16, torch.bfloat16),
+    "I64": (np.int64, torch.int64), "I32": (np.int32, torch.int32),
+    "I16": (np.int16, torch.int16), "I8": (np.int8, torch.int8),
+    "U8": (np.uint8, torch.uint8), "BOOL": (np.bool_, torch.bool),
+}
+_ST_CODES = {t: code for code, (_, t) in _ST_DTYPES.items()}
+
+def load_safetensors(path):
+    """Tensors of a .safetensors file, memory-mapped rather than read into memory.
+
+    Uses the safetensors package when installed and a numpy memmap reader otherwise.
+    """
+    try:
+        from safetensors.torch import load_file
+    except ImportError:
+        load_file = None
+    if load_file is not None:
+        return load_file(path)
+
+    with open(path, "rb") as f:
+        (head_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(head_len))
+    header.pop("__metadata__", None)
+    # Copy-on-write mapping: pages are shared with the page cache and never written back
+    data = np.memmap(path, dtype=np.uint8, mode="c", offset=8 + head_len)
+    tensors = {}
+    for name, info in header.items():
+        np_dtype, torch_dtype = _ST_DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        arr = data[begin:end].view(np_dtype).reshape(info["shape"])
+        t = torch.from_numpy(arr)
+        tensors[name] = t.view(torch_dtype) if torch_dtype is torch.bfloat16 else t
+    return tensors
+
+def save_safetensors(tensors, path):
+    """Write tensors in the safetensors layout (8-byte header length, JSON header, raw data)."""
+    header, blobs, offset = {}, [], 0
+    for name, t in tensors.items():
+        raw = t.detach().cpu().contiguous().view(torch.uint8).numpy().tobytes()
+        header[name] = {"dtype": _ST_CODES[t.dtype], "shape": list(t.shape), "data_offsets": [offset, offset + len(raw)]}
+        blobs.append(raw)
+        offset += len(raw)
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    head += b" " * (-len(head) % 8)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(head)))
+        f.write(head)
+        for raw in blobs:
+            f.write(raw)
+
+def optimize(module, mode, in_dim, dtype=torch.float32):
+    """Prepare an eval-mode module for CPU inference.
+
+    mode is "none", "torchscript" (trace + freeze), "compile" (torch.compile)
+    or "int8" (dynamic quantization of Linear layers; fp32 inputs). Falls back
+    to the eager module if the backend is unavailable.
+    """
+    mode = (mode or "none").lower()
+    if mode == "none":
+        return module
+    try:
+        if mode == "int8":
+            return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+        if mode == "torchscript":
+            with torch.no_grad():
+                return torch.jit.freeze(torch.jit.trace(module, torch.zeros(2, in_dim, dtype=dtype)))
+        if mode == "compile":
+            return torch.compile(module, dynamic=True)
+    except Exception as e:
+        logger.warning("projector %s optimization unavailable, running eager: %s", mode, e)
+        return module
+    raise ValueError(f"unknown projector optimization: {mode}")
+
 def load_cfg(path="bridge_config.yaml"):
     with open(path, "r") as f:
         return yaml.safe_load(f)
 
+def wire_dtype(name):
+    return WIRE_DTYPES.get(name, torch.float32)
+
+def _forward_seconds(in_dim, hidden, dtype, rows=64, repeats=5):
+    """Best-of-repeats time for one forward pass of a Linear in dtype."""
+    layer = torch.nn.Linear(in_dim, hidden).to(dtype)
+    x = torch.zeros(rows, in_dim, dtype=dtype)
+    best = float("inf")
+    with torch.inference_mode():
+        layer(x)  # warm-up
+        for _ in range(repeats):
+            started = time.perf_counter()
+            layer(x)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+@functools.lru_cache(maxsize=None)
+def _not_slower_than_fp32(dtype, in_dim, hidden):
+    try:
+        return _forward_seconds(in_dim, hidden, dtype) <= _forward_seconds(in_dim, hidden, torch.float32)
+    except (RuntimeError, TypeError):
+        return False
+
+def resolve_compute_dtype(in_dim=256, hidden=256):
+    """Compute dtype for projectors, float32 unless PROJECTOR_COMPUTE_DTYPE opts in.
+
+    The config "dtype" is only the wire format. An opted-in float16/bfloat16 is
+    used only if a Linear of the projector's size runs in it at least as fast
+    as in float32; CPUs without native half-precision kernels fall back to fp32.
+    """
+    dtype = WIRE_DTYPES.get(os.getenv("PROJECTOR_COMPUTE_DTYPE", "float32"), torch.float32)
+    if dtype is torch.float32:
+        return dtype
+    if not _not_slower_than_fp32(dtype, in_dim, hidden):
+        logger.info("%s is slower than float32 on this CPU; computing in float32", dtype)
+        return torch.float32
+    return dtype
+
+def bytes_to_tensor(buf, dtype, in_dim):
+    """Zero-copy [rows, in_dim] view of raw packet bytes (bytes, bytearray or memoryview)."""
+    flat = torch.frombuffer(buf, dtype=wire_dtype(dtype))
+    if flat.numel() % in_dim:
+        raise ValueError(f"packet holds {flat.numel()} values, not a multiple of in_dim {in_dim}")
+    return flat.view(-1, in_dim)
+
+def tensor_to_bytes(t, dtype):
+    """Raw bytes of t cast to the wire dtype."""
+    return t.to(wire_dtype(dtype)).contiguous().view(torch.uint8).numpy().tobytes()
+
+def projected_shape(shape, rows, out_dim):
+    """Input shape with its feature dim replaced by out_dim (or [rows, out_dim] if it does not fit)."""
+    shape = list(shape or [])
+    if shape and int(np.prod(shape[:-1])) == rows:
+        return shape[:-1] + [out_dim]
+    return [rows, out_dim]
+
 def b64_to_tensor(packet):
     buf = base64.b64decode(packet["bytes_b64"])
-    arr = np.frombuffer(buf, dtype=np.float16 if packet["dtype"]=="float16" else np.float32)
-    flat = arr.astype(np.float32)  # compute in fp32
-    return torch.from_numpy(flat).unsqueeze(0)
+    flat = torch.frombuffer(buf, dtype=wire_dtype(packet["dtype"]))
+    return flat.float().unsqueeze(0)  # compute in fp32
 
 def tensor_to_packet_like(t, like):
     out = t.squeeze(0).detach().cpu().numpy().astype(np.float16 if like["dtype"]=="float16" else np.float32)
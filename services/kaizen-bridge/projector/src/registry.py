@@ -1,21 +1,124 @@
-from .model import MLPProjector, load_cfg
+from .model import MLPProjector, load_cfg, load_safetensors, optimize, resolve_compute_dtype
+from .batching import MicroBatcher
+from collections import OrderedDict
+import logging
+import threading
 import torch
 import os
 
+logger = logging.getLogger(__name__)
+
+CFG_DIR = os.path.join(os.path.dirname(__file__), "..")
+MAX_PROJECTORS = int(os.getenv("PROJECTOR_CACHE_SIZE", "8"))
+WEIGHTS_DIR = os.getenv("PROJECTOR_WEIGHTS_DIR", "")
+OPTIMIZE = os.getenv("PROJECTOR_OPTIMIZE", "")  # overrides each spec's "optimize"
+
 _cfg = None
-_registry = {}
+_cfg_lock = threading.Lock()
+_lock = threading.Lock()
+_build_locks = {}
+_registry = OrderedDict()  # name -> (module, batcher), least recently used first
 
 def _ensure_cfg():
     global _cfg
-    if _cfg is None:
-        cfg_path = os.path.join(os.path.dirname(__file__), "..", "bridge_config.yaml")
-        _cfg = load_cfg(cfg_path)
+    with _cfg_lock:
+        if _cfg is None:
+            _cfg = load_cfg(os.path.join(CFG_DIR, "bridge_config.yaml"))
     return _cfg
 
-def get_projector(name:str):
-    if name in _registry: return _registry[name]
-    cfg = _ensure_cfg()
-    spec = cfg["projectors"][name]
+def get_spec(name:str):
+    return _ensure_cfg()["projectors"][name]
+
+def _weights_path(name, spec):
+    if spec.get("weights"):
+        return os.path.join(CFG_DIR, spec["weights"])
+    if WEIGHTS_DIR:
+        path = os.path.join(WEIGHTS_DIR, f"{name}.safetensors")
+        if os.path.exists(path):
+            return path
+    return None
+
+def _warm_up(module, in_dim, dtype):
+    """Run one dummy batch so lazy compilation and allocation happen before traffic."""
+    with torch.inference_mode():
+        module(torch.zeros(2, in_dim, dtype=dtype))
+
+def _build(name):
+    """Construct a projector: load weights, pick the compute dtype, optimize, warm up, wrap in a batcher.
+
+    Only the module in the compute dtype is kept. Weights stored in that dtype
+    are assigned straight from the memory-mapped file instead of copied into
+    fresh parameters; others are cast on load.
+    """
+    spec = get_spec(name)
+    mode = OPTIMIZE or spec.get("optimize", "none")
+    # Dynamic int8 quantization takes fp32 activations
+    dtype = torch.float32 if mode == "int8" else resolve_compute_dtype(spec["in_dim"], spec["hidden"])
+
     m = MLPProjector(spec["in_dim"], spec["out_dim"], spec["hidden"]).eval()
-    _registry[name] = m
-    return m
+    path = _weights_path(name, spec)
+    if path:
+        # Tensors already in the compute dtype stay aliased to the mapped file;
+        # the rest (e.g. fp16 weights computed in fp32) are cast
+        state = {k: v if v.dtype == dtype else v.to(dtype) for k, v in load_safetensors(path).items()}
+        m.load_state_dict(state, assign=True)
+    else:
+        logger.warning("projector %s has no weights file; using random initialization", name)
+        m = m.to(dtype)
+
+    compute = optimize(m, mode, spec["in_dim"], dtype)
+    try:
+        _warm_up(compute, spec["in_dim"], dtype)
+    except Exception as e:
+        if compute is m:
+            raise
+        logger.warning("projector %s %s optimization failed on warm-up, running eager: %s", name, mode, e)
+        compute = m
+    return compute, MicroBatcher(compute, dtype)
+
+def _entry(name, build=True):
+    """Registry entry for name, building it at most once even under concurrent first calls."""
+    with _lock:
+        if name in _registry:
+            _registry.move_to_end(name)
+            return _registry[name]
+        if not build:
+            return None
+        build_lock = _build_locks.setdefault(name, threading.Lock())
+
+    with build_lock:
+        with _lock:
+            if name in _registry:
+                _registry.move_to_end(name)
+                return _registry[name]
+        entry = _build(name)
+        with _lock:
+            _registry[name] = entry
+            evicted = []
+            while len(_registry) > MAX_PROJECTORS:
+                evicted.append(_registry.popitem(last=False))
+            _build_locks.pop(name, None)
+    for old_name, (_, batcher) in evicted:
+        logger.info("evicting projector %s", old_name)
+        batcher.close()
+    return entry
+
+def get_projector(name:str):
+    return _entry(name)[0]
+
+def get_batcher(name:str, build=True):
+    """Micro-batcher for a projector; with build=False, None unless it is already loaded."""
+    entry = _entry(name, build)
+    return entry[1] if entry else None
+
+def preload(names=None):
+    """Build projectors up front (all configured ones by default, up to the cache size)."""
+    names = list(names or _ensure_cfg()["projectors"])[:MAX_PROJECTORS]
+    for name in names:
+        _entry(name)
+    return names
+
+def batcher_stats():
+    with _lock:
+        entries = list(_registry.items())
+    return {name: batcher.stats() for name, (_, batcher) in entries}
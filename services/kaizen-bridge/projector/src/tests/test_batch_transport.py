@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from src.wire import MEDIA_TYPE, decode_frame, encode_frame
+
+TINY = {"type": "mlp", "in_dim": 8, "out_dim": 4, "hidden": 16, "dtype": "float32"}
+
+def _meta(dtype="float32", shape=(1, 4096)):
+    return {"model":"HERMES-LLM","layer":[20,21],"dtype":dtype,"shape":list(shape),"nonce":"x","ts":"2025-11-05T00:00:00Z"}
+
+def test_frame_roundtrip_is_aligned_and_zero_copy():
+    payloads = [np.random.randn(n).astype(np.float16).tobytes() for n in (3, 4096, 5)]
+    frame = encode_frame({"projector":"hermes_to_aurea_v1","packets":[_meta("float16") for _ in payloads]}, payloads)
+    header, views = decode_frame(frame)
+    assert header["projector"] == "hermes_to_aurea_v1"
+    assert [bytes(v) for v in views] == payloads
+    base = np.frombuffer(frame, dtype=np.uint8).ctypes.data
+    for v in views:
+        assert isinstance(v, memoryview)
+        assert (np.frombuffer(v, dtype=np.uint8).ctypes.data - base) % 8 == 0
+
+def test_frame_rejects_truncation():
+    frame = encode_frame({"projector":"p","packets":[_meta()]}, [b"\0" * 16])
+    with pytest.raises(ValueError):
+        decode_frame(frame[:-16])
+
+def _raw_frame(header, payload=b""):
+    head = json.dumps(header).encode("utf-8")
+    head += b" " * (-(8 + len(head)) % 8)
+    return struct.pack("<4sI", b"KVB1", len(head)) + head + payload
+
+@pytest.mark.parametrize("header", [
+    [{"nbytes": 8}],
+    {"projector": "p", "packets": {"nbytes": 8}},
+    {"projector": "p", "packets": [[8]]},
+    {"projector": "p", "packets": [{"nbytes": -8}]},
+    {"projector": "p", "packets": [{"nbytes": 1 << 62}]},
+])
+def test_frame_rejects_malformed_headers(header):
+    with pytest.raises(ValueError):
+        decode_frame(_raw_frame(header, b"\0" * 16))
+
+def test_frame_rejects_header_past_the_end():
+    frame = _raw_frame({"projector": "p", "packets": []})
+    with pytest.raises(ValueError):
+        decode_frame(frame[:-4])
+
+@pytest.fixture
+def client(monkeypatch):
+    pytest.importorskip("torch")
+    from fastapi.testclient import TestClient
+
+    from src import app as app_module
+    from src import registry
+
+    monkeypatch.setenv("PROJECTOR_PRELOAD", "0")
+    monkeypatch.delenv("PROJECTOR_COMPUTE_DTYPE", raising=False)
+    monkeypatch.setattr(registry, "OPTIMIZE", "")
+    monkeypatch.setattr(registry, "_cfg", {"projectors": {"tiny": dict(TINY)}})
+    monkeypatch.setattr(registry, "_registry", registry.OrderedDict())
+    yield TestClient(app_module.app)
+    for _, batcher in registry._registry.values():
+        batcher.close()
+
+def _expected(rows):
+    import torch
+
+    from src import registry
+
+    x = torch.from_numpy(rows)
+    with torch.inference_mode():
+        return registry.get_projector("tiny")(x).numpy()
+
+def test_json_batch_endpoint(client):
+    rows = [np.random.randn(n, 8).astype(np.float32) for n in (1, 3)]
+    packets = [
+        {**_meta("float32", r.shape), "bytes_b64": base64.b64encode(r.tobytes()).decode("utf-8")}
+        for r in rows
+    ]
+    resp = client.post("/project/batch", json={"projector": "tiny", "packets": packets})
+    assert resp.status_code == 200
+    projected = resp.json()["projected"]
+    assert [p["shape"] for p in projected] == [[1, 4], [3, 4]]
+    for r, p in zip(rows, projected):
+        y = np.frombuffer(base64.b64decode(p["bytes_b64"]), dtype=np.float32).reshape(-1, 4)
+        assert np.allclose(y, _expected(r), atol=1e-5)
+
+def test_binary_batch_endpoint(client):
+    rows = [np.random.randn(n, 8).astype(np.float16) for n in (2, 5)]
+    frame = encode_frame({"projector": "tiny", "packets": [_meta("float16", r.shape) for r in rows]},
+                         [r.tobytes() for r in rows])
+    resp = client.post("/project/batch", content=frame, headers={"content-type": MEDIA_TYPE})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(MEDIA_TYPE)
+    header, views = decode_frame(resp.content)
+    assert [m["shape"] for m in header["packets"]] == [[2, 4], [5, 4]]
+    for r, v in zip(rows, views):
+        y = np.frombuffer(v, dtype=np.float16).reshape(-1, 4)
+        assert np.allclose(y, _expected(r.astype(np.float32)), atol=1e-2)
+
+@pytest.mark.parametrize("body", [
+    b"nope",
+    _raw_frame([{"nbytes": 8}]),
+    _raw_frame({"projector": "tiny", "packets": [{**_meta(), "nbytes": -8}]}),
+    _raw_frame({"projector": "tiny", "packets": [{**_meta(), "nbytes": 1 << 40}]}),
+    _raw_frame({"packets": []}),
+])
+def test_binary_batch_rejects_bad_frames(client, body):
+    resp = client.post("/project/batch", content=body, headers={"content-type": MEDIA_TYPE})
+    assert resp.status_code == 400
+
+def test_batch_endpoint_rejects_wrong_sized_packets(client):
+    frame = encode_frame({"projector": "tiny", "packets": [_meta("float32", (1, 8))]}, [b"\0" * 12])
+    resp = client.post("/project/batch", content=frame, headers={"content-type": MEDIA_TYPE})
+    assert resp.status_code == 400
+
+def test_batch_endpoint_unknown_projector(client):
+    frame = encode_frame({"projector": "missing", "packets": [_meta("float32", (1, 8))]}, [b"\0" * 32])
+    resp = client.post("/project/batch", content=frame, headers={"content-type": MEDIA_TYPE})
+    assert resp.status_code == 404
+    packet = {**_meta("float32", (1, 8)), "bytes_b64": base64.b64encode(b"\0" * 32).decode("utf-8")}
+    resp = client.post("/project/batch", json={"projector": "missing", "packets": [packet]})
+    assert resp.status_code == 404
+
+def test_batched_projection_matches_single_packets():
+    torch = pytest.importorskip("torch")
+    from src.batching import MicroBatcher
+    from src.model import MLPProjector, bytes_to_tensor
+
+    module = MLPProjector(16, 8, 32).eval()
+    batcher = MicroBatcher(module, torch.float32, max_rows=64, max_wait_ms=20)
+    bufs = [np.random.randn(rows * 16).astype(np.float32).tobytes() for rows in (1, 3, 2)]
+    xs = [bytes_to_tensor(b, "float32", 16) for b in bufs]
+
+    async def run():
+        return await asyncio.gather(*(batcher.project(x) for x in xs))
+
+    ys = asyncio.run(run())
+    assert batcher.stats()["batches"] == 1
+    with torch.no_grad():
+        for x, y in zip(xs, ys):
+            assert torch.allclose(module(x.clone()), y, atol=1e-6)
+    batcher.close()
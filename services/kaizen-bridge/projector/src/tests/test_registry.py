@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src import registry  # noqa: E402
+from src.model import MLPProjector, load_safetensors, save_safetensors  # noqa: E402
+
+def test_safetensors_roundtrip_is_memory_mapped(tmp_path):
+    m = MLPProjector(8, 4, 16)
+    path = str(tmp_path / "p.safetensors")
+    save_safetensors(m.state_dict(), path)
+    loaded = load_safetensors(path)
+    assert loaded.keys() == m.state_dict().keys()
+    for name, t in m.state_dict().items():
+        assert torch.equal(loaded[name], t)
+
+def test_concurrent_first_calls_build_once(monkeypatch):
+    builds = []
+    real_build = registry._build
+
+    def counting_build(name):
+        builds.append(name)
+        return real_build(name)
+
+    monkeypatch.setattr(registry, "_build", counting_build)
+    monkeypatch.setattr(registry, "_registry", registry.OrderedDict())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get_projector("eve_to_jade_v1"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert builds == ["eve_to_jade_v1"]
+    assert all(r is results[0] for r in results)
+
+def test_lru_cap_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(registry, "_registry", registry.OrderedDict())
+    monkeypatch.setattr(registry, "MAX_PROJECTORS", 1)
+    registry.get_projector("eve_to_jade_v1")
+    registry.get_projector("hermes_to_aurea_v1")
+    assert registry.get_batcher("eve_to_jade_v1", build=False) is None
+    assert registry.get_batcher("hermes_to_aurea_v1", build=False) is not None
+
+def test_fp16_weights_are_cast_to_the_compute_dtype(tmp_path, monkeypatch):
+    m = MLPProjector(8, 4, 16).half()
+    path = str(tmp_path / "p.safetensors")
+    save_safetensors(m.state_dict(), path)
+    monkeypatch.delenv("PROJECTOR_COMPUTE_DTYPE", raising=False)
+    monkeypatch.setattr(registry, "OPTIMIZE", "")
+    monkeypatch.setattr(registry, "get_spec", lambda name: {"in_dim": 8, "out_dim": 4, "hidden": 16, "weights": path})
+    module, batcher = registry._build("fp16_weights")
+    try:
+        assert all(p.dtype == torch.float32 for p in module.parameters())
+        for name, t in module.state_dict().items():
+            assert torch.equal(t, m.state_dict()[name].float())
+    finally:
+        batcher.close()
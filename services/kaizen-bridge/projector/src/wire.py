@@ -0,0 +1,67 @@
+"""Binary framing for batched KV-cache packets (application/octet-stream).
+
+Frame layout, all integers little-endian:
+
+    b"KVB1" | u32 header_len | header (UTF-8 JSON, space-padded) | payloads
+
+The header is ``{"projector": ..., "packets": [meta, ...]}`` where each meta
+holds the KVCachePacket fields except ``bytes_b64`` plus ``nbytes``. Raw
+tensor bytes follow in packet order, each starting on an 8-byte boundary,
+so they can be viewed in place with ``torch.frombuffer``.
+"""
+import json
+import struct
+
+MAGIC = b"KVB1"
+MEDIA_TYPE = "application/octet-stream"
+ALIGN = 8
+_PREFIX = struct.Struct("<4sI")
+
+
+def _pad(n):
+    return -n % ALIGN
+
+
+def encode_frame(header, payloads):
+    """Build a frame from a header dict and one bytes-like payload per packet."""
+    packets = header["packets"]
+    if len(packets) != len(payloads):
+        raise ValueError("one payload per packet is required")
+    for meta, payload in zip(packets, payloads):
+        meta["nbytes"] = memoryview(payload).nbytes
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    head += b" " * _pad(_PREFIX.size + len(head))
+    parts = [_PREFIX.pack(MAGIC, len(head)), head]
+    for payload in payloads:
+        parts.append(payload)
+        parts.append(b"\0" * _pad(memoryview(payload).nbytes))
+    return b"".join(parts)
+
+
+def decode_frame(body):
+    """Split a frame into its header and zero-copy memoryviews of each payload."""
+    view = memoryview(body)
+    if len(view) < _PREFIX.size:
+        raise ValueError("frame too short")
+    magic, head_len = _PREFIX.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("bad frame magic")
+    offset = _PREFIX.size + head_len
+    if offset > len(view):
+        raise ValueError("frame truncated")
+    header = json.loads(bytes(view[_PREFIX.size:offset]))
+    if not isinstance(header, dict) or not isinstance(header.get("packets", []), list):
+        raise ValueError("frame header must be an object with a packets list")
+    payloads = []
+    for meta in header.get("packets", []):
+        if not isinstance(meta, dict):
+            raise ValueError("packet meta must be an object")
+        nbytes = int(meta["nbytes"])
+        if nbytes < 0:
+            raise ValueError("negative packet size")
+        end = offset + nbytes
+        if end > len(view):
+            raise ValueError("frame truncated")
+        payloads.append(view[offset:end])
+        offset = end + _pad(end - offset)
+    return header, payloads
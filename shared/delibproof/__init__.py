@@ -8,9 +8,22 @@ __all__ = [
     "verdict",
     "consensus_threshold",
     "weighted_consensus",
+    "verdict_batch",
+    "verdict_sweep",
+    "weighted_consensus_batch",
     "ask",
     "ask_all",
     "ask_with_details",
     "quick_check",
     "check_action_permissions",
 ]
+
+# The batch kernels need numpy, so they are only imported when first used
+_BATCH = ("verdict_batch", "verdict_sweep", "weighted_consensus_batch")
+
+
+def __getattr__(name):
+    if name in _BATCH:
+        from . import batch
+        return getattr(batch, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
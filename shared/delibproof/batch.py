@@ -0,0 +1,321 @@
+"""Vectorized DelibProof consensus for scoring many cases at once.
+
+Votes are a (cases x sentinels) matrix. Each result field is an array with
+one entry per case, bit-for-bit equal to what the scalar functions in
+core.py return for that case's votes with the missing ones dropped.
+
+``statistics.mean``/``pstdev`` are exact: they round the true rational
+mean and standard deviation once. Here both are computed in double-double
+arithmetic together with an error bound; a row whose result is not provably
+the correctly rounded value (e.g. an exact rounding tie) is recomputed with
+the scalar ``verdict``, so the output never depends on which path ran.
+"""
+import sys
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .core import verdict
+
+_U = 2.0 ** -53
+_SPLIT = 2.0 ** 27 + 1.0  # Dekker split constant
+# Votes outside this magnitude range go to the scalar path, which keeps the
+# double-double error bounds clear of underflow and overflow
+_TINY = 2.0 ** -300
+_HUGE = 2.0 ** 300
+# sum() over floats is compensated (Neumaier) from Python 3.12 on
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+def _two_sum(a, b):
+    """a + b as an unevaluated pair (sum, error), exactly."""
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _two_prod(a, b):
+    """a * b as an unevaluated pair (product, error), exactly."""
+    p = a * b
+    t = _SPLIT * a
+    ah = t - (t - a)
+    al = a - ah
+    t = _SPLIT * b
+    bh = t - (t - b)
+    bl = b - bh
+    return p, ((ah * bh - p) + ah * bl + al * bh) + al * bl
+
+
+def _dd_div(hi, lo, n):
+    """(hi + lo) / n, returned as (rounded quotient, residual)."""
+    q = hi / n
+    p, e = _two_prod(q, n)
+    return _two_sum(q, (((hi - p) - e) + lo) / n)
+
+
+def _certified(value, residual, bound):
+    """True where value is the correctly rounded result of value + residual (+/- bound)."""
+    gap = np.minimum(value - np.nextafter(value, -np.inf), np.nextafter(value, np.inf) - value)
+    return (2.0 * (np.abs(residual) + bound) < gap) | (bound == 0.0)
+
+
+def _as_matrix(votes, missing):
+    x = np.asarray(votes, dtype=np.float64)
+    if x.ndim != 2:
+        raise ValueError("votes must be a 2-D (cases x sentinels) array")
+    if missing is None:
+        absent = np.isnan(x)
+    else:
+        absent = np.asarray(missing, dtype=bool)
+        if absent.shape != x.shape:
+            raise ValueError("missing mask shape must match votes shape")
+    return x, ~absent
+
+
+def _moments(x, present):
+    """Exactly rounded mean and population stddev per row, as in verdict()."""
+    cases = x.shape[0]
+    count = present.sum(axis=1)
+    n = np.maximum(count, 1).astype(np.float64)
+    has_votes = count > 0
+
+    mag = np.abs(x)
+    usable = ~present | (np.isfinite(x) & ((mag == 0.0) | ((mag >= _TINY) & (mag <= _HUGE))))
+    redo = has_votes & ~usable.all(axis=1)
+    xs = np.where(present & usable, x, 0.0)
+    mag = np.abs(xs)
+
+    # Mean: Sum2-style accumulation to double-double, then divide by n
+    hi = np.zeros(cases)
+    lo = np.zeros(cases)
+    exact = np.ones(cases, dtype=bool)
+    for col in xs.T:
+        hi, e = _two_sum(hi, col)
+        lo, e = _two_sum(lo, e)
+        exact &= e == 0.0
+    hi, lo = _two_sum(hi, lo)
+    avg, avg_res = _dd_div(hi, lo, n)
+
+    u2 = _U * _U
+    big = mag.max(axis=1, initial=0.0)
+    # An exact sum divided by a power of two is exact too, and then avg is
+    # already the correctly rounded mean, halfway cases included
+    exact &= (count & (count - 1)) == 0
+    mean_err = np.where(exact, 0.0, 4.0 * (n * n + 8.0) * u2 * mag.sum(axis=1) / n)
+    redo |= has_votes & ~_certified(avg, avg_res, mean_err)
+
+    # Population variance: squared deviations from the double-double mean
+    mean_lo = np.where(has_votes, avg_res, 0.0)
+    ss_hi = np.zeros(cases)
+    ss_lo = np.zeros(cases)
+    dev_abs = np.zeros(cases)
+    dev_sq = np.zeros(cases)
+    for col, mask in zip(xs.T, present.T):
+        s, e = _two_sum(col, -avg)
+        s = np.where(mask, s, 0.0)
+        dlo = np.where(mask, e - mean_lo, 0.0)
+        p, pe = _two_prod(s, s)
+        ss_hi, e = _two_sum(ss_hi, p)
+        ss_lo += e + (pe + 2.0 * s * dlo)
+        dev_abs += np.abs(s)
+        dev_sq += p
+    ss_hi, ss_lo = _two_sum(ss_hi, ss_lo)
+    var_hi, var_lo = _dd_div(ss_hi, ss_lo, n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(var_hi)
+        p, e = _two_prod(root, root)
+        sd, sd_res = _two_sum(root, (((var_hi - p) - e) + var_lo) / (2.0 * root))
+
+        delta = mean_err + 4.0 * u2 * big
+        ss_err = 4.0 * (
+            2.0 * delta * dev_abs
+            + n * delta * delta
+            + 12.0 * u2 * (dev_sq + n * big * big)
+            + 2.0 * (n * n + n) * u2 * dev_sq
+        )
+        var_err = ss_err / n + 8.0 * u2 * var_hi
+        sd_err = 4.0 * (var_err / sd + 4.0 * u2 * sd)
+        sd_ok = (sd > 0.0) & _certified(sd, sd_res, sd_err)
+
+    # Identical votes (including a single vote) have a standard deviation of exactly 0
+    lowest = np.where(present, x, np.inf).min(axis=1, initial=np.inf)
+    highest = np.where(present, x, -np.inf).max(axis=1, initial=-np.inf)
+    uniform = has_votes & (lowest == highest)
+    sd = np.where(uniform, 0.0, sd)
+    redo |= has_votes & ~uniform & ~sd_ok
+
+    avg = np.where(has_votes, avg, 0.0)
+    sd = np.where(has_votes, sd, 0.0)
+    for i in np.flatnonzero(redo):
+        scalar = verdict([float(v) for v in x[i][present[i]]])
+        avg[i] = scalar["avg"]
+        sd[i] = scalar["sd"]
+    return count, avg, sd
+
+
+def _agreement(x, present, count, min_agree):
+    with np.errstate(invalid="ignore"):
+        agreeing = (present & (x >= min_agree)).sum(axis=1)
+        return np.where(count > 0, agreeing / np.maximum(count, 1), 0.0)
+
+
+def verdict_batch(votes, missing=None, min_agree: float = 0.90, max_std: float = 0.15) -> Dict[str, np.ndarray]:
+    """
+    Calculate consensus verdicts for many cases in one pass.
+
+    Args:
+        votes: (cases x sentinels) approval scores
+        missing: Optional boolean mask, True where a sentinel did not vote
+            (defaults to the NaN entries of votes)
+        min_agree: Minimum approval threshold (default 0.90)
+        max_std: Maximum allowed standard deviation (default 0.15)
+
+    Returns:
+        Dictionary of per-case arrays matching verdict() on each row:
+        {
+            "ok": bool,
+            "avg": float,
+            "sd": float,
+            "agree": float,
+            "count": int,      # number of votes cast
+            "no_votes": bool,  # verdict() would report reason "no_votes"
+        }
+    """
+    x, present = _as_matrix(votes, missing)
+    count, avg, sd = _moments(x, present)
+    agree = _agreement(x, present, count, min_agree)
+    ok = (count > 0) & (agree >= 0.5) & (sd <= max_std) & (avg >= min_agree)
+    return {
+        "ok": ok,
+        "avg": avg,
+        "sd": sd,
+        "agree": agree,
+        "count": count,
+        "no_votes": count == 0,
+    }
+
+
+def verdict_sweep(
+    votes,
+    min_agree_grid: Sequence[float],
+    max_std_grid: Sequence[float],
+    missing=None,
+    return_ok: bool = False,
+) -> Dict:
+    """
+    Evaluate verdict() over a grid of thresholds for threshold tuning.
+
+    Means and standard deviations are computed once; each grid point then
+    only costs comparisons.
+
+    Args:
+        votes: (cases x sentinels) approval scores
+        min_agree_grid: Candidate min_agree values
+        max_std_grid: Candidate max_std values
+        missing: Optional boolean mask, True where a sentinel did not vote
+        return_ok: Also return the full (cases x min_agree x max_std) verdicts
+
+    Returns:
+        Dictionary with the sweep result:
+        {
+            "min_agree": array,
+            "max_std": array,
+            "approved": int array (min_agree x max_std),  # cases with ok == True
+            "rate": float array (min_agree x max_std),
+            "cases": int,
+            "ok": bool array (cases x min_agree x max_std),  # only with return_ok
+        }
+    """
+    x, present = _as_matrix(votes, missing)
+    agree_grid = np.asarray(min_agree_grid, dtype=np.float64).ravel()
+    std_grid = np.asarray(max_std_grid, dtype=np.float64).ravel()
+    count, avg, sd = _moments(x, present)
+    cases = x.shape[0]
+
+    approved = np.zeros((agree_grid.size, std_grid.size), dtype=np.int64)
+    ok = np.zeros((cases, agree_grid.size, std_grid.size), dtype=bool) if return_ok else None
+    for i, min_agree in enumerate(agree_grid):
+        agree = _agreement(x, present, count, min_agree)
+        base = (count > 0) & (agree >= 0.5) & (avg >= min_agree)
+        passing = np.sort(sd[base])
+        approved[i] = np.searchsorted(passing, std_grid, side="right")
+        if ok is not None:
+            ok[:, i, :] = base[:, None] & (sd[:, None] <= std_grid[None, :])
+
+    result = {
+        "min_agree": agree_grid,
+        "max_std": std_grid,
+        "approved": approved,
+        "rate": approved / cases if cases else np.zeros(approved.shape),
+        "cases": cases,
+    }
+    if ok is not None:
+        result["ok"] = ok
+    return result
+
+
+def _builtin_sum(columns, present):
+    """
+    Per-row ``sum()`` of the present terms, as the running Python computes it.
+
+    Before 3.12 that is a plain left-to-right float sum; from 3.12 on it
+    carries a Neumaier compensation term that is added once at the end
+    (unless it is zero or not finite).
+    """
+    total = np.zeros(present.shape[0])
+    comp = np.zeros(present.shape[0])
+    with np.errstate(invalid="ignore", over="ignore"):
+        for x, mask in zip(columns, present.T):
+            t = total + x
+            if _COMPENSATED_SUM:
+                err = np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+                comp = np.where(mask, comp + err, comp)
+            total = np.where(mask, t, total)
+        if _COMPENSATED_SUM:
+            total = np.where((comp != 0.0) & np.isfinite(comp), total + comp, total)
+    return total
+
+
+def weighted_consensus_batch(votes, weights: Optional[Sequence[float]] = None, missing=None) -> Dict[str, np.ndarray]:
+    """
+    Calculate weighted consensus for many cases in one pass.
+
+    Weights are normalized over the votes actually cast in each case. A case
+    whose cast votes all have zero weight gets weighted_avg NaN and ok False
+    (weighted_consensus() would raise ZeroDivisionError).
+
+    Args:
+        votes: (cases x sentinels) approval scores
+        weights: Optional per-sentinel weights, or a (cases x sentinels) matrix
+        missing: Optional boolean mask, True where a sentinel did not vote
+
+    Returns:
+        Dictionary of per-case arrays matching weighted_consensus() on each row:
+        {
+            "ok": bool,
+            "weighted_avg": float,
+            "no_votes": bool,
+        }
+    """
+    x, present = _as_matrix(votes, missing)
+    if weights is None:
+        w = np.ones(x.shape)
+    else:
+        w = np.asarray(weights, dtype=np.float64)
+        if w.ndim == 0 or w.shape[-1] != x.shape[1]:
+            raise ValueError("Weights length must match approvals length")
+        w = np.broadcast_to(w, x.shape)
+
+    # Same operations as weighted_consensus(): sum() of the weights, then
+    # sum() of score * (weight / total) in sentinel order
+    total = _builtin_sum(w.T, present)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted_avg = _builtin_sum((xc * (wc / total) for xc, wc in zip(x.T, w.T)), present)
+        weighted_avg = np.where(present.any(axis=1) & (total == 0.0), np.nan, weighted_avg)
+        ok = weighted_avg >= 0.90
+    return {
+        "ok": ok,
+        "weighted_avg": weighted_avg,
+        "no_votes": ~present.any(axis=1),
+    }
@@ -0,0 +1,100 @@
+"""Tests for the vectorized DelibProof consensus kernels."""
+import numpy as np
+import pytest
+from shared.delibproof.core import verdict, weighted_consensus
+from shared.delibproof.batch import verdict_batch, verdict_sweep, weighted_consensus_batch
+
+def _rows(votes, missing):
+    for row, absent in zip(votes, missing):
+        yield [float(v) for v, a in zip(row, absent) if not a]
+
+def _assert_matches_scalar(votes, missing, **thresholds):
+    result = verdict_batch(votes, missing, **thresholds)
+    for i, row in enumerate(_rows(votes, missing)):
+        expected = verdict(row, **thresholds)
+        assert result["avg"][i] == expected["avg"]
+        assert result["sd"][i] == expected["sd"]
+        assert result["agree"][i] == expected["agree"]
+        assert bool(result["ok"][i]) == expected["ok"]
+        assert bool(result["no_votes"][i]) == (expected.get("reason") == "no_votes")
+
+def test_verdict_batch_matches_scalar():
+    """Bit-for-bit equal to verdict() on random, rounded and masked votes."""
+    rng = np.random.default_rng(7)
+    for sentinels in (1, 2, 3, 4, 5, 8):
+        votes = np.round(rng.uniform(0.6, 1.0, (300, sentinels)), 2)
+        missing = rng.random(votes.shape) < 0.25
+        _assert_matches_scalar(votes, missing)
+        _assert_matches_scalar(rng.random((300, sentinels)), np.zeros(votes.shape, bool), min_agree=0.5, max_std=0.3)
+
+def test_verdict_batch_rounding_ties():
+    """Means and stddevs that land exactly halfway between floats round like statistics does."""
+    nan = np.nan
+    votes = np.array([
+        [0.61, 0.95, nan, nan],
+        [0.1, 0.2, nan, nan],
+        [0.3, 0.3000000000000001, nan, nan],
+        [0.9, 0.9, np.nextafter(0.9, 1.0), nan],
+        [0.93, 0.97, 0.91, 0.99],
+    ])
+    _assert_matches_scalar(votes, np.isnan(votes))
+
+def test_verdict_batch_missing_defaults_to_nan():
+    votes = np.array([[0.95, np.nan, 0.92], [np.nan, np.nan, np.nan]])
+    result = verdict_batch(votes)
+    assert result["count"].tolist() == [2, 0]
+    assert result["avg"][0] == verdict([0.95, 0.92])["avg"]
+    assert result["no_votes"].tolist() == [False, True]
+    assert result["ok"].tolist() == [True, False]
+
+def test_verdict_batch_rejects_bad_shapes():
+    with pytest.raises(ValueError):
+        verdict_batch([0.9, 0.95])
+    with pytest.raises(ValueError):
+        verdict_batch([[0.9, 0.95]], missing=[[False]])
+
+def test_verdict_sweep():
+    """Approval counts agree with verdict() at every grid point."""
+    rng = np.random.default_rng(11)
+    votes = np.round(rng.uniform(0.7, 1.0, (200, 4)), 2)
+    missing = rng.random(votes.shape) < 0.2
+    agree_grid = [0.8, 0.85, 0.9, 0.95]
+    std_grid = [0.02, 0.05, 0.1, 0.15]
+    result = verdict_sweep(votes, agree_grid, std_grid, missing, return_ok=True)
+    assert result["approved"].shape == (4, 4)
+    rows = list(_rows(votes, missing))
+    for i, min_agree in enumerate(agree_grid):
+        for j, max_std in enumerate(std_grid):
+            expected = [verdict(row, min_agree=min_agree, max_std=max_std)["ok"] for row in rows]
+            assert result["ok"][:, i, j].tolist() == expected
+            assert result["approved"][i, j] == sum(expected)
+    assert result["rate"][0, 0] == result["approved"][0, 0] / 200
+
+def test_weighted_consensus_batch_matches_scalar():
+    rng = np.random.default_rng(3)
+    votes = np.round(rng.uniform(0.7, 1.0, (300, 4)), 3)
+    missing = rng.random(votes.shape) < 0.25
+    weights = [0.4, 0.3, 0.2, 0.1]
+    result = weighted_consensus_batch(votes, weights, missing)
+    for i, (row, absent) in enumerate(zip(votes, missing)):
+        present = [j for j in range(4) if not absent[j]]
+        expected = weighted_consensus([float(row[j]) for j in present], [weights[j] for j in present])
+        assert result["weighted_avg"][i] == expected["weighted_avg"]
+        assert bool(result["ok"][i]) == expected["ok"]
+
+def test_weighted_consensus_batch_equal_weights():
+    """[0.1] * 10 sums inexactly, so this exercises sum()'s compensation on Python >= 3.12."""
+    rng = np.random.default_rng(11)
+    votes = rng.random((2000, 10))
+    missing = rng.random(votes.shape) < 0.2
+    missing[:, 0] = False
+    weights = [0.1] * 10
+    result = weighted_consensus_batch(votes, weights, missing)
+    for i, (row, absent) in enumerate(zip(votes, missing)):
+        present = [j for j in range(10) if not absent[j]]
+        expected = weighted_consensus([float(row[j]) for j in present], [weights[j] for j in present])
+        assert result["weighted_avg"][i] == expected["weighted_avg"]
+
+def test_weighted_consensus_batch_mismatch():
+    with pytest.raises(ValueError):
+        weighted_consensus_batch([[0.95, 0.90]], [0.5, 0.3, 0.2])